@@ -21,12 +21,17 @@ attributed to the behavior(s) that reach it:
 - Every function reached from a root is attributed to that root's behavior(s);
   a helper reached from two behaviors is attributed to both.
 
-The result is one ``SM64BehaviorCall`` row per (behavior, call site). The
+The result is stored normalized: one ``SM64CCallSite`` row per call site in
+the reached code (``c_call_site``), and one ``SM64BehaviorFunction`` row per
+(behavior, function it reaches) (``behavior_function``). A helper shared by a
+hundred behaviors is stored once plus a hundred two-column attribution rows,
+not a hundred copies of every call in it. Their join is the ``behavior_call``
+view -- one ``SM64BehaviorCall`` row per (behavior, call site) -- and the
 high-value relations (spawns / sounds / dialog / model / morph / seek) are
-derived from this backbone as SQL views (``behavior_calls_*`` in
-``everything.py``), exactly as ``behavior_command`` feeds ``behavior_spawn``.
-The raw rows -- including calls that match no relation view -- are retained so
-that ``behavior_call_unclassified`` can report the uncaptured surface: the
+derived from the sites as SQL views (``behavior_calls_*`` in ``everything.py``),
+exactly as ``behavior_command`` feeds ``behavior_spawn``. The raw sites --
+including calls that match no relation view -- are retained so that
+``behavior_call_unclassified`` can report the uncaptured surface: the
 completeness audit is a query, not a promise.
 """
 
@@ -34,16 +39,16 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+from sm64_sql.c_corpus import Extractor, corpus, register
 from sm64_sql.c_parse import (
+    CallGraph,
     Func,
     find_descendant,
     functions_from_tree,
-    get_parser,
-    parse_c_functions,
-    reachable,
 )
+from sm64_sql.c_symbol import SM64CSymbol, index_c_symbols, parse_c_symbols
 
 BEHAVIOR_SUBDIR = ("src", "game", "behaviors")
 
@@ -82,8 +87,29 @@ _MODEL_ID = re.compile(r"MODEL_[A-Za-z0-9_]+")
 _BASE_ID = re.compile(r"[A-Za-z_]\w*")
 
 
+@dataclass
+class SM64CCallSite:
+    function: str  # the enclosing C function the call sits in
+    seq: int  # 0-based position of the call within that function
+    call: str  # the callee, e.g. 'spawn_object' or 'cur_obj_play_sound_2'
+    args: str  # comment-stripped, comma-joined arguments ("" for none)
+    args_json: str  # JSON array of the top-level arguments ("[]" for none)
+    file: str  # repo-relative path of the definition (clickable provenance)
+    line: int  # 1-based line of the call site
+
+
+@dataclass
+class SM64BehaviorFunction:
+    """A C function a behavior runs: reached from one of its CALL_NATIVE roots."""
+
+    behavior_name: str  # owning bhv* (joins behavior); attributed by reachability
+    function: str  # joins c_call_site.function
+
+
 @dataclass
 class SM64BehaviorCall:
+    """One row of the ``behavior_call`` view: a call site, per behavior."""
+
     behavior_name: str  # owning bhv* (joins behavior); attributed by reachability
     function: str  # the enclosing C function the call sits in
     seq: int  # 0-based position of the call within that function
@@ -111,9 +137,40 @@ class SM64BehaviorDataSpawn:
 
 @dataclass
 class ParsedBehaviorCode:
-    calls: List[SM64BehaviorCall]
+    call_sites: List[SM64CCallSite]
+    functions: List[SM64BehaviorFunction]
     data_spawns: List[SM64BehaviorDataSpawn]
 
+    @property
+    def calls(self) -> List[SM64BehaviorCall]:
+        """The ``behavior_call`` view's rows: each site, per behavior reaching it."""
+        sites: Dict[str, List[SM64CCallSite]] = {}
+        for site in self.call_sites:
+            sites.setdefault(site.function, []).append(site)
+        return [
+            SM64BehaviorCall(
+                f.behavior_name,
+                site.function,
+                site.seq,
+                site.call,
+                site.args,
+                site.args_json,
+                site.file,
+                site.line,
+            )
+            for f in self.functions
+            for site in sites.get(f.function, ())
+        ]
+
+
+@dataclass
+class _FileFacts:
+    """Everything the behavior-code walk needs from one C file (cacheable)."""
+
+    funcs: List[Func]
+    action_tables: Dict[str, List[str]]
+    behavior_tables: Dict[str, List["tuple"]]
+
 
 def _action_tables_from_tree(tree) -> Dict[str, List[str]]:
     """Map every ``void (*sFoo[])(void) = {...}`` table to the functions it lists.
@@ -188,28 +245,37 @@ def _behavior_tables_from_tree(tree) -> Dict[str, List["tuple"]]:
     return tables
 
 
-def _files_defining(repo: Path, names: Set[str]) -> List[Path]:
-    """Find the ``.c`` files outside behaviors/ that define any of ``names``.
+def _extract_file(tree, rel: str) -> _FileFacts:
+    return _FileFacts(
+        functions_from_tree(tree, rel),
+        _action_tables_from_tree(tree),
+        _behavior_tables_from_tree(tree),
+    )
+
+
+register(
+    Extractor("behavior_file", _extract_file, ("/".join(BEHAVIOR_SUBDIR) + "/*.inc.c",))
+)
 
-    A textual prefilter keeps us from parsing the whole tree -- only files that
-    mention a wanted name are parsed, and only those that truly *define* one
-    (a ``function_definition``, not a prototype) are returned.
+
+def _files_defining(
+    repo: Path, names: Set[str], symbols: Dict[str, List[SM64CSymbol]]
+) -> List[_FileFacts]:
+    """Extract the ``.c`` files outside behaviors/ that define any of ``names``.
+
+    ``symbols`` (see c_symbol.py) says which files define each name, so only
+    those files are read and parsed.
     """
-    behaviors = repo.joinpath(*BEHAVIOR_SUBDIR)
-    result: List[Path] = []
-    for path in sorted((repo / "src").rglob("*.c")):
-        if behaviors in path.parents:
-            continue
-        try:
-            text = path.read_text(errors="ignore")
-        except OSError:
-            continue
-        if not any(f"{name}(" in text for name in names):
-            continue
-        rel = path.relative_to(repo).as_posix()
-        if {fn.name for fn in parse_c_functions(path, rel)} & names:
-            result.append(path)
-    return result
+    behaviors = "/".join(BEHAVIOR_SUBDIR) + "/"
+    files = {
+        symbol.file
+        for name in names
+        for symbol in symbols.get(name, ())
+        if symbol.kind == "function" and not symbol.file.startswith(behaviors)
+    }
+    c_files = corpus(repo)
+    c_files.prefetch("behavior_file", sorted(files))
+    return [c_files.facts("behavior_file", rel) for rel in sorted(files)]
 
 
 def _behavior_arg(args: List[str]) -> Optional[str]:
@@ -310,16 +376,39 @@ def _resolve_data_spawns(
 
 
 def parse_behavior_calls(
-    repo: Path, root_to_behaviors: Dict[str, List[str]]
+    repo: Path,
+    root_to_behaviors: Dict[str, List[str]],
+    symbols: Optional[Dict[str, List[SM64CSymbol]]] = None,
 ) -> ParsedBehaviorCode:
     """Build the behavior_call backbone (and resolved data-spawns) from the C.
 
     ``root_to_behaviors`` maps each ``CALL_NATIVE`` function name to the
     behavior(s) that name it (derived from the parsed behavior command stream).
+    ``symbols`` is the repo's symbol index (``c_symbol.index_c_symbols``),
+    built here if not given.
+    """
+    call_sites, functions, data_spawns = iter_behavior_calls(
+        repo, root_to_behaviors, symbols
+    )
+    return ParsedBehaviorCode(list(call_sites), functions, data_spawns)
+
+
+def iter_behavior_calls(
+    repo: Path,
+    root_to_behaviors: Dict[str, List[str]],
+    symbols: Optional[Dict[str, List[SM64CSymbol]]] = None,
+) -> Tuple[
+    Iterator[SM64CCallSite], List[SM64BehaviorFunction], List[SM64BehaviorDataSpawn]
+]:
+    """``parse_behavior_calls`` with the call-site rows generated lazily.
+
+    The walk itself runs up front; only the call sites -- the largest of the
+    three tables -- are produced on demand, so a streaming build never holds
+    them all at once.
     """
     behaviors_dir = repo.joinpath(*BEHAVIOR_SUBDIR)
     if not behaviors_dir.is_dir():
-        return ParsedBehaviorCode([], [])
+        return iter(()), [], []
 
     # 1. Parse object-behavior files. These functions are the recursion set: the
     #    call graph is followed only through this object code. Action-function
@@ -327,57 +416,64 @@ def parse_behavior_calls(
     funcs: Dict[str, Func] = {}
     action_tables: Dict[str, List[str]] = {}
     behavior_tables: Dict[str, List["tuple"]] = {}
-    for path in sorted(behaviors_dir.glob("*.inc.c")):
-        rel = path.relative_to(repo).as_posix()
-        tree = get_parser().parse(path.read_bytes())
-        for fn in functions_from_tree(tree, rel):
+    c_files = corpus(repo)
+    rels = [
+        p.relative_to(repo).as_posix() for p in sorted(behaviors_dir.glob("*.inc.c"))
+    ]
+    c_files.prefetch("behavior_file", rels)
+    for rel in rels:
+        facts = c_files.facts("behavior_file", rel)
+        for fn in facts.funcs:
             funcs[fn.name] = fn
-        action_tables.update(_action_tables_from_tree(tree))
-        behavior_tables.update(_behavior_tables_from_tree(tree))
+        action_tables.update(facts.action_tables)
+        behavior_tables.update(facts.behavior_tables)
     recursion_set = set(funcs)
 
     # 2. A few CALL_NATIVE roots live outside behaviors/ (menu/cutscene/mario
     #    loops). Parse just their files so they are entry points too; we capture
     #    their direct calls but do not recurse into their file-local helpers.
     external = set(root_to_behaviors) - recursion_set
-    for path in _files_defining(repo, external):
-        rel = path.relative_to(repo).as_posix()
-        tree = get_parser().parse(path.read_bytes())
-        action_tables.update(_action_tables_from_tree(tree))
-        behavior_tables.update(_behavior_tables_from_tree(tree))
-        for fn in functions_from_tree(tree, rel):
+    if symbols is None:
+        symbols = index_c_symbols(parse_c_symbols(repo))
+    for facts in _files_defining(repo, external, symbols):
+        action_tables.update(facts.action_tables)
+        behavior_tables.update(facts.behavior_tables)
+        for fn in facts.funcs:
             if fn.name in external and fn.name not in funcs:
                 funcs[fn.name] = fn
 
     # 3. Reachability: attribute every function reached from a root to that
-    #    root's behavior(s).
+    #    root's behavior(s). The call graph is closed once for all the roots.
+    graph = CallGraph(funcs, recursion_set, action_tables, _DISPATCHERS)
     func_behaviors: Dict[str, Set[str]] = {}
     for root, behaviors in root_to_behaviors.items():
         if root not in funcs:
             continue  # engine-helper "root" with no parsed body, or a macro
-        for reached in reachable(
-            root, funcs, recursion_set, action_tables, _DISPATCHERS
-        ):
+        for reached in graph.reachable(root):
             func_behaviors.setdefault(reached, set()).update(behaviors)
 
-    # 4. Emit one row per (behavior, call site), ordered for a stable database.
-    rows: List[SM64BehaviorCall] = []
+    data_spawns = _resolve_data_spawns(funcs, func_behaviors, behavior_tables)
+    functions = [
+        SM64BehaviorFunction(behavior, name)
+        for name in sorted(func_behaviors)
+        for behavior in sorted(func_behaviors[name])
+    ]
+    return _call_site_rows(funcs, func_behaviors), functions, data_spawns
+
+
+def _call_site_rows(
+    funcs: Dict[str, Func], func_behaviors: Dict[str, Set[str]]
+) -> Iterator[SM64CCallSite]:
+    """One row per call site in the reached code, ordered for a stable database."""
     for name in sorted(func_behaviors):
         fn = funcs[name]
-        for behavior in sorted(func_behaviors[name]):
-            for seq, call in enumerate(fn.calls):
-                rows.append(
-                    SM64BehaviorCall(
-                        behavior_name=behavior,
-                        function=name,
-                        seq=seq,
-                        call=call.callee,
-                        args=", ".join(call.args),
-                        args_json=json.dumps(call.args),
-                        file=fn.file,
-                        line=call.line,
-                    )
-                )
-
-    data_spawns = _resolve_data_spawns(funcs, func_behaviors, behavior_tables)
-    return ParsedBehaviorCode(rows, data_spawns)
+        for seq, call in enumerate(fn.calls):
+            yield SM64CCallSite(
+                function=name,
+                seq=seq,
+                call=call.callee,
+                args=", ".join(call.args),
+                args_json=json.dumps(call.args),
+                file=fn.file,
+                line=call.line,
+            )
@@ -14,26 +14,40 @@ warp-node id in the second byte. Each byte is an independent, behavior-specific
 field (a dialog id, a star index, a warp node, an enemy size, ...), which is why
 this module keeps the four slots separate rather than only the combined value.
 
-``parse_behavior_param`` records three things:
+``parse_behavior_param`` records:
 
 * ``raw`` -- the original expression, exactly as written (e.g. ``"DIALOG_089"``
   or ``"BPARAM1(0x01) | BPARAM2(WARP_NODE_03)"``), so nothing is lost.
-* ``value`` -- the resolved 32-bit integer, but only when the whole expression
-  is numeric. Expressions that reference a symbolic constant (``WARP_NODE_03``,
-  ``DIALOG_089``, ...) leave this ``None`` -- resolving those would require the
-  scattered ``#define`` tables, which is deliberately out of scope.
+* ``value`` -- the resolved 32-bit integer. Without a symbol table only a purely
+  numeric expression resolves; with one (``symbols.parse_symbols``, the
+  ``#define`` and ``enum`` values from the headers) ``WARP_NODE_03``,
+  ``DIALOG_089`` and the like resolve too. ``None`` when some name is unknown.
 * ``param1``..``param4`` -- the argument written inside each ``BPARAMn(...)``
   slot (symbolic or numeric), or ``None`` when that slot is unused.
+* ``byte1``..``byte4`` -- each byte's integer value: taken from ``value`` when
+  that resolved, else from the slot's own argument when that resolves alone.
+
+Macro and special objects carry a single byte instead: the game spawns it
+as ``(param & 0xFF) << 16``, i.e. into ``oBhvParams2ndByte``. Parsed with
+``byte=PLACEMENT_PARAM_BYTE``, such a param keeps its written ``value`` but
+fills only ``byte2``; the other bytes are None, since the placement does not
+set them.
+
+The build parses placements without the symbol table, then
+``resolve_bhv_params`` re-evaluates only the params that are still unresolved.
 """
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Protocol
 
 from sm64_sql.parse_utils import evaluate_int, extract_macro_args
 
 # BPARAMn macro -> the left bit-shift it applies (see module docstring).
 _BPARAM_SHIFT = {"BPARAM1": 24, "BPARAM2": 16, "BPARAM3": 8, "BPARAM4": 0}
 
+# The byte a macro or special object's one-byte param is spawned into.
+PLACEMENT_PARAM_BYTE = 2
+
 # BPARAMn as callable macros for the shared integer evaluator: each masks its
 # argument to a byte and shifts it into place.
 _BPARAM_FUNCS = {
@@ -50,6 +64,10 @@ class BehaviorParam:
     param2: Optional[str]  # argument inside BPARAM2(...) (the famous 2nd byte)
     param3: Optional[str]  # argument inside BPARAM3(...), or None
     param4: Optional[str]  # argument inside BPARAM4(...), or None
+    byte1: Optional[int]  # 1st byte's value (oBhvParams >> 24), or None
+    byte2: Optional[int]  # 2nd byte's value (oBhvParams2ndByte), or None
+    byte3: Optional[int]  # 3rd byte's value, or None
+    byte4: Optional[int]  # 4th byte's value, or None
 
 
 def _normalize(expr: str) -> str:
@@ -70,21 +88,84 @@ def _bparam_slots(expr: str) -> Dict[int, str]:
     return slots
 
 
-def parse_behavior_param(expr: str) -> BehaviorParam:
+def _byte_values(
+    value: Optional[int],
+    slots: Dict[int, str],
+    symbols: Dict[str, int],
+    byte: Optional[int] = None,
+) -> List[Optional[int]]:
+    if byte is not None:
+        values: List[Optional[int]] = [None] * 4
+        if value is not None:
+            values[byte - 1] = value & 0xFF
+        return values
+    if value is not None:
+        return [(value >> shift) & 0xFF for shift in _BPARAM_SHIFT.values()]
+    values = []
+    for slot in range(1, 5):
+        byte = evaluate_int(slots[slot], symbols) if slot in slots else None
+        values.append(None if byte is None else byte & 0xFF)
+    return values
+
+
+def parse_behavior_param(
+    expr: str, symbols: Optional[Dict[str, int]] = None, byte: Optional[int] = None
+) -> BehaviorParam:
     """Parse a behavior-parameter expression into a :class:`BehaviorParam`.
 
     ``expr`` is the argument as written in the macro call. An empty or missing
-    expression is treated as ``"0"`` (the default the game uses). The value is
-    resolved only when the whole expression is numeric (the ``BPARAMn`` packers
-    are known to the evaluator); a symbolic constant leaves ``value`` None.
+    expression is treated as ``"0"`` (the default the game uses). The
+    ``BPARAMn`` packers are known to the evaluator; other names resolve through
+    ``symbols`` (name -> value), and an unknown one leaves ``value`` None.
+    With ``byte`` (1-4), the param is a single byte spawned into that slot
+    (see the module docstring).
     """
     raw = _normalize(expr) or "0"
     slots = _bparam_slots(raw)
+    value = evaluate_int(raw, symbols, _BPARAM_FUNCS)
+    byte1, byte2, byte3, byte4 = _byte_values(
+        value, slots, symbols if symbols is not None else {}, byte
+    )
     return BehaviorParam(
         raw=raw,
-        value=evaluate_int(raw, functions=_BPARAM_FUNCS),
+        value=value,
         param1=slots.get(1),
         param2=slots.get(2),
         param3=slots.get(3),
         param4=slots.get(4),
+        byte1=byte1,
+        byte2=byte2,
+        byte3=byte3,
+        byte4=byte4,
     )
+
+
+class Placement(Protocol):
+    """The behavior-param columns of object, macro_object and special_object."""
+
+    bhv_param: str
+    bhv_param_value: Optional[int]
+    bhv_param_1_value: Optional[int]
+    bhv_param_2_value: Optional[int]
+    bhv_param_3_value: Optional[int]
+    bhv_param_4_value: Optional[int]
+
+
+def resolve_bhv_params(
+    rows: Iterable[Placement], symbols: Dict[str, int], byte: Optional[int] = None
+) -> None:
+    """Fill ``bhv_param_value`` and ``bhv_param_N_value`` through ``symbols``.
+
+    ``rows`` are placements parsed without a symbol table (with ``byte``, as
+    for ``parse_behavior_param``); only those whose value is still None are
+    re-evaluated.
+    """
+    for row in rows:
+        if row.bhv_param_value is not None:
+            continue
+        param = parse_behavior_param(row.bhv_param, symbols, byte)
+        row.bhv_param_value = param.value
+        row.bhv_param_1_value = param.byte1
+        row.bhv_param_2_value = param.byte2
+        row.bhv_param_3_value = param.byte3
+        row.bhv_param_4_value = param.byte4
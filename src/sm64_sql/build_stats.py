@@ -0,0 +1,140 @@
+"""Per-step build measurements for ``--profile``.
+
+Every parse stage and every database step (each table load, index and view)
+can be run inside :func:`measure`, which records a :class:`BuildStat`:
+
+- wall and CPU time (``time.perf_counter`` / ``time.process_time``) of the
+  process that ran the step -- for a stage in a pool worker, that worker;
+- the rows it produced (or, for a view, the rows it evaluates to);
+- how many files under the decomp tree it opened for reading, and their total
+  size, counted by a ``sys.addaudithook`` hook on the ``open`` event (so reads
+  through any API are seen);
+- its peak traced memory: ``tracemalloc`` runs only for the step, so this is
+  the most the step itself had allocated at once.
+
+tracemalloc makes Python noticeably slower, so a profiled build's times are
+inflated; they are for comparing builds and steps, not for quoting. Stats are
+stored in the ``build_stats`` table (``db.write_build_stats``) and as JSON.
+"""
+
+import contextlib
+import dataclasses
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sm64_sql.scheduler import Stage, run_stage_collected
+
+STATS_PREFIX = "stats:"
+
+
+@dataclass
+class BuildStat:
+    step: str  # the stage, table, index or view name
+    kind: str  # 'stage', 'schema', 'table', 'index' or 'view'
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: int = 0
+    files_read: int = 0
+    bytes_read: int = 0
+    peak_memory_bytes: int = 0
+
+
+# The reads of the step being measured in this process, or None.
+_reads: Optional[List[int]] = None
+_read_root: str = ""
+_hooked = False
+
+
+def _audit(event: str, args: Any) -> None:
+    if event != "open" or _reads is None:
+        return
+    path, mode = args[0], args[1]
+    # open() reports its mode string; os.open() reports None and flags.
+    if not isinstance(path, (str, os.PathLike)) or mode is None:
+        return
+    if "r" not in mode or "+" in mode:
+        return
+    path = os.path.abspath(os.fspath(path))
+    if not path.startswith(_read_root):
+        return
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return
+    _reads[0] += 1
+    _reads[1] += size
+
+
+@contextlib.contextmanager
+def measure(
+    step: str,
+    kind: str,
+    stats: Optional[List[BuildStat]],
+    root: Optional[Path] = None,
+) -> Iterator[BuildStat]:
+    """Time the block as one step and append its stat to ``stats``.
+
+    The caller sets ``rows`` on the yielded stat. Files are counted only under
+    ``root`` (the decomp tree). With ``stats`` None nothing is measured, so
+    code can wrap its steps unconditionally.
+    """
+    stat = BuildStat(step, kind)
+    if stats is None:
+        yield stat
+        return
+    global _reads, _read_root, _hooked
+    if not _hooked:
+        sys.addaudithook(_audit)  # cannot be removed; idle while _reads is None
+        _hooked = True
+    _reads = [0, 0]
+    _read_root = os.path.join(os.path.abspath(root), "") if root else "\0"
+    tracing = not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield stat
+    finally:
+        stat.wall_seconds = time.perf_counter() - wall
+        stat.cpu_seconds = time.process_time() - cpu
+        stat.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if tracing:
+            tracemalloc.stop()
+        stat.files_read, stat.bytes_read = _reads
+        _reads = None
+        stats.append(stat)
+
+
+def _profiled_stage(stage: Stage, repo: Path, **inputs: Any) -> Dict[str, Any]:
+    stats: List[BuildStat] = []
+    with measure(stage.name, "stage", stats, repo) as stat:
+        # Lazy outputs are collected here so their cost is charged to the stage.
+        result = run_stage_collected(stage, repo, inputs)
+        stat.rows = sum(len(v) for v in result.values() if isinstance(v, list))
+    result[STATS_PREFIX + stage.name] = stats[0]
+    return result
+
+
+def profiled(stages: Sequence[Stage]) -> List[Stage]:
+    """``stages`` with each one also producing a ``stats:<name>`` BuildStat."""
+    return [
+        dataclasses.replace(
+            stage,
+            func=functools.partial(_profiled_stage, stage),
+            outputs=stage.outputs + (STATS_PREFIX + stage.name,),
+        )
+        for stage in stages
+    ]
+
+
+def write_json(path: Path, stats: Sequence[BuildStat]) -> None:
+    Path(path).write_text(
+        json.dumps([dataclasses.asdict(stat) for stat in stats], indent=2) + "\n"
+    )
@@ -0,0 +1,228 @@
+"""The decomp's C files as one corpus: each read and parsed at most once.
+
+Several analyses mine the same C files -- the symbol index reads every file in
+``src/``, the behavior walk ``src/game/behaviors/`` (and the files defining
+external ``CALL_NATIVE`` roots), the action walk the ``mario*.c`` files -- and
+each used to open and parse its files itself. Instead, an analysis registers an
+:class:`Extractor` (a ``(tree, rel) -> facts`` function plus the files it
+covers) and asks the corpus for a file's facts. The first request for a file
+reads it once, parses it once, and runs *every* registered extractor covering
+it on that tree; the facts the caller did not ask for are held until their own
+consumer takes them, and the tree is dropped as soon as the extractors are done.
+Each extractor's result goes through the extraction cache as before, so a warm
+build parses nothing (and, when the requested facts come from the cache, the
+others are left for their consumers to fetch from it).
+
+A file is parsed one way: with its preprocessor conditionals stripped if any
+extractor covering it asks for that (the ``mario*.c`` files), as written
+otherwise. An extractor that does not care (``strip_conditionals=None``, the
+symbol index) reads whichever tree the file gets, and its cache entries are
+keyed by that choice.
+
+Held facts are checked against the file's content when taken, so an edited
+file is simply parsed again. A build opens a :func:`session`: one corpus for
+the build's duration, dropped with whatever it still holds when the build
+ends, and told which kinds to extract ahead -- those whose consuming stages
+run in this process during this build. Outside a session (and in pool
+workers, which serve ``prefetch`` and the other stages) ``corpus`` hands out a
+fresh corpus that extracts nothing ahead; the extraction cache is what they
+share.
+
+An analysis about to take many files calls :meth:`CCorpus.prefetch` first.
+Inside ``use_pool(pool, n)`` -- a parallel build passes its own stage pool --
+that fans the parsing and extraction out over the pool's ``n`` workers. Each
+worker sends back only the extracted facts, which are picklable plain data,
+never a tree. The caller holds the facts, and the analysis then takes them file
+by file in its own order, so the result is identical to the serial one. There
+is one level of parallelism only: the C stages run in the building process
+(see everything.py) and share the pool with the other stages, rather than
+each starting a pool of its own.
+"""
+
+import contextlib
+import fnmatch
+import hashlib
+import itertools
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sm64_sql.c_parse import parse_source
+from sm64_sql.extract_cache import cached
+
+
+@dataclass(frozen=True)
+class Extractor:
+    kind: str  # the extraction-cache kind, e.g. 'behavior_file'
+    func: Callable[[Any, str], Any]  # (tree, rel) -> picklable facts
+    # Repo-relative fnmatch patterns (``*`` crosses ``/``) of the files to run
+    # on whenever they are parsed; other files are extracted only on request.
+    patterns: Tuple[str, ...] = ()
+    strip_conditionals: Optional[bool] = False  # None: either parse will do
+
+    def covers(self, rel: str) -> bool:
+        return any(fnmatch.fnmatchcase(rel, pattern) for pattern in self.patterns)
+
+
+_EXTRACTORS: Dict[str, Extractor] = {}
+# See use_pool. The pool belongs to the process that set it: a forked pool
+# worker inherits these variables, not a usable pool.
+_pool: Optional[Executor] = None
+_workers = 1
+_owner = 0  # pid
+
+# (kind, rel) -> (content digest, facts)
+_Held = Dict[Tuple[str, str], Tuple[bytes, Any]]
+
+
+def register(extractor: Extractor) -> Extractor:
+    """Add ``extractor`` to every corpus (call at import time)."""
+    _EXTRACTORS[extractor.kind] = extractor
+    return extractor
+
+
+class CCorpus:
+    """The C files of one decomp checkout, parsed on demand and at most once.
+
+    ``ahead`` limits the kinds extracted ahead of their request (default: every
+    registered kind).
+    """
+
+    def __init__(self, repo: Path, ahead: Optional[Collection[str]] = None):
+        self.repo = Path(repo)
+        self.ahead = frozenset(_EXTRACTORS if ahead is None else ahead)
+        self._held: _Held = {}  # facts extracted ahead of their request
+        self.parses = 0
+
+    def _stripped(self, rel: str, wanted: Extractor) -> bool:
+        if wanted.strip_conditionals is not None:
+            return wanted.strip_conditionals
+        return any(e.strip_conditionals and e.covers(rel) for e in _EXTRACTORS.values())
+
+    def facts(self, kind: str, rel: str) -> Any:
+        """The ``kind`` extractor's facts for the repo-relative file ``rel``."""
+        source = (self.repo / rel).read_bytes()
+        digest = hashlib.sha1(source).digest()
+        held = self._held.pop((kind, rel), None)
+        if held is not None and held[0] == digest:
+            return held[1]
+
+        wanted = _EXTRACTORS[kind]
+        stripped = self._stripped(rel, wanted)
+        others = [
+            e
+            for e in _EXTRACTORS.values()
+            if e is not wanted
+            and e.kind in self.ahead
+            and e.covers(rel)
+            and e.strip_conditionals in (None, stripped)
+            and self._held.get((e.kind, rel), (None,))[0] != digest
+        ]
+        tree: List[Any] = []  # parsed only if some extractor misses the cache
+
+        def extract(extractor: Extractor) -> Any:
+            if not tree:
+                tree.append(parse_source(source, stripped))
+                self.parses += 1
+            return extractor.func(tree[0], rel)
+
+        def run(extractor: Extractor) -> Any:
+            cache_kind = extractor.kind
+            if extractor.strip_conditionals is None:
+                cache_kind += ":stripped" if stripped else ":raw"
+            return cached(cache_kind, source, rel, lambda: extract(extractor))
+
+        result = run(wanted)
+        if tree:  # parsed anyway: extract the rest while the tree is here
+            for extractor in others:
+                self._held[(extractor.kind, rel)] = (digest, run(extractor))
+        return result
+
+    def prefetch(self, kind: str, rels: Sequence[str]) -> None:
+        """Extract ``kind`` for all of ``rels`` at once, across ``use_pool``'s pool.
+
+        The facts (and whatever else the same parses extracted) are held for
+        ``facts`` to take. Outside ``use_pool`` this does nothing and ``facts``
+        works serially.
+        """
+        rels = [rel for rel in rels if (kind, rel) not in self._held]
+        if _pool is None or _owner != os.getpid() or len(rels) < 2:
+            return
+        for held in _pool.map(
+            _extract_in_worker,
+            itertools.repeat(self.repo),
+            itertools.repeat(kind),
+            itertools.repeat(self.ahead),
+            rels,
+            chunksize=max(1, len(rels) // (_workers * 4)),
+        ):
+            self._held.update(held)
+
+
+def _extract_in_worker(
+    repo: Path, kind: str, ahead: Collection[str], rel: str
+) -> _Held:
+    """One file's facts from a pool worker: the requested kind and the ``ahead``."""
+    worker = CCorpus(repo, ahead)
+    facts = worker.facts(kind, rel)
+    digest = hashlib.sha1((worker.repo / rel).read_bytes()).digest()
+    held = dict(worker._held)
+    held[(kind, rel)] = (digest, facts)
+    return held
+
+
+@contextlib.contextmanager
+def use_pool(pool: Optional[Executor], workers: int = 1) -> Iterator[None]:
+    """Have ``prefetch`` fan out over ``pool`` (of ``workers`` processes) within.
+
+    The pool's workers should have the extraction cache active.
+    """
+    global _pool, _workers, _owner
+    previous = _pool, _workers, _owner
+    _pool, _workers, _owner = pool, max(1, workers), os.getpid()
+    try:
+        yield
+    finally:
+        _pool, _workers, _owner = previous
+
+
+# The open session's corpus, with the pid of the process that opened it.
+_session: Optional[Tuple[int, CCorpus]] = None
+
+
+@contextlib.contextmanager
+def session(repo: Path, ahead: Collection[str]) -> Iterator[CCorpus]:
+    """One build's corpus for ``repo``, extracting the ``ahead`` kinds ahead.
+
+    ``corpus(repo)`` returns it within; on exit it is dropped, together with
+    any facts extracted ahead that no stage took.
+    """
+    global _session
+    previous = _session
+    current = CCorpus(Path(repo).resolve(), ahead)
+    _session = os.getpid(), current
+    try:
+        yield current
+    finally:
+        _session = previous
+
+
+def corpus(repo: Path) -> CCorpus:
+    """The open session's corpus for ``repo``, else a fresh one for the caller."""
+    key = Path(repo).resolve()
+    if _session is not None and _session[0] == os.getpid():
+        if _session[1].repo == key:
+            return _session[1]
+    return CCorpus(key, ())
@@ -12,15 +12,24 @@ reachability walk live here, shared by both.
 tree-sitter is a build-time dependency (it produces the database); it never
 ships to the web client. It is pinned to 0.21.x in pyproject (its
 ``Language()`` / ``Parser()`` API differs from 0.22+).
+
+The extraction matches what it wants -- function definitions, named calls and
+their argument lists, ``if`` statements -- with compiled tree-sitter queries,
+so the search over the tree runs in C and Python only ever sees the matched
+nodes. The remaining generic walks (``iter_nodes``, ``find_descendant``) step
+a ``TreeCursor`` iteratively instead of recursing through ``node.children``.
 """
 
+import bisect
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, FrozenSet, List, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 import tree_sitter_c
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Query
+
+from sm64_sql.graph_utils import BitGraph, iter_bits
 
 # Preprocessor conditional directives. tree-sitter parses C, not the preprocessor,
 # so a directive that splits a brace pair -- e.g. an "#if ENABLE_RUMBLE { #endif
@@ -53,19 +62,49 @@ class Func:
     line: int = 0  # 1-based line of the definition (provenance)
 
 
+_language: Optional[Language] = None
 _parser: Optional[Parser] = None
+_queries: Dict[str, Query] = {}
+
+# One query, three patterns (their indexes are the _*_PATTERN constants):
+# function definitions; plain named calls -- a function-pointer call or a cast
+# that the grammar shapes like a call (e.g. "(s32)(x)") is not a relation --
+# with their argument lists; and if statements with their condition and else.
+_EXTRACT_QUERY = """
+(function_definition) @function
+(call_expression
+  function: (identifier) @callee
+  arguments: (argument_list) @arguments) @call
+(if_statement
+  condition: (_) @condition
+  alternative: (_)? @alternative) @if
+"""
+_FUNCTION_PATTERN, _CALL_PATTERN, _IF_PATTERN = 0, 1, 2
+
+
+def get_language() -> Language:
+    global _language
+    if _language is None:
+        _language = Language(tree_sitter_c.language(), "c")
+    return _language
 
 
 def get_parser() -> Parser:
     global _parser
     if _parser is None:
-        language = Language(tree_sitter_c.language(), "c")
         parser = Parser()
-        parser.set_language(language)
+        parser.set_language(get_language())
         _parser = parser
     return _parser
 
 
+def _query(source: str) -> Query:
+    """The compiled query for ``source`` (compiled once per process)."""
+    if source not in _queries:
+        _queries[source] = get_language().query(source)
+    return _queries[source]
+
+
 def function_name(node) -> Optional[str]:
     """Return the identifier of a ``function_definition`` node.
 
@@ -95,12 +134,27 @@ def function_name(node) -> Optional[str]:
     return declarator.text.decode() if declarator is not None else None
 
 
+def _preorder(node) -> Iterator:
+    """``node`` and all its descendants, in pre-order, via one TreeCursor."""
+    cursor = node.walk()
+    depth = 0
+    while True:
+        yield cursor.node
+        if cursor.goto_first_child():
+            depth += 1
+            continue
+        while depth > 0 and not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            depth -= 1
+        if depth == 0:
+            return
+
+
 def iter_nodes(node, node_type: str):
     """Yield every descendant of ``node`` (and ``node`` itself) of ``node_type``."""
-    if node.type == node_type:
-        yield node
-    for child in node.children:
-        yield from iter_nodes(child, node_type)
+    for descendant in _preorder(node):
+        if descendant.type == node_type:
+            yield descendant
 
 
 def function_params(node) -> List[Optional[str]]:
@@ -124,99 +178,158 @@ def function_params(node) -> List[Optional[str]]:
     return params
 
 
-def _guard_condition(call_node) -> Optional[str]:
-    """The condition under which ``call_node`` runs: the nearest enclosing ``if``.
+# An if statement: (start, end, condition node, else branch (start, end) or None)
+_Guard = Tuple[int, int, Any, Optional[Tuple[int, int]]]
+_CallNodes = Tuple[Any, Any, Any]  # call_expression, callee, argument_list
 
-    Walks up to the innermost ``if_statement`` the call sits inside (stopping at
-    the function boundary). A call in the ``else`` branch is negated. The outer
-    parentheses are stripped and whitespace collapsed, so the result reads as a
-    label -- e.g. ``m->input & INPUT_B_PRESSED`` or ``!(m->vel[1] > 0.0f)``. A
-    call guarded by nothing (or by a switch / early-return idiom) returns None.
+
+def _guard(if_node, condition, alternative) -> _Guard:
+    else_range = (alternative.start_byte, alternative.end_byte) if alternative else None
+    return (if_node.start_byte, if_node.end_byte, condition, else_range)
+
+
+def _extract(node) -> Tuple[List[Any], List[_CallNodes], List[_Guard]]:
+    """The function definitions, calls and ifs under ``node``, in pre-order."""
+    definitions: List[Any] = []
+    calls: List[_CallNodes] = []
+    ifs: List[_Guard] = []
+    for pattern, captures in _query(_EXTRACT_QUERY).matches(node):
+        if pattern == _FUNCTION_PATTERN:
+            definitions.append(captures["function"])
+        elif pattern == _CALL_PATTERN:
+            calls.append((captures["call"], captures["callee"], captures["arguments"]))
+        else:
+            ifs.append(
+                _guard(
+                    captures["if"], captures["condition"], captures.get("alternative")
+                )
+            )
+    # Pre-order: by start, and an enclosing node before the nodes inside it.
+    definitions.sort(key=lambda n: (n.start_byte, -n.end_byte))
+    calls.sort(key=lambda call: (call[0].start_byte, -call[0].end_byte))
+    ifs.sort(key=lambda guard: (guard[0], -guard[1]))
+    return definitions, calls, ifs
+
+
+def _enclosing_guards(node) -> List[_Guard]:
+    """The ``if`` statements strictly enclosing ``node``, outermost first."""
+    guards: List[_Guard] = []
+    parent = node.parent
+    while parent is not None and parent.type != "function_definition":
+        if parent.type == "if_statement":
+            condition = parent.child_by_field_name("condition")
+            if condition is not None:
+                alternative = parent.child_by_field_name("alternative")
+                guards.append(_guard(parent, condition, alternative))
+        parent = parent.parent
+    return guards[::-1]
+
+
+def _guard_condition(start: int, guards: List[_Guard]) -> Optional[str]:
+    """The condition under which a call starting at byte ``start`` runs.
+
+    ``guards`` are the ``if`` statements still open at the call, innermost
+    last; the innermost one is the guard. A call in its ``else`` branch is
+    negated. The outer parentheses are stripped and whitespace collapsed, so
+    the result reads as a label -- e.g. ``m->input & INPUT_B_PRESSED`` or
+    ``!(m->vel[1] > 0.0f)``. A call guarded by nothing (or by a switch /
+    early-return idiom) returns None.
     """
-    child = call_node
-    node = call_node.parent
-    while node is not None:
-        if node.type == "function_definition":
-            return None
-        if node.type == "if_statement":
-            cond = node.child_by_field_name("condition")
-            if cond is not None:
-                text = " ".join(cond.text.decode().split())
-                if text.startswith("(") and text.endswith(")"):
-                    text = text[1:-1].strip()
-                # We ascended into this if through `child`; if that is the
-                # `else` body, the call runs under the negated condition.
-                alt = node.child_by_field_name("alternative")
-                in_else = alt is not None and child == alt
-                return f"!({text})" if in_else else text
-        child = node
-        node = node.parent
-    return None
+    if not guards:
+        return None
+    _if_start, _if_end, condition, else_range = guards[-1]
+    text = " ".join(condition.text.decode().split())
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1].strip()
+    in_else = else_range is not None and else_range[0] <= start < else_range[1]
+    return f"!({text})" if in_else else text
+
+
+def _sweep(
+    calls: List[_CallNodes], ifs: List[_Guard], open_guards: List[_Guard]
+) -> List[Call]:
+    """Build the Calls, keeping a stack of the ``if``s open at each one.
+
+    Both lists are in source order, so one pass suffices: an ``if`` is pushed
+    when the sweep reaches it and popped once the sweep has passed its end,
+    and the top of the stack is the current call's guard.
+    """
+    result: List[Call] = []
+    next_if = 0
+    for node, callee, arguments in calls:
+        start = node.start_byte
+        while next_if < len(ifs) and ifs[next_if][0] <= start:
+            while open_guards and open_guards[-1][1] <= ifs[next_if][0]:
+                open_guards.pop()
+            open_guards.append(ifs[next_if])
+            next_if += 1
+        while open_guards and open_guards[-1][1] <= start:
+            open_guards.pop()
+        args = [
+            child.text.decode()
+            for child in arguments.named_children
+            if child.type != "comment"
+        ]
+        result.append(
+            Call(
+                callee.text.decode(),
+                args,
+                node.start_point[0] + 1,
+                _guard_condition(start, open_guards),
+            )
+        )
+    return result
 
 
 def collect_calls(body) -> List[Call]:
-    """Every ``call_expression`` in a function body, in source (pre-order)."""
-    calls: List[Call] = []
-
-    def visit(node) -> None:
-        if node.type == "call_expression":
-            fn = node.child_by_field_name("function")
-            arg_list = node.child_by_field_name("arguments")
-            # Only plain named calls: a function-pointer call or a cast that the
-            # grammar shapes like a call (e.g. "(s32)(x)") is not a relation.
-            if fn is not None and fn.type == "identifier" and arg_list is not None:
-                args = [
-                    child.text.decode()
-                    for child in arg_list.named_children
-                    if child.type != "comment"
-                ]
-                calls.append(
-                    Call(
-                        fn.text.decode(),
-                        args,
-                        node.start_point[0] + 1,
-                        _guard_condition(node),
-                    )
-                )
-        for child in node.children:
-            visit(child)
+    """Every ``call_expression`` in a function body, in source (pre-order).
 
-    visit(body)
-    return calls
+    The ``if``s enclosing ``body`` itself (up to the function boundary) are
+    found by walking up once; those inside it come from the query.
+    """
+    _definitions, calls, ifs = _extract(body)
+    return _sweep(calls, ifs, _enclosing_guards(body))
 
 
 def functions_from_tree(tree, rel: str) -> List[Func]:
-    funcs: List[Func] = []
+    """Every function definition with its calls, from one query over the file.
 
-    def visit(node) -> None:
-        if node.type == "function_definition":
-            name = function_name(node)
-            body = node.child_by_field_name("body")
-            if name is not None and body is not None:
-                funcs.append(
-                    Func(
-                        name,
-                        rel,
-                        collect_calls(body),
-                        function_params(node),
-                        node.start_point[0] + 1,
-                    )
-                )
-            return  # C has no nested function definitions
-        for child in node.children:
-            visit(child)
+    Each function takes the slice of the file's calls and ``if``s that falls
+    inside its body.
+    """
+    definitions, calls, ifs = _extract(tree.root_node)
+    call_starts = [call[0].start_byte for call in calls]
+    if_starts = [guard[0] for guard in ifs]
 
-    visit(tree.root_node)
+    funcs: List[Func] = []
+    outer_end = -1
+    for node in definitions:
+        if node.start_byte < outer_end:
+            continue  # C has no nested function definitions; skip parse debris
+        outer_end = node.end_byte
+        name = function_name(node)
+        body = node.child_by_field_name("body")
+        if name is None or body is None:
+            continue
+        span = (body.start_byte, body.end_byte)
+        first, last = (bisect.bisect_left(call_starts, b) for b in span)
+        first_if, last_if = (bisect.bisect_left(if_starts, b) for b in span)
+        funcs.append(
+            Func(
+                name,
+                rel,
+                _sweep(calls[first:last], ifs[first_if:last_if], []),
+                function_params(node),
+                node.start_point[0] + 1,
+            )
+        )
     return funcs
 
 
 def find_descendant(node, node_type):
-    if node.type == node_type:
-        return node
-    for child in node.children:
-        found = find_descendant(child, node_type)
-        if found is not None:
-            return found
+    for descendant in _preorder(node):
+        if descendant.type == node_type:
+            return descendant
     return None
 
 
@@ -227,7 +340,11 @@ def parse_tree(path: Path, strip_conditionals: bool = False):
     blanked first (see ``_PREPROC_COND``) so a function whose braces are split
     across an ``#if``/``#endif`` is still parsed.
     """
-    src = path.read_bytes()
+    return parse_source(path.read_bytes(), strip_conditionals)
+
+
+def parse_source(src: bytes, strip_conditionals: bool = False):
+    """``parse_tree`` for source already in memory (e.g. read for a cache key)."""
     if strip_conditionals:
         src = _PREPROC_COND.sub(b"", src)
     return get_parser().parse(src)
@@ -238,6 +355,59 @@ def parse_c_functions(path: Path, rel: str) -> List[Func]:
     return functions_from_tree(parse_tree(path), rel)
 
 
+class CallGraph:
+    """The call graph through a ``recursion_set``, closed once for every root.
+
+    Nodes are function names. ``f -> g`` is an edge when ``f`` has a parsed
+    body calling ``g`` and ``g`` is in ``recursion_set``; a call to one of the
+    ``dispatchers`` ``d(table, ...)`` adds an edge to every function its first
+    argument names in ``action_tables``. Everything outside the recursion set
+    is a leaf: it is reached only as a root.
+
+    The graph is closed once as a :class:`~sm64_sql.graph_utils.BitGraph`:
+    its strongly connected components are condensed into a DAG and each
+    component's reachable set is a bitset, so answering a root is a lookup
+    plus decoding its bits -- the cost is the graph's size plus the output,
+    not one walk per root.
+    """
+
+    def __init__(
+        self,
+        funcs: Dict[str, Func],
+        recursion_set: Set[str],
+        action_tables: Optional[Dict[str, List[str]]] = None,
+        dispatchers: FrozenSet[str] = frozenset(),
+    ):
+        action_tables = action_tables or {}
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        edges: List[Tuple[int, int]] = []
+
+        def node(name: str) -> int:
+            index = self._index.get(name)
+            if index is None:
+                index = self._index[name] = len(self._names)
+                self._names.append(name)
+            return index
+
+        for fn in funcs.values():
+            caller = node(fn.name)
+            for call in fn.calls:
+                targets: List[str] = [call.callee]
+                if call.callee in dispatchers and call.args:
+                    targets.extend(action_tables.get(call.args[0], ()))
+                edges.extend((caller, node(t)) for t in targets if t in recursion_set)
+        self._graph = BitGraph(len(self._names), edges)
+
+    def reachable(self, root: str) -> Set[str]:
+        """Functions reachable from ``root``, ``root`` itself included."""
+        index = self._index.get(root)
+        if index is None:
+            return {root}
+        bits = self._graph.reach(index) | 1 << index
+        return {self._names[i] for i in iter_bits(bits)}
+
+
 def reachable(
     root: str,
     funcs: Dict[str, Func],
@@ -255,23 +425,8 @@ def reachable(
     invoked through a function-pointer table are reached. ``root`` itself is
     always included, even when it lives outside the recursion set (an external
     entry point).
+
+    Builds a :class:`CallGraph` for the one root; to attribute many roots,
+    build the graph once and ask it for each.
     """
-    action_tables = action_tables or {}
-    seen = {root}
-    stack = [root]
-
-    def enqueue(name: str) -> None:
-        if name in recursion_set and name not in seen:
-            seen.add(name)
-            stack.append(name)
-
-    while stack:
-        fn = funcs.get(stack.pop())
-        if fn is None:
-            continue
-        for call in fn.calls:
-            enqueue(call.callee)
-            if call.callee in dispatchers and call.args:
-                for action_fn in action_tables.get(call.args[0], ()):
-                    enqueue(action_fn)
-    return seen
+    return CallGraph(funcs, recursion_set, action_tables, dispatchers).reachable(root)
@@ -0,0 +1,116 @@
+"""Where every C function and file-scope array under ``src/`` is defined.
+
+The native-code walk needs to know which file defines a name -- the handful of
+``CALL_NATIVE`` roots that live outside ``src/game/behaviors/`` (menus,
+cutscenes, Mario's loops) -- and used to find out by reading every ``.c`` file
+in ``src/`` and substring-matching each wanted name. Instead, every file is
+taken from the shared C corpus (``c_corpus.py``, so it is parsed once per build
+and not at all when cached) and reduced to the symbols it *defines*: every
+``function_definition`` and every array declared at file scope.
+``index_c_symbols`` turns the rows into a name -> definitions dict, so a lookup
+is one dict access. The rows are also the ``c_symbol`` table.
+
+A prototype or ``extern`` declaration defines nothing and is not listed. A
+``static`` name may be defined in several files, so a name can map to more
+than one definition.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sm64_sql.c_corpus import Extractor, corpus, register
+from sm64_sql.c_parse import function_name
+
+SOURCE_DIR = "src"
+
+
+@dataclass
+class SM64CSymbol:
+    name: str
+    kind: str  # 'function' or 'array'
+    file: str  # repo-relative
+    line: int  # 1-based line of the definition
+
+
+def _top_level(root) -> Iterator:
+    """The function definitions and declarations outside any function body.
+
+    Preprocessor blocks (``#ifdef VERSION_JP ... #endif``) and parse errors are
+    looked through; a definition or declaration is not descended into.
+    """
+    stack = list(reversed(root.named_children))
+    while stack:
+        node = stack.pop()
+        if node.type in ("function_definition", "declaration"):
+            yield node
+        else:
+            stack.extend(reversed(node.named_children))
+
+
+def _array_name(declarator) -> Optional[str]:
+    """The name an (init-)declarator declares, if what it declares is an array.
+
+    Follows the declarator chain down to its identifier: ``sTable[]``,
+    ``*sPointers[4]`` and ``(*sActions[])(void)`` are arrays; a plain variable
+    or a prototype ``f(void)`` is not.
+    """
+    is_array = False
+    node = declarator
+    while node is not None and node.type != "identifier":
+        if node.type == "array_declarator":
+            is_array = True
+        if node.type == "parenthesized_declarator":
+            node = node.named_children[0] if node.named_children else None
+        else:
+            node = node.child_by_field_name("declarator")
+    if node is None or not is_array:
+        return None
+    return node.text.decode()
+
+
+def symbols_from_tree(tree, rel: str) -> List[SM64CSymbol]:
+    """The functions and file-scope arrays a parsed file defines."""
+    symbols: List[SM64CSymbol] = []
+    for node in _top_level(tree.root_node):
+        line = node.start_point[0] + 1
+        if node.type == "function_definition":
+            name = function_name(node)
+            if name is not None:
+                symbols.append(SM64CSymbol(name, "function", rel, line))
+            continue
+        if any(
+            child.type == "storage_class_specifier" and child.text == b"extern"
+            for child in node.children
+        ):
+            continue
+        for declarator in node.children_by_field_name("declarator"):
+            name = _array_name(declarator)
+            if name is not None:
+                symbols.append(SM64CSymbol(name, "array", rel, line))
+    return symbols
+
+
+# Run on every file in src/ whenever it is parsed, however it is parsed.
+register(Extractor("c_symbols", symbols_from_tree, ("src/*.c",), None))
+
+
+def parse_c_symbols(repo: Path) -> List[SM64CSymbol]:
+    """Every function and file-scope array defined in ``src/**/*.c``."""
+    c_files = corpus(repo)
+    rels = [
+        p.relative_to(repo).as_posix() for p in sorted((repo / SOURCE_DIR).rglob("*.c"))
+    ]
+    c_files.prefetch("c_symbols", rels)
+    symbols: List[SM64CSymbol] = []
+    for rel in rels:
+        symbols.extend(c_files.facts("c_symbols", rel))
+    return symbols
+
+
+def index_c_symbols(symbols: List[SM64CSymbol]) -> Dict[str, List[SM64CSymbol]]:
+    """Name -> its definitions, in the order the rows list them."""
+    index: Dict[str, List[SM64CSymbol]] = {}
+    for symbol in symbols:
+        index.setdefault(symbol.name, []).append(symbol)
+    return index
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 from sm64_sql.parse_utils import (
     extract_macro_args,
     split_top_level,
@@ -49,6 +51,59 @@ class SM64CameraTrigger:
     line: int
 
 
+@dataclass
+class SM64CameraTriggerObject:
+    """A placement inside a camera trigger's box (see ``zone_offsets``).
+
+    Built from the loaded tables (db.create_camera_trigger_objects), so the
+    placement is identified by its rowid, as in ``spatial_index``.
+    """
+
+    camera_table: str  # with seq, the trigger's key in camera_trigger
+    seq: int
+    kind: str  # the placement's table: object, macro_object or special_object
+    source_rowid: int  # the placement's rowid in that table
+    level: str
+    area: int
+    # The placement's offset from the box centre in the box's own frame (the
+    # yaw undone); it is inside because |local_n| < bounds_n on every axis.
+    local_x: float
+    local_y: float
+    local_z: float
+
+
+def _s16_sin_cos(yaw: int) -> Tuple[float, float]:
+    # sins()/coss() read a 4096-entry table indexed by the angle's top 12 bits.
+    angle = ((yaw & 0xFFFF) >> 4) * 2 * np.pi / 4096
+    return float(np.sin(angle)), float(np.cos(angle))
+
+
+def zone_offsets(
+    trigger: SM64CameraTrigger, points: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Which of ``points`` (an (n, 3) x/y/z array) are inside ``trigger``'s box.
+
+    Mirrors camera.c's ``is_pos_in_bounds``: the point's offset from the centre
+    is rotated by ``bounds_yaw`` with ``rotate_in_xz`` and compared, strictly,
+    against the half-extents. Returns the inside mask and the (n, 3) rotated
+    offsets.
+    """
+    sin, cos = _s16_sin_cos(trigger.bounds_yaw)
+    rel = points - np.array(
+        [trigger.center_x, trigger.center_y, trigger.center_z], np.float64
+    )
+    local = np.stack(
+        [
+            rel[:, 2] * sin + rel[:, 0] * cos,
+            rel[:, 1],
+            rel[:, 2] * cos - rel[:, 0] * sin,
+        ],
+        axis=1,
+    )
+    bounds = np.array([trigger.bounds_x, trigger.bounds_y, trigger.bounds_z])
+    return (np.abs(local) < bounds).all(axis=1), local
+
+
 def _camera_table_to_folder(level_defines: Path) -> Dict[str, str]:
     """Map each camera-table symbol to the level folder that wires it in.
 
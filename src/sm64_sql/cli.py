@@ -1,11 +1,19 @@
 import argparse
 import sqlite3
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from sm64_sql import __version__
-from sm64_sql.db import write_to_db
-from sm64_sql.everything import parse_repo
+from sm64_sql import __version__, build_stats, extract_cache
+from sm64_sql.build_stats import BuildStat
+from sm64_sql.db import (
+    materialize_views,
+    stream_to_db,
+    write_build_stats,
+    write_to_db,
+)
+from sm64_sql.everything import parse_repo, stream_repo
+from sm64_sql.incremental import has_manifest, update_db, write_manifest
 
 
 def check_repo(repo_path: str) -> Path:
@@ -17,9 +25,72 @@ def check_repo(repo_path: str) -> Path:
     return path
 
 
-def run(repo: str, db: Optional[str], overwrite: bool) -> None:
+def run_incremental(path: Path, db: str, jobs: int = 1) -> bool:
+    """Update ``db`` in place from its build manifest; False if it has none."""
+    conn = sqlite3.connect(db)
+    try:
+        if not has_manifest(conn):
+            return False
+        rebuilt = update_db(conn, path, jobs)
+    finally:
+        conn.close()
+    print(f"rebuilt: {', '.join(rebuilt)}" if rebuilt else "up to date")
+    return True
+
+
+def run(
+    repo: str,
+    db: Optional[str],
+    overwrite: bool,
+    jobs: int = 1,
+    incremental: bool = False,
+    cache: Optional[extract_cache.ExtractionCache] = None,
+    verbose: bool = False,
+    materialize: bool = False,
+    stream: bool = False,
+    profile: Optional[Path] = None,
+) -> None:
+    extract_cache.activate(cache)
+    try:
+        build(
+            repo,
+            db,
+            overwrite,
+            jobs,
+            incremental,
+            verbose,
+            materialize,
+            stream,
+            profile,
+        )
+    finally:
+        extract_cache.activate(None)
+    if verbose and cache is not None:
+        print(
+            f"extraction cache: {cache.hits} hits, {cache.misses} misses "
+            f"({cache.directory})",
+            file=sys.stderr,
+        )
+
+
+def build(
+    repo: str,
+    db: Optional[str],
+    overwrite: bool,
+    jobs: int = 1,
+    incremental: bool = False,
+    verbose: bool = False,
+    materialize: bool = False,
+    stream: bool = False,
+    profile: Optional[Path] = None,
+) -> None:
     path = check_repo(repo)
-    everything = parse_repo(path)
+    if incremental and db is not None and Path(db).is_file():
+        if run_incremental(path, db, jobs):
+            return
+        print(f"{db} has no build manifest; doing a full build", file=sys.stderr)
+    stats: Optional[List[BuildStat]] = [] if profile is not None else None
+    everything = None if stream else parse_repo(path, jobs, stats)
     if db is not None and Path(db).is_file():
         if not overwrite:
             prompt = input("Database already exists. Overwrite? [y/n]: ")
@@ -27,7 +98,23 @@ def run(repo: str, db: Optional[str], overwrite: bool) -> None:
                 return
         Path(db).unlink()
     conn = sqlite3.connect(db or ":memory:")
-    write_to_db(conn, everything)
+    if everything is None:
+        loads = stream_to_db(conn, stream_repo(path, jobs, stats), True, stats)
+    else:
+        loads = write_to_db(conn, everything, True, stats)
+    if verbose:
+        for load in loads:
+            print(
+                f"{load.table}: {load.rows} rows in {load.seconds * 1000:.1f} ms "
+                f"({load.rows_per_second:,.0f} rows/s)",
+                file=sys.stderr,
+            )
+    if materialize:
+        materialize_views(conn)
+    write_manifest(conn, path, everything)
+    if profile is not None and stats is not None:
+        write_build_stats(conn, stats)
+        build_stats.write_json(profile, stats)
     if conn:
         conn.close()
 
@@ -49,11 +136,92 @@ def main() -> None:
         help="overwrite an existing database without prompting",
         action="store_true",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="parse stages, and the C files within a stage, in parallel with "
+        "N worker processes (default: 1, serial)",
+        type=int,
+        default=1,
+        metavar="N",
+    )
+    parser.add_argument(
+        "--incremental",
+        help="update an existing --db in place, re-parsing only the source files "
+        "that changed since it was built",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--stream",
+        help="write each parse stage's rows to the database as soon as it "
+        "finishes instead of holding the whole build in memory; the largest "
+        "table (the C call sites) is written row by row as it is parsed, "
+        "except under --profile, which collects every stage's rows to count "
+        "and time them",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--materialize-views",
+        help="store the json_each-based behavior_calls_* / behavior_all_spawns "
+        "views as indexed tables, computed once at build time",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        help="time every parse stage and database step (wall/CPU time, rows, "
+        "files and bytes read, peak memory) into a build_stats table and FILE "
+        "(default: build_stats.json)",
+        type=Path,
+        nargs="?",
+        const=Path("build_stats.json"),
+        default=None,
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="where to keep per-file C extraction results "
+        f"(default: {extract_cache.default_cache_dir()})",
+        type=Path,
+        default=None,
+        metavar="DIR",
+    )
+    parser.add_argument(
+        "--no-cache",
+        help="parse every C file from scratch, without reading or writing the cache",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        help="empty the extraction cache before building",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        help="report extraction-cache hits and misses and per-table load rates "
+        "on stderr",
+        action="store_true",
+    )
     parser.add_argument(
         "--version", action="version", version=f"%(prog)s {__version__}"
     )
     args = parser.parse_args()
-    run(args.repo, args.db, args.overwrite)
+    cache_dir = args.cache_dir or extract_cache.default_cache_dir()
+    if args.clear_cache:
+        extract_cache.ExtractionCache(cache_dir).clear()
+    cache = None if args.no_cache else extract_cache.ExtractionCache(cache_dir)
+    run(
+        args.repo,
+        args.db,
+        args.overwrite,
+        args.jobs,
+        args.incremental,
+        cache,
+        args.verbose,
+        args.materialize_views,
+        args.stream,
+        args.profile,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+"""Collision geometry: the vertices and triangles of each collision.inc.c mesh.
+
+A collision file holds one or more ``const Collision name[]`` arrays. Each is a
+vertex list followed by groups of triangles, one group per surface type::
+
+    const Collision bob_seg7_collision_level[] = {
+        COL_INIT(),
+        COL_VERTEX_INIT(0x1A3),
+        COL_VERTEX(-8191, -4095, 8192),
+        ...
+        COL_TRI_INIT(SURFACE_DEFAULT, 412),
+        COL_TRI(0, 1, 2),
+        ...
+        COL_TRI_INIT(SURFACE_FLOWING_WATER, 2),
+        COL_TRI_SPECIAL(3, 4, 5, 0x40),
+        ...
+        COL_TRI_STOP(),
+        COL_SPECIAL_INIT(3),
+        SPECIAL_OBJECT(/*preset*/ special_level_geo_03, /*pos*/ 0, 0, 0),
+        ...
+        COL_END(),
+    };
+
+A level's meshes run to tens of thousands of vertices, so they are not stored a
+row per vertex. Each array becomes one ``collision_mesh`` row holding its
+vertices packed into a BLOB (``x, y, z`` little-endian int16, as the game
+stores them), with its triangle count and bounding box alongside. Each triangle
+group becomes one ``collision_surface`` row holding its triangles packed the
+same way (``v1, v2, v3`` little-endian uint16 vertex indices into the mesh's
+vertices). A client can view either BLOB as an ``Int16Array`` /
+``Uint16Array`` directly.
+
+``read_collision`` reads a file once for its geometry and its
+``SPECIAL_OBJECT*`` placements (see special.py) together.
+"""
+
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sm64_sql.parse_utils import MacroCall, iter_macro_calls
+from sm64_sql.special import (
+    SPECIAL_OBJECT_MACROS,
+    SM64SpecialObject,
+    special_object_from_call,
+)
+
+COLLISION_MACROS = ("COL_VERTEX", "COL_TRI_INIT", "COL_TRI", "COL_TRI_SPECIAL")
+
+_ARRAY = re.compile(r"^\s*(?:static\s+)?const Collision (\w+)\[\]", re.MULTILINE)
+
+
+@dataclass
+class SM64CollisionMesh:
+    collision_name: str  # the Collision array, e.g. bob_seg7_collision_level
+    level: str  # level folder
+    area: int  # area number from the path; 0 for an object's mesh
+    vertex_count: int
+    triangle_count: int  # across all of the mesh's surfaces
+    min_x: Optional[int]  # bounding box of the vertices; NULL when there are none
+    min_y: Optional[int]
+    min_z: Optional[int]
+    max_x: Optional[int]
+    max_y: Optional[int]
+    max_z: Optional[int]
+    vertices: bytes  # vertex_count (x, y, z) triples, little-endian int16
+
+
+@dataclass
+class SM64CollisionSurface:
+    collision_name: str  # joins to collision_mesh.collision_name
+    seq: int  # position of the COL_TRI_INIT group within the mesh (0-based)
+    level: str
+    area: int
+    surface_type: str  # SURFACE_* as written, e.g. SURFACE_DEFAULT
+    triangle_count: int
+    triangles: bytes  # (v1, v2, v3) vertex indices, little-endian uint16
+    # COL_TRI_SPECIAL's 4th argument per triangle (little-endian int16), e.g. a
+    # flowing-water force; NULL when the group has only plain COL_TRIs.
+    params: Optional[bytes]
+
+
+@dataclass
+class CollisionRows:
+    """Every row one collision.inc.c contributes, each list in file order."""
+
+    meshes: List[SM64CollisionMesh] = field(default_factory=list)
+    surfaces: List[SM64CollisionSurface] = field(default_factory=list)
+    special_objects: List[SM64SpecialObject] = field(default_factory=list)
+
+
+def _pack(fmt: str, values: List[int], mesh: str) -> bytes:
+    try:
+        return struct.pack(f"<{len(values)}{fmt}", *values)
+    except struct.error as e:
+        raise ValueError(f"Collision value out of range in {mesh}: {e}") from None
+
+
+class _Mesh:
+    """One Collision array as it is read: flat vertex and index lists."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.coords: List[int] = []  # x, y, z, x, y, z, ...
+        # (surface type, flat v1 v2 v3 indices, COL_TRI_SPECIAL param or None)
+        self.groups: List[Tuple[str, List[int], List[Optional[int]]]] = []
+
+    def rows(self, level: str, area: int) -> CollisionRows:
+        rows = CollisionRows()
+        xs, ys, zs = self.coords[0::3], self.coords[1::3], self.coords[2::3]
+        box: List[Optional[int]] = (
+            [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)] if xs else [None] * 6
+        )
+        rows.meshes.append(
+            SM64CollisionMesh(
+                collision_name=self.name,
+                level=level,
+                area=area,
+                vertex_count=len(xs),
+                triangle_count=sum(len(g[1]) // 3 for g in self.groups),
+                min_x=box[0],
+                min_y=box[1],
+                min_z=box[2],
+                max_x=box[3],
+                max_y=box[4],
+                max_z=box[5],
+                vertices=_pack("h", self.coords, self.name),
+            )
+        )
+        for seq, (surface_type, indices, params) in enumerate(self.groups):
+            rows.surfaces.append(
+                SM64CollisionSurface(
+                    collision_name=self.name,
+                    seq=seq,
+                    level=level,
+                    area=area,
+                    surface_type=surface_type,
+                    triangle_count=len(indices) // 3,
+                    triangles=_pack("H", indices, self.name),
+                    params=(
+                        _pack("h", [p or 0 for p in params], self.name)
+                        if any(p is not None for p in params)
+                        else None
+                    ),
+                )
+            )
+        return rows
+
+
+def _add_call(mesh: _Mesh, call: MacroCall) -> None:
+    args = call.args
+    if call.name == "COL_TRI_INIT":
+        if not args:
+            raise ValueError(f"Too few args in {call.name}: {call.text}")
+        mesh.groups.append((args[0], [], []))
+        return
+    wanted = 4 if call.name == "COL_TRI_SPECIAL" else 3
+    if len(args) < wanted:
+        raise ValueError(f"Too few args in {call.name}: {call.text}")
+    values = [int(arg, 0) for arg in args[:wanted]]
+    if call.name == "COL_VERTEX":
+        mesh.coords.extend(values)
+        return
+    if not mesh.groups:
+        raise ValueError(f"{call.name} before any COL_TRI_INIT: {call.text}")
+    _type, indices, params = mesh.groups[-1]
+    indices.extend(values[:3])
+    params.append(values[3] if call.name == "COL_TRI_SPECIAL" else None)
+
+
+def read_collision(
+    path: Path, level: str, area: int, preset_ids: Dict[str, int]
+) -> CollisionRows:
+    """The meshes, surfaces and special objects of one collision.inc.c.
+
+    ``preset_ids`` resolves the special objects' preset names, as in
+    ``parse_special_objects``. Geometry outside a ``Collision`` array is
+    ignored.
+    """
+    text = path.read_text()
+    rows = CollisionRows()
+    # (1-based line, array name) of each array declaration, in file order.
+    arrays = [
+        (text.count("\n", 0, match.start(1)) + 1, match.group(1))
+        for match in _ARRAY.finditer(text)
+    ]
+    meshes: List[_Mesh] = []
+    next_array = 0
+    for call in iter_macro_calls(text, COLLISION_MACROS + SPECIAL_OBJECT_MACROS):
+        while next_array < len(arrays) and arrays[next_array][0] < call.line:
+            meshes.append(_Mesh(arrays[next_array][1]))
+            next_array += 1
+        if call.name in SPECIAL_OBJECT_MACROS:
+            rows.special_objects.append(
+                special_object_from_call(call, level, area, preset_ids)
+            )
+        elif meshes:
+            _add_call(meshes[-1], call)
+    meshes.extend(_Mesh(name) for _line, name in arrays[next_array:])
+    for mesh in meshes:
+        mesh_rows = mesh.rows(level, area)
+        rows.meshes.extend(mesh_rows.meshes)
+        rows.surfaces.extend(mesh_rows.surfaces)
+    return rows
@@ -1,15 +1,59 @@
+import contextlib
 import dataclasses
+import itertools
+import operator
+import re
 import sqlite3
+import textwrap
+import time
 import typing
-from typing import Any, Iterable, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
+
+from sm64_sql.build_stats import BuildStat, measure
+from sm64_sql.camera_trigger import (
+    SM64CameraTrigger,
+    SM64CameraTriggerObject,
+    zone_offsets,
+)
+from sm64_sql.collision import SM64CollisionMesh, SM64CollisionSurface
 from sm64_sql.everything import (
     ENTITY_TABLES,
     ENTITY_VIEWS,
+    MATERIALIZABLE_VIEWS,
     TABLE_KEYS,
+    ForeignKey,
     SM64Everything,
     TableKeys,
 )
+from sm64_sql.macro_object import SM64MacroObject
+from sm64_sql.mario_action_graph import (
+    SM64MarioActionGraph,
+    SM64MarioActionStep,
+    mario_action_graph,
+    mario_action_steps,
+)
+from sm64_sql.object import SM64Object
+from sm64_sql.placement_surface import SM64PlacementSurface, locate_placement_surfaces
+from sm64_sql.spatial_index import (
+    CELL_COUNT,
+    CELL_ORIGIN,
+    CELL_SIZE,
+    SM64SpatialIndex,
+    cells,
+    trigger_box,
+)
+from sm64_sql.spawn_closure import SM64SpawnClosure, spawn_closure
+from sm64_sql.special import SM64SpecialObject
+from sm64_sql.warp import (
+    SM64InstantWarp,
+    SM64Warp,
+    SM64WarpClosure,
+    SM64WarpShortestPath,
+    warp_graph,
+)
 
 
 def get_sql_type(python_type: str) -> str:
@@ -19,6 +63,10 @@ def get_sql_type(python_type: str) -> str:
         return "INTEGER"
     elif python_type == "str":
         return "TEXT"
+    elif python_type == "float":
+        return "REAL"
+    elif python_type == "bytes":
+        return "BLOB"
     else:
         raise ValueError(f"Unhandled python type: {python_type}")
 
@@ -75,31 +123,699 @@ def insert_into_table(
     cursor.execute(command, row)
 
 
+# A table a view reads: FROM/JOIN <table> [[AS] alias].
+_VIEW_SOURCE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?"
+    r"(?!(?:WHERE|ON|JOIN|LEFT|INNER|CROSS|UNION|GROUP|ORDER|LIMIT)\b)(\w+))?",
+    re.IGNORECASE,
+)
+# A column compared by a predicate: [alias.]col <op> ..., or ... = [alias.]col.
+_VIEW_PREDICATE = re.compile(
+    r"(?:\b(\w+)\.)?\b(\w+)\s*"
+    r"(?:=|<>|!=|<=|>=|<|>|\bNOT\s+IN\b|\bIN\b|\bIS\b|\bGLOB\b|\bLIKE\b)",
+    re.IGNORECASE,
+)
+_VIEW_PREDICATE_RHS = re.compile(r"=\s*(?:(\w+)\.)?(\w+)\b")
+
+
+def view_predicate_columns(
+    view_sql: str, columns: Dict[str, Set[str]]
+) -> Set[Tuple[str, str]]:
+    """The (table, column) pairs a view's WHERE / ON predicates compare.
+
+    ``columns`` maps each real table to its column names, which is what keeps
+    this regex honest: a name only counts if it is a column of the table it
+    resolves to. A qualified ``alias.col`` resolves through the view's aliases;
+    a bare ``col`` belongs to the nearest preceding FROM/JOIN table that has it
+    (so ``json_each``'s ``value``, or a literal, never matches anything).
+    """
+    sources = [
+        (m.start(), m.group(1), m.group(2)) for m in _VIEW_SOURCE.finditer(view_sql)
+    ]
+    aliases = {alias: table for _pos, table, alias in sources if alias}
+    found: Set[Tuple[str, str]] = set()
+    for match in itertools.chain(
+        _VIEW_PREDICATE.finditer(view_sql), _VIEW_PREDICATE_RHS.finditer(view_sql)
+    ):
+        qualifier, column = match.group(1), match.group(2)
+        if qualifier:
+            candidates = [aliases.get(qualifier, qualifier)]
+        else:
+            candidates = [t for pos, t, _a in reversed(sources) if pos < match.start()]
+        for table in candidates:
+            if column in columns.get(table, ()):
+                found.add((table, column))
+                break
+    return found
+
+
+def index_name(table: str, cols: Sequence[str]) -> str:
+    return f"idx_{table}_{'_'.join(cols)}"
+
+
+def _wanted_indexes(keys: TableKeys) -> List[Tuple[str, ...]]:
+    """The indexes a table's keys ask for: each FK column, each ``indexes`` spec."""
+    wanted: List[Tuple[str, ...]] = []
+    for cols in [(fk.column,) for fk in keys.foreign_keys] + list(keys.indexes):
+        if cols not in wanted:
+            wanted.append(cols)
+    return wanted
+
+
+def _plan_table(
+    keys: TableKeys, wanted: Sequence[Tuple[str, ...]]
+) -> Iterator[Tuple[str, ...]]:
+    """The ``wanted`` indexes of one table that are worth building.
+
+    An index is skipped when a PRIMARY KEY / UNIQUE key or a wider wanted
+    index starts with the same columns, since SQLite can already use that one.
+    """
+    implicit = [keys.primary_key or ()] + list(keys.unique)
+    for cols in wanted:
+        n = len(cols)
+        if any(key[:n] == cols for key in implicit) or any(
+            len(other) > n and other[:n] == cols for other in wanted
+        ):
+            continue
+        yield cols
+
+
+def index_plan() -> List[Tuple[str, Tuple[str, ...]]]:
+    """Every secondary index to build, as (table, columns), in table order.
+
+    Indexed: each declared FK column, each ``TableKeys.indexes`` spec, and each
+    column an ``ENTITY_VIEWS`` predicate compares, less the ones ``_plan_table``
+    finds covered.
+    """
+    columns = {
+        table: {field.name for field in dataclasses.fields(row_type)}
+        for table, row_type, _attr in ENTITY_TABLES
+    }
+    wanted = {table: _wanted_indexes(keys) for table, keys in TABLE_KEYS.items()}
+    for _view_name, view_sql in ENTITY_VIEWS:
+        for table, column in sorted(view_predicate_columns(view_sql, columns)):
+            if (column,) not in wanted.setdefault(table, []):
+                wanted[table].append((column,))
+
+    plan: List[Tuple[str, Tuple[str, ...]]] = []
+    for table, _row_type, _attr in ENTITY_TABLES:
+        keys = TABLE_KEYS.get(table, TableKeys())
+        plan.extend((table, cols) for cols in _plan_table(keys, wanted.get(table, [])))
+    return plan
+
+
+def create_indexes(
+    cursor: sqlite3.Cursor, stats: Optional[List[BuildStat]] = None
+) -> None:
+    for table, cols in index_plan():
+        name = index_name(table, cols)
+        with measure(name, "index", stats):
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(cols)})"
+            )
+
+
+@contextlib.contextmanager
+def _derived_table(
+    cursor: sqlite3.Cursor, table: str, row_type: Any, keys: TableKeys
+) -> Iterator[List[dataclasses.Field]]:
+    """(Re)create a table computed from the loaded ones, for the block to fill.
+
+    Yields the row type's fields; once the block has inserted the rows, the
+    table's indexes are built the way ``create_indexes`` builds the entity
+    tables': each FK column and each ``keys.indexes`` spec, as planned by
+    ``_plan_table``.
+    """
+    fields = list(dataclasses.fields(row_type))
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    create_table(cursor, table, fields, keys)
+    yield fields
+    for cols in _plan_table(keys, _wanted_indexes(keys)):
+        cursor.execute(
+            f"CREATE INDEX {index_name(table, cols)} ON {table} ({', '.join(cols)})"
+        )
+
+
+def _rows(fields: Sequence[dataclasses.Field], values: Iterable[Any]) -> Iterator:
+    """Each value's field tuple, via one C-level attrgetter instead of getattrs."""
+    getter = operator.attrgetter(*(field.name for field in fields))
+    if len(fields) == 1:  # attrgetter of one name returns a bare value
+        return ((getter(value),) for value in values)
+    return map(getter, values)
+
+
 def insert_values(
     cursor: sqlite3.Cursor,
     table_name: str,
     fields: Iterable[dataclasses.Field],
     values: Iterable[Any],
-):
-    for value in values:
-        row = tuple(getattr(value, field.name) for field in fields)
-        insert_into_table(cursor, table_name, row)
+) -> int:
+    """Insert every value's fields as a row; return the number of rows.
+
+    The statement is prepared once and the rows are streamed to ``executemany``
+    from a generator, so no intermediate row list is built.
+    """
+    fields = list(fields)
+    question_marks = ", ".join("?" for _ in fields)
+    before = cursor.connection.total_changes
+    cursor.executemany(
+        f"INSERT INTO {table_name} VALUES ({question_marks})", _rows(fields, values)
+    )
+    return cursor.connection.total_changes - before
+
+
+@dataclass
+class TableLoad:
+    """How long filling one table took (returned by ``write_to_db``)."""
+
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+# Build-time settings for bulk=True: no rollback journal and no fsync while the
+# tables fill (a crash mid-build just means rebuilding), and a 64 MiB page cache.
+_BULK_PRAGMAS = (
+    ("journal_mode", "OFF"),
+    ("synchronous", "OFF"),
+    ("cache_size", -65536),
+)
+
+
+@contextlib.contextmanager
+def _bulk_pragmas(conn: sqlite3.Connection, bulk: bool) -> Iterator[None]:
+    """Apply ``_BULK_PRAGMAS`` for the block (if ``bulk``), then restore them."""
+    cursor = conn.cursor()
+    conn.commit()  # settle any open transaction before touching pragmas
+    saved = []
+    if bulk:
+        for pragma, value in _BULK_PRAGMAS:
+            saved.append((pragma, cursor.execute(f"PRAGMA {pragma}").fetchone()[0]))
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+    try:
+        yield
+    finally:
+        for pragma, value in saved:
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+def create_schema(
+    cursor: sqlite3.Cursor, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """Create every (empty) entity table."""
+    with measure("schema", "schema", stats):
+        for table_name, row_type, _attr in ENTITY_TABLES:
+            create_table(
+                cursor,
+                table_name,
+                dataclasses.fields(row_type),
+                TABLE_KEYS.get(table_name),
+            )
 
 
-def write_to_db(conn: sqlite3.Connection, everything: SM64Everything) -> None:
+def load_table(
+    conn: sqlite3.Connection,
+    table_name: str,
+    row_type: Any,
+    values: Iterable[Any],
+    bulk: bool = False,
+    stats: Optional[List[BuildStat]] = None,
+) -> TableLoad:
+    """Insert ``values`` into an entity table; with ``bulk``, as one transaction."""
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    with measure(table_name, "table", stats) as stat:
+        if bulk:
+            cursor.execute("BEGIN")
+        rows = insert_values(cursor, table_name, dataclasses.fields(row_type), values)
+        if bulk:
+            conn.commit()
+        stat.rows = rows
+    return TableLoad(table_name, rows, time.perf_counter() - start)
+
+
+SPATIAL_INDEX = "spatial_index"
+
+# (kind, table, x, y, z columns) of each table of points placed in the world.
+_SPATIAL_POINTS = (
+    ("object", "object", "initial_x", "initial_y", "initial_z"),
+    ("macro_object", "macro_object", "pos_x", "pos_y", "pos_z"),
+    ("special_object", "special_object", "pos_x", "pos_y", "pos_z"),
+)
+
+
+def _cell_sql(column: str) -> str:
+    """SQL for spatial_index.cell_of(column)."""
+    return (
+        f"MIN(MAX((CAST({column} AS INTEGER) + {CELL_ORIGIN}) / {CELL_SIZE}, 0), "
+        f"{CELL_COUNT - 1})"
+    )
+
+
+def create_spatial_index(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``spatial_index``, the grid index over everything with a position.
+
+    One row per placement (a point: min == max) and one per grid cell touched
+    by each ``camera_trigger`` box (widened to the axis-aligned extent of its
+    ``bounds_yaw`` rotation); see spatial_index.py. Each row names its source
+    by ``kind`` (the table) and ``source_rowid``. Rowids change when a table is
+    refilled, so the index is rebuilt from scratch every time.
+    """
     cursor = conn.cursor()
-    for table_name, row_type, attr in ENTITY_TABLES:
-        create_table(
-            cursor, table_name, dataclasses.fields(row_type), TABLE_KEYS.get(table_name)
+    keys = TableKeys(
+        primary_key=("level", "area", "cell_x", "cell_z", "kind", "source_rowid"),
+        indexes=(("kind", "source_rowid"),),
+    )
+    with measure(SPATIAL_INDEX, "index", stats) as stat, _derived_table(
+        cursor, SPATIAL_INDEX, SM64SpatialIndex, keys
+    ) as fields:
+        before = conn.total_changes
+        for kind, table, x, y, z in _SPATIAL_POINTS:
+            cursor.execute(
+                f"INSERT INTO {SPATIAL_INDEX} "
+                f"SELECT level, area, {_cell_sql(x)}, {_cell_sql(z)}, ?, rowid, "
+                f"{x}, {x}, {y}, {y}, {z}, {z} FROM {table} "
+                "WHERE level IS NOT NULL",
+                (kind,),
+            )
+        triggers = cursor.execute(
+            "SELECT rowid, level, area, center_x, center_y, center_z, "
+            "bounds_x, bounds_y, bounds_z, bounds_yaw FROM camera_trigger "
+            "WHERE level IS NOT NULL"
+        ).fetchall()
+        rows = []
+        for rowid, level, area, *geometry in triggers:
+            box = trigger_box(geometry[0:3], geometry[3:6], geometry[6])
+            for cell_x, cell_z in cells(box[0], box[1], box[4], box[5]):
+                rows.append(
+                    SM64SpatialIndex(
+                        level, area, cell_x, cell_z, "camera_trigger", rowid, *box
+                    )
+                )
+        insert_values(cursor, SPATIAL_INDEX, fields, rows)
+        stat.rows = conn.total_changes - before
+
+
+CAMERA_TRIGGER_OBJECT = "camera_trigger_object"
+
+
+def create_camera_trigger_objects(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``camera_trigger_object``: the placements inside each trigger.
+
+    Each trigger is tested against the placements of its level (and of its
+    area, unless it applies to the whole level) in one vectorized
+    ``zone_offsets`` call. Like ``spatial_index`` it names placements by
+    rowid, so it is rebuilt whenever the tables are.
+    """
+    cursor = conn.cursor()
+    keys = TableKeys(
+        foreign_keys=(ForeignKey("level", "level", "folder"),),
+        indexes=(("camera_table", "seq"), ("kind", "source_rowid")),
+    )
+    with measure(CAMERA_TRIGGER_OBJECT, "table", stats) as stat, _derived_table(
+        cursor, CAMERA_TRIGGER_OBJECT, SM64CameraTriggerObject, keys
+    ) as fields:
+        triggers = [
+            SM64CameraTrigger(*row)
+            for row in cursor.execute(
+                "SELECT * FROM camera_trigger WHERE level IS NOT NULL"
+            ).fetchall()
+        ]
+        placed = (
+            cursor.execute(
+                " UNION ALL ".join(
+                    f"SELECT '{kind}', rowid, level, area, {x}, {y}, {z} FROM {table}"
+                    for kind, table, x, y, z in _SPATIAL_POINTS
+                )
+            ).fetchall()
+            if triggers
+            else []
+        )
+        by_level: Dict[str, List[Tuple[Any, ...]]] = {}
+        for row in placed:
+            by_level.setdefault(row[2], []).append(row)
+        rows = []
+        for trigger in triggers:
+            candidates = [
+                row
+                for row in by_level.get(trigger.level or "", [])
+                if trigger.area == -1 or row[3] == trigger.area
+            ]
+            if not candidates:
+                continue
+            points = np.array([row[4:] for row in candidates], np.float64)
+            inside, local = zone_offsets(trigger, points)
+            for i in np.flatnonzero(inside):
+                kind, rowid, level, area = candidates[i][:4]
+                rows.append(
+                    SM64CameraTriggerObject(
+                        camera_table=trigger.camera_table,
+                        seq=trigger.seq,
+                        kind=kind,
+                        source_rowid=rowid,
+                        level=level,
+                        area=area,
+                        local_x=float(local[i, 0]),
+                        local_y=float(local[i, 1]),
+                        local_z=float(local[i, 2]),
+                    )
+                )
+        stat.rows = insert_values(cursor, CAMERA_TRIGGER_OBJECT, fields, rows)
+
+
+PLACEMENT_SURFACE = "placement_surface"
+
+# The row type of each placement table (see _SPATIAL_POINTS).
+_PLACEMENT_TYPES = (
+    ("object", SM64Object),
+    ("macro_object", SM64MacroObject),
+    ("special_object", SM64SpecialObject),
+)
+
+
+def create_placement_surfaces(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``placement_surface``: each placement's floor and ceiling.
+
+    Computed from the loaded placement and collision tables (see
+    placement_surface.py), so each row is keyed by its placement's ``kind``
+    and ``source_rowid`` and the table is rebuilt whenever they are.
+    """
+    cursor = conn.cursor()
+    keys = TableKeys(
+        primary_key=("kind", "source_rowid"),
+        foreign_keys=(ForeignKey("level", "level", "folder"),),
+        # "Which coins float over a death plane" is a lookup on the floor's
+        # surface type.
+        indexes=(("floor_surface_type",), ("level", "area")),
+    )
+    with measure(PLACEMENT_SURFACE, "table", stats) as stat, _derived_table(
+        cursor, PLACEMENT_SURFACE, SM64PlacementSurface, keys
+    ) as fields:
+        placements: List[Tuple[int, Any]] = [
+            (row[0], row_type(*row[1:]))
+            for table, row_type in _PLACEMENT_TYPES
+            for row in cursor.execute(f"SELECT rowid, * FROM {table}")
+        ]
+        rows = locate_placement_surfaces(
+            placements,
+            [
+                SM64CollisionMesh(*row)
+                for row in cursor.execute("SELECT * FROM collision_mesh")
+            ],
+            [
+                SM64CollisionSurface(*row)
+                for row in cursor.execute("SELECT * FROM collision_surface")
+            ],
+        )
+        stat.rows = insert_values(cursor, PLACEMENT_SURFACE, fields, rows)
+
+
+WARP_CLOSURE = "warp_closure"
+WARP_SHORTEST_PATH = "warp_shortest_path"
+
+
+def create_warp_graph(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``warp_closure`` and ``warp_shortest_path`` (see warp.py).
+
+    The graph spans every level, so it is computed from the loaded ``warp``,
+    ``instant_warp`` and ``level`` tables rather than per level, and is
+    rebuilt whenever they are.
+    """
+    cursor = conn.cursor()
+    keys = TableKeys(
+        foreign_keys=(
+            ForeignKey("level", "level", "folder"),
+            ForeignKey("dest_level", "level", "folder"),
+        ),
+        indexes=(("level", "area"), ("dest_level", "dest_area")),
+    )
+    with measure("warp_graph", "table", stats) as stat, _derived_table(
+        cursor, WARP_CLOSURE, SM64WarpClosure, keys
+    ) as closure_fields, _derived_table(
+        cursor, WARP_SHORTEST_PATH, SM64WarpShortestPath, keys
+    ) as path_fields:
+        rows = warp_graph(
+            [SM64Warp(*row) for row in cursor.execute("SELECT * FROM warp")],
+            [
+                SM64InstantWarp(*row)
+                for row in cursor.execute("SELECT * FROM instant_warp")
+            ],
+            dict(
+                cursor.execute(
+                    "SELECT level_name, folder FROM level WHERE folder IS NOT NULL"
+                ).fetchall()
+            ),
         )
-    for table_name, row_type, attr in ENTITY_TABLES:
-        insert_values(
-            cursor,
-            table_name,
-            dataclasses.fields(row_type),
-            getattr(everything, attr),
+        stat.rows = insert_values(
+            cursor, WARP_CLOSURE, closure_fields, rows.closure
+        ) + insert_values(cursor, WARP_SHORTEST_PATH, path_fields, rows.shortest_paths)
+
+
+SPAWN_CLOSURE = "behavior_spawn_closure"
+
+
+def create_spawn_closure(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``behavior_spawn_closure`` (see spawn_closure.py).
+
+    The edges are read back through the ``behavior_all_spawns`` and
+    ``behavior_calls_morph`` views (or their materialized tables), so this runs
+    after the views exist. The primary key serves ancestor lookups and a
+    (descendant, behavior_name) index serves descendant lookups.
+    """
+    cursor = conn.cursor()
+    keys = TableKeys(
+        primary_key=("behavior_name", "descendant"),
+        foreign_keys=(
+            ForeignKey("behavior_name", "behavior", "behavior_name"),
+            ForeignKey("descendant", "behavior", "behavior_name"),
+        ),
+        indexes=(("descendant", "behavior_name"),),
+    )
+    with measure(SPAWN_CLOSURE, "table", stats) as stat, _derived_table(
+        cursor, SPAWN_CLOSURE, SM64SpawnClosure, keys
+    ) as fields:
+        edges = cursor.execute(
+            "SELECT behavior_name, spawned_behavior, origin FROM behavior_all_spawns "
+            "WHERE spawned_behavior IS NOT NULL "
+            "UNION "
+            "SELECT behavior_name, becomes_behavior, 'morph' FROM behavior_calls_morph"
+        ).fetchall()
+        stat.rows = insert_values(cursor, SPAWN_CLOSURE, fields, spawn_closure(edges))
+
+
+MARIO_ACTION_GRAPH = "mario_action_graph"
+MARIO_ACTION_STEP = "mario_action_step"
+
+
+def create_mario_action_graph(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """(Re)build ``mario_action_graph`` and ``mario_action_step``.
+
+    See mario_action_graph.py for the packed columns. ``mario_action_step``
+    unpacks them to (``action_name``, ``to_action``, ``steps``, ``via``) for
+    every reachable pair; ``via`` is the action before ``to_action`` on a
+    shortest path. It is indexed both ways, so "what reaches ACT_X" and "what
+    is one step away" are index lookups too.
+    """
+    cursor = conn.cursor()
+    graph_keys = TableKeys(
+        primary_key=("action_name",),
+        unique=(("ordinal",),),
+        foreign_keys=(ForeignKey("action_name", "mario_action", "action_name"),),
+    )
+    step_keys = TableKeys(
+        primary_key=("action_name", "to_action"),
+        foreign_keys=(
+            ForeignKey("action_name", "mario_action", "action_name"),
+            ForeignKey("to_action", "mario_action", "action_name"),
+            ForeignKey("via", "mario_action", "action_name"),
+        ),
+        indexes=(("to_action", "steps"), ("steps",)),
+    )
+    with measure(MARIO_ACTION_GRAPH, "table", stats) as stat, _derived_table(
+        cursor, MARIO_ACTION_GRAPH, SM64MarioActionGraph, graph_keys
+    ) as graph_fields, _derived_table(
+        cursor, MARIO_ACTION_STEP, SM64MarioActionStep, step_keys
+    ) as step_fields:
+        actions = [
+            row[0] for row in cursor.execute("SELECT action_name FROM mario_action")
+        ]
+        edges = cursor.execute(
+            "SELECT action_name, to_action FROM mario_all_transitions"
+        ).fetchall()
+        graph = mario_action_graph(actions, edges)
+        stat.rows = insert_values(
+            cursor, MARIO_ACTION_GRAPH, graph_fields, graph
+        ) + insert_values(
+            cursor, MARIO_ACTION_STEP, step_fields, mario_action_steps(graph)
         )
+
+
+def finish_schema(
+    conn: sqlite3.Connection, stats: Optional[List[BuildStat]] = None
+) -> None:
+    """Index the filled tables, then add the views and the derived tables.
+
+    When profiling (``stats`` given), each view is also evaluated once with a
+    ``COUNT(*)``, so its step shows what querying it costs.
+    """
+    cursor = conn.cursor()
+    # Indexes after the rows: one sorted build per index beats updating it on
+    # every insert.
+    create_indexes(cursor, stats)
     # Views are derived from the tables above, so create them last.
-    for _view_name, view_sql in ENTITY_VIEWS:
-        cursor.execute(view_sql)
+    for view_name, view_sql in ENTITY_VIEWS:
+        with measure(view_name, "view", stats) as stat:
+            cursor.execute(view_sql)
+            if stats is not None:
+                (stat.rows,) = cursor.execute(
+                    f"SELECT COUNT(*) FROM {view_name}"
+                ).fetchone()
+    create_spatial_index(conn, stats)
+    create_camera_trigger_objects(conn, stats)
+    create_placement_surfaces(conn, stats)
+    create_warp_graph(conn, stats)
+    create_spawn_closure(conn, stats)
+    create_mario_action_graph(conn, stats)
+    conn.commit()
+
+
+def write_to_db(
+    conn: sqlite3.Connection,
+    everything: SM64Everything,
+    bulk: bool = False,
+    stats: Optional[List[BuildStat]] = None,
+) -> List[TableLoad]:
+    """Create and fill every entity table, index it, then add the views.
+
+    Returns the per-table load timings; with ``stats``, a BuildStat for every
+    step (see build_stats.py) is appended to it as well.
+
+    With ``bulk`` the load runs under ``_BULK_PRAGMAS``, one explicit
+    transaction per table, and the connection's previous journal mode,
+    synchronous level and cache size are restored afterwards. The resulting
+    database is the same either way.
+    """
+    with _bulk_pragmas(conn, bulk):
+        create_schema(conn.cursor(), stats)
+        loads = [
+            load_table(
+                conn, table_name, row_type, getattr(everything, attr), bulk, stats
+            )
+            for table_name, row_type, attr in ENTITY_TABLES
+        ]
+        finish_schema(conn, stats)
+    return loads
+
+
+def stream_to_db(
+    conn: sqlite3.Connection,
+    results: Iterable[Dict[str, Any]],
+    bulk: bool = False,
+    stats: Optional[List[BuildStat]] = None,
+) -> List[TableLoad]:
+    """``write_to_db`` fed one stage result at a time (see ``stream_repo``).
+
+    Each table's rows are inserted as soon as the result carrying them arrives
+    and are not kept, so peak memory is one stage's rows rather than the whole
+    build. Values that are not tables are ignored. The database is the same as
+    ``write_to_db`` would produce; the timings come back in table order.
+    """
+    tables = {attr: (table, row_type) for table, row_type, attr in ENTITY_TABLES}
+    loads: Dict[str, TableLoad] = {}
+    with _bulk_pragmas(conn, bulk):
+        create_schema(conn.cursor(), stats)
+        for result in results:
+            for attr, values in result.items():
+                if attr in tables:
+                    table_name, row_type = tables[attr]
+                    loads[table_name] = load_table(
+                        conn, table_name, row_type, values, bulk, stats
+                    )
+        finish_schema(conn, stats)
+    return [loads[table] for table, _row_type, _attr in ENTITY_TABLES if table in loads]
+
+
+MATERIALIZED_TABLE = "materialized_view"
+
+
+def materialize_views(
+    conn: sqlite3.Connection, names: Iterable[str] = tuple(MATERIALIZABLE_VIEWS)
+) -> None:
+    """Replace each named view with a table of the same name holding its rows.
+
+    The table is built by the view's own SELECT (``CREATE TABLE x AS ...``), so
+    it has the same columns and rows; the views are processed in ENTITY_VIEWS
+    order, so a view stacked on another reads the already-materialized one.
+    Each view's SQL is recorded in the ``materialized_view`` table, and calling
+    this again (see ``refresh_materialized_views``) recomputes the tables from
+    the current base tables.
+    """
+    wanted = set(names)
+    cursor = conn.cursor()
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {MATERIALIZED_TABLE} "
+        "(name TEXT PRIMARY KEY, sql TEXT)"
+    )
+    kinds = dict(cursor.execute("SELECT name, type FROM sqlite_master"))
+    for view_name, view_sql in ENTITY_VIEWS:
+        if view_name not in wanted:
+            continue
+        if view_name in kinds:
+            cursor.execute(f"DROP {kinds[view_name].upper()} {view_name}")
+        cursor.execute(
+            view_sql.replace(
+                f"CREATE VIEW {view_name} AS", f"CREATE TABLE {view_name} AS", 1
+            )
+        )
+        for cols in MATERIALIZABLE_VIEWS.get(view_name, ()):
+            cursor.execute(
+                f"CREATE INDEX {index_name(view_name, cols)} "
+                f"ON {view_name} ({', '.join(cols)})"
+            )
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {MATERIALIZED_TABLE} VALUES (?, ?)",
+            (view_name, textwrap.dedent(view_sql).strip()),
+        )
+    conn.commit()
+
+
+def refresh_materialized_views(conn: sqlite3.Connection) -> None:
+    """Recompute the materialized views after their base tables changed."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (MATERIALIZED_TABLE,),
+    ).fetchone()
+    if exists:
+        names = [
+            row[0] for row in conn.execute(f"SELECT name FROM {MATERIALIZED_TABLE}")
+        ]
+        materialize_views(conn, names)
+
+
+BUILD_STATS_TABLE = "build_stats"
+
+
+def write_build_stats(conn: sqlite3.Connection, stats: Sequence[BuildStat]) -> None:
+    """Store a profiled build's steps in the ``build_stats`` table, in order."""
+    cursor = conn.cursor()
+    fields = dataclasses.fields(BuildStat)
+    cursor.execute(f"DROP TABLE IF EXISTS {BUILD_STATS_TABLE}")
+    create_table(cursor, BUILD_STATS_TABLE, fields)
+    insert_values(cursor, BUILD_STATS_TABLE, fields, stats)
     conn.commit()
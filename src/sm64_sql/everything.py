@@ -1,23 +1,36 @@
-import re
+import contextlib
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
-from sm64_sql.area import SM64Area, parse_areas
+from sm64_sql import c_corpus, extract_cache
+from sm64_sql.area import SM64Area
 from sm64_sql.behavior import SM64Behavior, parse_behaviors
 from sm64_sql.behavior_call import (
-    SM64BehaviorCall,
     SM64BehaviorDataSpawn,
-    parse_behavior_calls,
+    SM64BehaviorFunction,
+    SM64CCallSite,
+    iter_behavior_calls,
 )
 from sm64_sql.behavior_command import SM64BehaviorCommand, parse_behavior_commands
+from sm64_sql.behavior_param import PLACEMENT_PARAM_BYTE, resolve_bhv_params
+from sm64_sql.build_stats import STATS_PREFIX, BuildStat, profiled
+from sm64_sql.c_symbol import SM64CSymbol, index_c_symbols, parse_c_symbols
 from sm64_sql.camera_trigger import SM64CameraTrigger, parse_camera_triggers
+from sm64_sql.collision import SM64CollisionMesh, SM64CollisionSurface, read_collision
 from sm64_sql.constant import SM64Constant, parse_constants
 from sm64_sql.course import SM64Course, parse_courses
 from sm64_sql.course_text import SM64CourseName, SM64Star, parse_course_text
 from sm64_sql.dialog import SM64Dialog, parse_dialogs
 from sm64_sql.level import SM64Level, parse_levels
-from sm64_sql.macro_object import SM64MacroObject, try_parse_macro_object
+from sm64_sql.level_script import LevelScriptRows, read_level_script
+from sm64_sql.macro_object import (
+    MACRO_OBJECT_MACROS,
+    SM64MacroObject,
+    macro_object_from_call,
+)
 from sm64_sql.macro_preset import SM64MacroPreset, parse_macro_presets
 from sm64_sql.mario_action import (
     SM64MarioAction,
@@ -28,23 +41,24 @@ from sm64_sql.mario_action import (
 from sm64_sql.mario_animation import SM64MarioAnimation, parse_mario_animations
 from sm64_sql.model import SM64Model, parse_model_ids
 from sm64_sql.model_load import SM64ModelLoad, parse_model_loads
-from sm64_sql.object import SM64Object, try_parse_object
-from sm64_sql.parse_utils import extract_macro_args, parse_c_enum
+from sm64_sql.object import SM64Object
+from sm64_sql.parse_utils import iter_macro_calls, parse_c_enum
 from sm64_sql.save_layout import (
     SM64SaveField,
     SM64SaveFlag,
     SM64SaveStruct,
     parse_save_layout,
 )
+from sm64_sql.scheduler import Partitioning, Stage, iter_stages, run_stages
 from sm64_sql.sequence import SM64Sequence, parse_sequences
 from sm64_sql.sound import SM64Sound, parse_sounds
 from sm64_sql.special import (
     SM64SpecialObject,
     SM64SpecialPreset,
-    parse_special_objects,
     parse_special_presets,
 )
-from sm64_sql.warp import SM64InstantWarp, SM64Warp, parse_warps
+from sm64_sql.symbols import SYMBOL_SOURCES, parse_symbols
+from sm64_sql.warp import SM64InstantWarp, SM64Warp
 
 
 @dataclass
@@ -59,6 +73,8 @@ class SM64Everything:
     sm64_dialogs: List[SM64Dialog]
     sm64_special_presets: List[SM64SpecialPreset]
     sm64_special_objects: List[SM64SpecialObject]
+    sm64_collision_meshes: List[SM64CollisionMesh]
+    sm64_collision_surfaces: List[SM64CollisionSurface]
     sm64_behaviors: List[SM64Behavior]
     sm64_warps: List[SM64Warp]
     sm64_instant_warps: List[SM64InstantWarp]
@@ -70,7 +86,8 @@ class SM64Everything:
     sm64_model_loads: List[SM64ModelLoad]
     sm64_constants: List[SM64Constant]
     sm64_behavior_commands: List[SM64BehaviorCommand]
-    sm64_behavior_calls: List[SM64BehaviorCall]
+    sm64_c_call_sites: List[SM64CCallSite]
+    sm64_behavior_functions: List[SM64BehaviorFunction]
     sm64_behavior_data_spawns: List[SM64BehaviorDataSpawn]
     sm64_mario_actions: List[SM64MarioAction]
     sm64_mario_action_calls: List[SM64MarioActionCall]
@@ -79,12 +96,13 @@ class SM64Everything:
     sm64_save_structs: List[SM64SaveStruct]
     sm64_save_fields: List[SM64SaveField]
     sm64_save_flags: List[SM64SaveFlag]
+    sm64_c_symbols: List[SM64CSymbol]
 
 
 # Each entry maps a SQL table to the dataclass describing its columns and the
 # SM64Everything attribute holding its rows. db.write_to_db iterates this, so a
-# new entity type only needs: a dataclass, a field on SM64Everything, the parse
-# call in parse_repo, and one row here.
+# new entity type only needs: a dataclass, a field on SM64Everything, a stage in
+# BUILD_STAGES that produces it, and one row here.
 ENTITY_TABLES: List[Tuple[str, Type[Any], str]] = [
     ("object", SM64Object, "sm64_objects"),
     ("macro_object", SM64MacroObject, "sm64_macro_objects"),
@@ -96,6 +114,8 @@ ENTITY_TABLES: List[Tuple[str, Type[Any], str]] = [
     ("dialog", SM64Dialog, "sm64_dialogs"),
     ("special_preset", SM64SpecialPreset, "sm64_special_presets"),
     ("special_object", SM64SpecialObject, "sm64_special_objects"),
+    ("collision_mesh", SM64CollisionMesh, "sm64_collision_meshes"),
+    ("collision_surface", SM64CollisionSurface, "sm64_collision_surfaces"),
     ("behavior", SM64Behavior, "sm64_behaviors"),
     ("warp", SM64Warp, "sm64_warps"),
     ("instant_warp", SM64InstantWarp, "sm64_instant_warps"),
@@ -107,7 +127,8 @@ ENTITY_TABLES: List[Tuple[str, Type[Any], str]] = [
     ("model_load", SM64ModelLoad, "sm64_model_loads"),
     ("constant", SM64Constant, "sm64_constants"),
     ("behavior_command", SM64BehaviorCommand, "sm64_behavior_commands"),
-    ("behavior_call", SM64BehaviorCall, "sm64_behavior_calls"),
+    ("c_call_site", SM64CCallSite, "sm64_c_call_sites"),
+    ("behavior_function", SM64BehaviorFunction, "sm64_behavior_functions"),
     ("behavior_data_spawn", SM64BehaviorDataSpawn, "sm64_behavior_data_spawns"),
     ("mario_action", SM64MarioAction, "sm64_mario_actions"),
     ("mario_action_call", SM64MarioActionCall, "sm64_mario_action_calls"),
@@ -120,6 +141,7 @@ ENTITY_TABLES: List[Tuple[str, Type[Any], str]] = [
     ("save_struct", SM64SaveStruct, "sm64_save_structs"),
     ("save_field", SM64SaveField, "sm64_save_fields"),
     ("save_flag", SM64SaveFlag, "sm64_save_flags"),
+    ("c_symbol", SM64CSymbol, "sm64_c_symbols"),
 ]
 
 
@@ -152,6 +174,9 @@ class TableKeys:
     primary_key: Optional[Tuple[str, ...]] = None
     unique: Tuple[Tuple[str, ...], ...] = ()
     foreign_keys: Tuple[ForeignKey, ...] = ()
+    # Extra secondary indexes, beyond the ones db.write_to_db derives on its own
+    # (every FK column, every column a view filters on).
+    indexes: Tuple[Tuple[str, ...], ...] = ()
 
 
 def _fk(column: str, parent_table: str, parent_column: str) -> ForeignKey:
@@ -202,19 +227,32 @@ TABLE_KEYS: Dict[str, TableKeys] = {
             _fk("level", "level", "folder"),
             _fk("behavior", "behavior", "behavior_name"),
             _fk("model_name", "model", "model_name"),
-        )
+        ),
+        # The Map tab lists a level's areas; the Heatmap counts a behavior per
+        # level. The 1st and 2nd param bytes are the ones behaviors read most
+        # (oBhvParams >> 24, oBhvParams2ndByte), so filter on them by number.
+        indexes=(
+            ("level", "area"),
+            ("behavior", "level"),
+            ("bhv_param_1_value",),
+            ("bhv_param_2_value",),
+        ),
     ),
+    # The same param-byte indexes as object, so a byte filter works on every
+    # placement table.
     "macro_object": TableKeys(
         foreign_keys=(
             _fk("level", "level", "folder"),
             _fk("macro_name", "macro_preset", "macro_name"),
-        )
+        ),
+        indexes=(("bhv_param_1_value",), ("bhv_param_2_value",)),
     ),
     "special_object": TableKeys(
         foreign_keys=(
             _fk("level", "level", "folder"),
             _fk("preset_name", "special_preset", "preset_name"),
-        )
+        ),
+        indexes=(("bhv_param_1_value",), ("bhv_param_2_value",)),
     ),
     # ---- per-level scene data ----
     "area": TableKeys(
@@ -231,6 +269,19 @@ TABLE_KEYS: Dict[str, TableKeys] = {
         )
     ),
     "instant_warp": TableKeys(foreign_keys=(_fk("level", "level", "folder"),)),
+    # Collision arrays are global C symbols, so the name alone is a key.
+    "collision_mesh": TableKeys(
+        primary_key=("collision_name",),
+        foreign_keys=(_fk("level", "level", "folder"),),
+        indexes=(("level", "area"),),
+    ),
+    "collision_surface": TableKeys(
+        primary_key=("collision_name", "seq"),
+        foreign_keys=(
+            _fk("collision_name", "collision_mesh", "collision_name"),
+            _fk("level", "level", "folder"),
+        ),
+    ),
     "model_load": TableKeys(
         foreign_keys=(
             _fk("level", "level", "folder"),
@@ -242,8 +293,12 @@ TABLE_KEYS: Dict[str, TableKeys] = {
         foreign_keys=(_fk("behavior_name", "behavior", "behavior_name"),)
     ),
     # ---- behavior native-code backbone ----
-    "behavior_call": TableKeys(
-        foreign_keys=(_fk("behavior_name", "behavior", "behavior_name"),)
+    # Each call site once; behavior_function says which behaviors reach it (the
+    # behavior_call view is their join).
+    "c_call_site": TableKeys(primary_key=("function", "seq")),
+    "behavior_function": TableKeys(
+        primary_key=("behavior_name", "function"),
+        foreign_keys=(_fk("behavior_name", "behavior", "behavior_name"),),
     ),
     "behavior_data_spawn": TableKeys(
         foreign_keys=(
@@ -259,7 +314,9 @@ TABLE_KEYS: Dict[str, TableKeys] = {
     # the mario_transition view resolves the literal ones. Only the source action
     # is a declared key.
     "mario_action_call": TableKeys(
-        foreign_keys=(_fk("action_name", "mario_action", "action_name"),)
+        foreign_keys=(_fk("action_name", "mario_action", "action_name"),),
+        # The Actions tab reads one action's resolved out-edges.
+        indexes=(("action_name", "target"),),
     ),
     # Runtime transitions resolved to a literal action: both ends are real nodes.
     "mario_action_data_transition": TableKeys(
@@ -282,6 +339,9 @@ TABLE_KEYS: Dict[str, TableKeys] = {
     "save_field": TableKeys(
         foreign_keys=(_fk("struct_name", "save_struct", "struct_name"),)
     ),
+    # ---- where each C function / file-scope array under src/ is defined ----
+    # Not unique: a static name can be defined in more than one file.
+    "c_symbol": TableKeys(indexes=(("name",), ("file",))),
 }
 
 
@@ -343,106 +403,148 @@ ENTITY_VIEWS: List[Tuple[str, str]] = [
         FROM behavior_command WHERE command = 'SET_MODEL'
         """,
     ),
-    # ----- relations mined from the native C (behavior_call backbone) -----
+    # ----- relations mined from the native C (c_call_site backbone) -----
+    # The per-behavior call backbone: every call site in c_call_site, once per
+    # behavior that reaches its function (behavior_function). Stored this way it
+    # would repeat a shared helper's calls for every behavior; as a view it costs
+    # nothing in the file the web client downloads.
+    (
+        "behavior_call",
+        """
+        CREATE VIEW behavior_call AS
+        SELECT f.behavior_name, s.function, s.seq, s.call, s.args, s.args_json,
+               s.file, s.line
+        FROM c_call_site s
+        JOIN behavior_function f ON f.function = s.function
+        ORDER BY s.function, f.behavior_name, s.seq
+        """,
+    ),
     # These read the same way as behavior_spawn above, but over the call sites
-    # rather than the script opcodes. The target symbol is found by pattern, not
-    # position, so they are robust to each helper's differing argument order: a
-    # spawned behavior is the 'bhv[A-Z0-9]*' argument, a model the 'MODEL_*' one.
-    # Each view lists only the sites where the target *resolves to a literal*
-    # (the EXISTS guard); a call that passes its target as a runtime value -- a
-    # signpost reading its dialog id from oBhvParams2ndByte, a spawn of a
-    # behavior held in a variable -- stays in behavior_call but is not a clean
-    # edge here. The call-name lists are the leaf relation vocabulary; anything
-    # outside them shows up in behavior_call_unclassified for review.
+    # rather than the script opcodes. Each classifies the sites once, in
+    # c_call_site, and only then fans them out to the behaviors reaching them.
+    # The target symbol is found by pattern, not position, so they are robust to
+    # each helper's differing argument order: a spawned behavior is the
+    # 'bhv[A-Z0-9]*' argument, a model the 'MODEL_*' one. Each view lists only
+    # the sites where the target *resolves to a literal* (the EXISTS guard); a
+    # call that passes its target as a runtime value -- a signpost reading its
+    # dialog id from oBhvParams2ndByte, a spawn of a behavior held in a variable
+    # -- stays in c_call_site but is not a clean edge here. The call-name lists
+    # are the leaf relation vocabulary; anything outside them shows up in
+    # behavior_call_unclassified for review.
     (
         "behavior_calls_spawn",
         """
         CREATE VIEW behavior_calls_spawn AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS spawned_behavior,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'MODEL_*' LIMIT 1) AS spawned_model
-        FROM behavior_call
-        WHERE call IN ('spawn_object', 'spawn_object_relative',
-                       'spawn_object_relative_with_scale',
-                       'spawn_object_abs_with_rot', 'spawn_object_at_origin',
-                       'spawn_object_rel_with_rot', 'spawn_object_with_scale',
-                       'spawn_child_obj_relative')
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'bhv[A-Z0-9]*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call,
+               s.spawned_behavior, s.spawned_model
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS spawned_behavior,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'MODEL_*' LIMIT 1) AS spawned_model
+            FROM c_call_site
+            WHERE call IN ('spawn_object', 'spawn_object_relative',
+                           'spawn_object_relative_with_scale',
+                           'spawn_object_abs_with_rot', 'spawn_object_at_origin',
+                           'spawn_object_rel_with_rot', 'spawn_object_with_scale',
+                           'spawn_child_obj_relative')
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'bhv[A-Z0-9]*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     (
         "behavior_calls_sound",
         """
         CREATE VIEW behavior_calls_sound AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'SOUND_*' LIMIT 1) AS sound
-        FROM behavior_call
-        WHERE call IN ('cur_obj_play_sound_1', 'cur_obj_play_sound_2',
-                       'cur_obj_play_sound_at_anim_range', 'play_sound',
-                       'create_sound_spawner')
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'SOUND_*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call, s.sound
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'SOUND_*' LIMIT 1) AS sound
+            FROM c_call_site
+            WHERE call IN ('cur_obj_play_sound_1', 'cur_obj_play_sound_2',
+                           'cur_obj_play_sound_at_anim_range', 'play_sound',
+                           'create_sound_spawner')
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'SOUND_*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     (
         "behavior_calls_model",
         """
         CREATE VIEW behavior_calls_model AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'MODEL_*' LIMIT 1) AS model
-        FROM behavior_call
-        WHERE call = 'cur_obj_set_model'
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'MODEL_*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call, s.model
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'MODEL_*' LIMIT 1) AS model
+            FROM c_call_site
+            WHERE call = 'cur_obj_set_model'
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'MODEL_*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     (
         "behavior_calls_dialog",
         """
         CREATE VIEW behavior_calls_dialog AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'DIALOG_[0-9]*' LIMIT 1) AS dialog
-        FROM behavior_call
-        WHERE call IN ('cur_obj_update_dialog',
-                       'cur_obj_update_dialog_with_cutscene',
-                       'cutscene_object_with_dialog',
-                       'create_dialog_box_with_response')
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'DIALOG_[0-9]*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call, s.dialog
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'DIALOG_[0-9]*' LIMIT 1) AS dialog
+            FROM c_call_site
+            WHERE call IN ('cur_obj_update_dialog',
+                           'cur_obj_update_dialog_with_cutscene',
+                           'cutscene_object_with_dialog',
+                           'create_dialog_box_with_response')
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'DIALOG_[0-9]*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     (
         "behavior_calls_morph",
         """
         CREATE VIEW behavior_calls_morph AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS becomes_behavior
-        FROM behavior_call
-        WHERE call IN ('cur_obj_set_behavior', 'obj_set_behavior')
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'bhv[A-Z0-9]*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call, s.becomes_behavior
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS becomes_behavior
+            FROM c_call_site
+            WHERE call IN ('cur_obj_set_behavior', 'obj_set_behavior')
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'bhv[A-Z0-9]*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     (
         "behavior_calls_seek",
         """
         CREATE VIEW behavior_calls_seek AS
-        SELECT behavior_name, function, file, line, call,
-               (SELECT value FROM json_each(args_json)
-                WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS target_behavior
-        FROM behavior_call
-        WHERE call IN ('cur_obj_nearest_object_with_behavior',
-                       'obj_nearest_object_with_behavior',
-                       'cur_obj_has_behavior', 'obj_has_behavior')
-          AND EXISTS (SELECT 1 FROM json_each(args_json)
-                      WHERE value GLOB 'bhv[A-Z0-9]*')
+        SELECT f.behavior_name, s.function, s.file, s.line, s.call, s.target_behavior
+        FROM (
+            SELECT function, file, line, call,
+                   (SELECT value FROM json_each(args_json)
+                    WHERE value GLOB 'bhv[A-Z0-9]*' LIMIT 1) AS target_behavior
+            FROM c_call_site
+            WHERE call IN ('cur_obj_nearest_object_with_behavior',
+                           'obj_nearest_object_with_behavior',
+                           'cur_obj_has_behavior', 'obj_has_behavior')
+              AND EXISTS (SELECT 1 FROM json_each(args_json)
+                          WHERE value GLOB 'bhv[A-Z0-9]*')
+        ) s
+        JOIN behavior_function f ON f.function = s.function
         """,
     ),
     # Completeness audit: every captured call site that NO relation view above
@@ -453,9 +555,10 @@ ENTITY_VIEWS: List[Tuple[str, str]] = [
         "behavior_call_unclassified",
         """
         CREATE VIEW behavior_call_unclassified AS
-        SELECT call, COUNT(*) AS n
-        FROM behavior_call
-        WHERE call NOT IN (
+        SELECT s.call, COUNT(*) AS n
+        FROM c_call_site s
+        JOIN behavior_function f ON f.function = s.function
+        WHERE s.call NOT IN (
             'spawn_object', 'spawn_object_relative',
             'spawn_object_relative_with_scale', 'spawn_object_abs_with_rot',
             'spawn_object_at_origin', 'spawn_object_rel_with_rot',
@@ -470,8 +573,8 @@ ENTITY_VIEWS: List[Tuple[str, str]] = [
             'obj_nearest_object_with_behavior', 'cur_obj_has_behavior',
             'obj_has_behavior'
         )
-        GROUP BY call
-        ORDER BY n DESC, call
+        GROUP BY s.call
+        ORDER BY n DESC, s.call
         """,
     ),
     # The complete spawn graph: the bytecode spawns (behavior_spawn), the literal
@@ -587,6 +690,24 @@ ENTITY_VIEWS: List[Tuple[str, str]] = [
 ]
 
 
+# The views --materialize-views evaluates once into a real table of the same
+# name and columns, with these indexes. Each reads every c_call_site row
+# through a correlated json_each() subquery (or stacks on one that does), which
+# is the slowest thing the web Graph tab does on first paint under sql.js. The
+# ENTITY_VIEWS SQL stays the definition of record: db.materialize_views stores
+# it in the materialized_view table and reruns it to refresh.
+MATERIALIZABLE_VIEWS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "behavior_calls_spawn": (("behavior_name",), ("spawned_behavior",)),
+    "behavior_calls_sound": (("behavior_name",), ("sound",)),
+    "behavior_calls_model": (("behavior_name",), ("model",)),
+    "behavior_calls_dialog": (("behavior_name",), ("dialog",)),
+    "behavior_calls_morph": (("behavior_name",), ("becomes_behavior",)),
+    "behavior_calls_seek": (("behavior_name",), ("target_behavior",)),
+    "behavior_call_unclassified": (),
+    "behavior_all_spawns": (("behavior_name",), ("spawned_behavior",)),
+}
+
+
 @dataclass
 class _LevelData:
     """Per-level rows gathered from a single level folder."""
@@ -594,6 +715,8 @@ class _LevelData:
     objects: List[SM64Object]
     macro_objects: List[SM64MacroObject]
     special_objects: List[SM64SpecialObject]
+    collision_meshes: List[SM64CollisionMesh]
+    collision_surfaces: List[SM64CollisionSurface]
     warps: List[SM64Warp]
     instant_warps: List[SM64InstantWarp]
     areas: List[SM64Area]
@@ -613,139 +736,141 @@ def area_from_path(path: Path) -> int:
     return 0
 
 
-def parse_levelscript(path: Path) -> List[SM64Object]:
-    """Parse OBJECT placements from a level script.c, tagging each with its AREA.
-
-    Objects live in ``static const LevelScript script_func_local_N[]`` arrays
-    that an AREA block pulls in with ``JUMP_LINK``, so an object's area is the
-    area whose block JUMP_LINKs the array the object is defined in (or, when an
-    OBJECT sits directly inside an AREA block, that area). Objects reachable from
-    no area -- e.g. shared global scripts -- keep area 0.
-    """
-    level_name = path.parent.name
-    tagged: List[Tuple[SM64Object, Optional[str]]] = []  # (object, container key)
-    area_of_array: Dict[str, int] = {}
-    container: Optional[str] = None  # current array name, or "@<n>" inside an AREA
-    current_area: Optional[int] = None
-
-    for raw in path.read_text().splitlines():
-        line = raw.strip()
-
-        array_match = re.match(r"static const LevelScript (\w+)\[\]", line)
-        if array_match:
-            container = array_match.group(1)
-            current_area = None
-            continue
-
-        area_args = extract_macro_args(line, "AREA")
-        if area_args is not None:
-            try:
-                current_area = int(area_args[0])
-            except ValueError:
-                current_area = 0
-            container = f"@{current_area}"
-            continue
-        if line.startswith("END_AREA"):
-            current_area = None
-            container = None
-            continue
-
-        if current_area is not None:
-            jump = extract_macro_args(line, "JUMP_LINK")
-            if jump:
-                area_of_array[jump[0]] = current_area
-                continue
-
-        if sm64_object := try_parse_object(line, level_name):
-            tagged.append((sm64_object, container))
-
-    objects: List[SM64Object] = []
-    for sm64_object, container in tagged:
-        if container is not None and container.startswith("@"):
-            sm64_object.area = int(container[1:])
-        elif container is not None:
-            sm64_object.area = area_of_array.get(container, 0)
-        else:
-            sm64_object.area = 0
-        objects.append(sm64_object)
-    return objects
-
-
 def parse_macro_file(path: Path, level_name: str) -> List[SM64MacroObject]:
     # Macro arrays live at levels/<lvl>/areas/<n>/macro.inc.c, so the area is the
     # number in the path.
     area = area_from_path(path)
-    sm64_macro_objects = []
-    for line in path.read_text().splitlines():
-        if sm64_macro_object := try_parse_macro_object(line.strip(), level_name, area):
-            sm64_macro_objects.append(sm64_macro_object)
-    return sm64_macro_objects
+    return [
+        macro_object_from_call(call, level_name, area)
+        for call in iter_macro_calls(path.read_text(), MACRO_OBJECT_MACROS)
+    ]
 
 
-def parse_level(path: Path, special_preset_ids: Dict[str, int]) -> _LevelData:
+def parse_level(
+    path: Path, special_preset_ids: Dict[str, int], symbols: Dict[str, int]
+) -> _LevelData:
+    """Every row one level folder contributes; ``symbols`` resolves the params."""
     script = path / "script.c"
-    objects = parse_levelscript(script) if script.is_file() else []
-    warps, instant_warps = (
-        parse_warps(script, path.name) if script.is_file() else ([], [])
+    rows = (
+        read_level_script(script, path.name) if script.is_file() else LevelScriptRows()
     )
-    areas = parse_areas(script, path.name) if script.is_file() else []
-    model_loads = parse_model_loads(script, path.name) if script.is_file() else []
 
     macro_objects = []
     for macro_file in path.glob("**/macro.inc.c"):
         macro_objects.extend(parse_macro_file(macro_file, path.name))
 
     special_objects = []
+    collision_meshes = []
+    collision_surfaces = []
     for collision_file in path.glob("**/collision.inc.c"):
-        special_objects.extend(
-            parse_special_objects(
-                collision_file,
-                path.name,
-                area_from_path(collision_file),
-                special_preset_ids,
-            )
+        collision = read_collision(
+            collision_file,
+            path.name,
+            area_from_path(collision_file),
+            special_preset_ids,
         )
+        special_objects.extend(collision.special_objects)
+        collision_meshes.extend(collision.meshes)
+        collision_surfaces.extend(collision.surfaces)
+    resolve_bhv_params(rows.objects, symbols)
+    resolve_bhv_params(
+        [*macro_objects, *special_objects], symbols, PLACEMENT_PARAM_BYTE
+    )
     return _LevelData(
-        objects=objects,
+        objects=rows.objects,
         macro_objects=macro_objects,
         special_objects=special_objects,
-        warps=warps,
-        instant_warps=instant_warps,
-        areas=areas,
-        model_loads=model_loads,
+        collision_meshes=collision_meshes,
+        collision_surfaces=collision_surfaces,
+        warps=rows.warps,
+        instant_warps=rows.instant_warps,
+        areas=rows.areas,
+        model_loads=rows.model_loads,
     )
 
 
-def parse_repo(repo: Path) -> SM64Everything:
+def _stage_special_preset_ids(repo: Path) -> Dict[str, Any]:
     special_preset_names_file = repo / "include" / "special_presets.h"
-    special_preset_ids = dict(
-        parse_c_enum(special_preset_names_file.read_text(), "SpecialPresets")
-    )
+    return {
+        "special_preset_ids": dict(
+            parse_c_enum(special_preset_names_file.read_text(), "SpecialPresets")
+        )
+    }
+
+
+_LEVEL_OUTPUTS = (
+    "sm64_objects",
+    "sm64_macro_objects",
+    "sm64_special_objects",
+    "sm64_collision_meshes",
+    "sm64_collision_surfaces",
+    "sm64_warps",
+    "sm64_instant_warps",
+    "sm64_areas",
+    "sm64_model_loads",
+)
+
+
+def _level_partition_key(rel: str) -> str:
+    # levels/<folder>/... belongs to that folder; the shared levels/scripts.c
+    # to the "common" pseudo-level.
+    parts = rel.split("/")
+    return parts[1] if len(parts) > 2 else "common"
+
 
-    sm64_objects = []
-    sm64_macro_objects = []
-    sm64_special_objects = []
-    sm64_warps = []
-    sm64_instant_warps = []
-    sm64_areas = []
-    sm64_model_loads = []
-    for level_dir in (repo / "levels").iterdir():
-        if level_dir.is_dir():
-            level_data = parse_level(level_dir, special_preset_ids)
-            sm64_objects.extend(level_data.objects)
-            sm64_macro_objects.extend(level_data.macro_objects)
-            sm64_special_objects.extend(level_data.special_objects)
-            sm64_warps.extend(level_data.warps)
-            sm64_instant_warps.extend(level_data.instant_warps)
-            sm64_areas.extend(level_data.areas)
-            sm64_model_loads.extend(level_data.model_loads)
-    # The shared levels/scripts.c loads the common models (Mario, effects, ...)
-    # for every level; record those under the "common" pseudo-level.
-    shared_script = repo / "levels" / "scripts.c"
-    if shared_script.is_file():
-        sm64_model_loads.extend(parse_model_loads(shared_script, "common"))
-    model_ids_file = repo / "include" / "model_ids.h"
-    sm64_models = parse_model_ids(model_ids_file)
+def _stage_level(
+    repo: Path,
+    level: str,
+    special_preset_ids: Dict[str, int],
+    symbol_values: Dict[str, int],
+) -> Dict[str, Any]:
+    """The rows of one level folder, i.e. those whose ``level`` is ``level``."""
+    if level == "common":
+        # The shared levels/scripts.c loads the common models (Mario, effects,
+        # ...) for every level; record those under the "common" pseudo-level.
+        shared_script = repo / "levels" / "scripts.c"
+        values: Dict[str, Any] = {output: [] for output in _LEVEL_OUTPUTS}
+        if shared_script.is_file():
+            values["sm64_model_loads"] = parse_model_loads(shared_script, "common")
+        return values
+    level_dir = repo / "levels" / level
+    if not level_dir.is_dir():
+        return {output: [] for output in _LEVEL_OUTPUTS}
+    level_data = parse_level(level_dir, special_preset_ids, symbol_values)
+    return {
+        "sm64_objects": level_data.objects,
+        "sm64_macro_objects": level_data.macro_objects,
+        "sm64_special_objects": level_data.special_objects,
+        "sm64_collision_meshes": level_data.collision_meshes,
+        "sm64_collision_surfaces": level_data.collision_surfaces,
+        "sm64_warps": level_data.warps,
+        "sm64_instant_warps": level_data.instant_warps,
+        "sm64_areas": level_data.areas,
+        "sm64_model_loads": level_data.model_loads,
+    }
+
+
+def _stage_levels(
+    repo: Path, special_preset_ids: Dict[str, int], symbol_values: Dict[str, int]
+) -> Dict[str, Any]:
+    levels = [d.name for d in (repo / "levels").iterdir() if d.is_dir()]
+    values: Dict[str, Any] = {output: [] for output in _LEVEL_OUTPUTS}
+    for level in [*levels, "common"]:
+        level_values = _stage_level(repo, level, special_preset_ids, symbol_values)
+        for output, rows in level_values.items():
+            values[output].extend(rows)
+    return values
+
+
+def _stage_models(repo: Path) -> Dict[str, Any]:
+    return {"sm64_models": parse_model_ids(repo / "include" / "model_ids.h")}
+
+
+def _stage_symbols(repo: Path) -> Dict[str, Any]:
+    return {"symbol_values": parse_symbols(repo)}
+
+
+def _stage_macro_presets(repo: Path, symbol_values: Dict[str, int]) -> Dict[str, Any]:
     # The preset names live in the `enum MacroPresets` in macro_presets.h. The
     # preset data array moved to macro_presets.inc.c in newer decomp revisions;
     # fall back to macro_presets.h for older trees that kept it there.
@@ -753,110 +878,422 @@ def parse_repo(repo: Path) -> SM64Everything:
     macro_presets_file = repo / "include" / "macro_presets.inc.c"
     if not macro_presets_file.is_file():
         macro_presets_file = macro_preset_names_file
-    sm64_macro_presets = parse_macro_presets(
-        macro_presets_file,
-        macro_preset_names_file,
-    )
-    sm64_levels = parse_levels(repo / "levels" / "level_defines.h")
-    sm64_courses = parse_courses(repo / "levels" / "course_defines.h")
-    sm64_sequences = parse_sequences(repo / "include" / "seq_ids.h")
+    return {
+        "sm64_macro_presets": parse_macro_presets(
+            macro_presets_file,
+            macro_preset_names_file,
+            symbol_values,
+        )
+    }
+
+
+def _stage_level_defines(repo: Path) -> Dict[str, Any]:
+    return {"sm64_levels": parse_levels(repo / "levels" / "level_defines.h")}
+
+
+def _stage_courses(repo: Path) -> Dict[str, Any]:
+    return {"sm64_courses": parse_courses(repo / "levels" / "course_defines.h")}
+
+
+def _stage_sequences(repo: Path) -> Dict[str, Any]:
+    return {"sm64_sequences": parse_sequences(repo / "include" / "seq_ids.h")}
+
+
+def _stage_dialogs(repo: Path) -> Dict[str, Any]:
     # Dialog text is per-language under text/<lang>/; default to US English.
     dialogs_file = repo / "text" / "us" / "dialogs.h"
     dialog_ids_file = repo / "include" / "dialog_ids.h"
-    sm64_dialogs = (
-        parse_dialogs(dialogs_file, dialog_ids_file) if dialogs_file.is_file() else []
-    )
+    return {
+        "sm64_dialogs": (
+            parse_dialogs(dialogs_file, dialog_ids_file)
+            if dialogs_file.is_file()
+            else []
+        )
+    }
+
+
+def _stage_special_presets(repo: Path) -> Dict[str, Any]:
     # Special preset data moved to special_presets.inc.c; names stay in the
-    # enum SpecialPresets in special_presets.h (read above for id resolution).
+    # enum SpecialPresets in special_presets.h (see _stage_special_preset_ids).
+    special_preset_names_file = repo / "include" / "special_presets.h"
     special_presets_file = repo / "include" / "special_presets.inc.c"
     if not special_presets_file.is_file():
         special_presets_file = special_preset_names_file
-    sm64_special_presets = parse_special_presets(
-        special_presets_file, special_preset_names_file
-    )
-    behavior_data_c = repo / "data" / "behavior_data.c"
-    sm64_behaviors = parse_behaviors(
-        repo / "include" / "behavior_data.h",
-        behavior_data_c,
-    )
+    return {
+        "sm64_special_presets": parse_special_presets(
+            special_presets_file, special_preset_names_file
+        )
+    }
+
+
+def _stage_behaviors(repo: Path) -> Dict[str, Any]:
+    return {
+        "sm64_behaviors": parse_behaviors(
+            repo / "include" / "behavior_data.h",
+            repo / "data" / "behavior_data.c",
+        )
+    }
+
+
+def _stage_behavior_commands(repo: Path) -> Dict[str, Any]:
     # The ordered command stream of every behavior script (the backbone the
     # behavior_spawn / behavior_native / behavior_resource views read from).
+    behavior_data_c = repo / "data" / "behavior_data.c"
     sm64_behavior_commands = (
         parse_behavior_commands(behavior_data_c) if behavior_data_c.is_file() else []
     )
-    # The C code each behavior runs, mined from src/game/behaviors/. The roots
-    # are the CALL_NATIVE functions in the command stream above; reachability
-    # from them attributes every call site to its behavior(s).
+    # The CALL_NATIVE roots, handed on to the native-code stage.
     root_to_behaviors: Dict[str, List[str]] = {}
     for command in sm64_behavior_commands:
         if command.command == "CALL_NATIVE" and command.args:
             root_to_behaviors.setdefault(command.args, [])
             if command.behavior_name not in root_to_behaviors[command.args]:
                 root_to_behaviors[command.args].append(command.behavior_name)
-    parsed_behavior_code = parse_behavior_calls(repo, root_to_behaviors)
-    sm64_behavior_calls = parsed_behavior_code.calls
-    sm64_behavior_data_spawns = parsed_behavior_code.data_spawns
+    return {
+        "sm64_behavior_commands": sm64_behavior_commands,
+        "native_roots": root_to_behaviors,
+    }
+
+
+def _stage_c_symbols(repo: Path) -> Dict[str, Any]:
+    # Every function and file-scope array defined under src/, with its file.
+    return {"sm64_c_symbols": parse_c_symbols(repo)}
+
+
+def _stage_behavior_calls(
+    repo: Path, native_roots: Dict[str, List[str]], sm64_c_symbols: List[SM64CSymbol]
+) -> Dict[str, Any]:
+    # The C code each behavior runs, mined from src/game/behaviors/. The roots
+    # are the CALL_NATIVE functions in the command stream; reachability from
+    # them attributes every call site to its behavior(s). Roots defined outside
+    # behaviors/ are looked up in the symbol index. The call sites come back
+    # lazily (see scheduler.py for who collects them; the stage runs in the
+    # building process so a streaming build gets them as they are found).
+    call_sites, functions, data_spawns = iter_behavior_calls(
+        repo, native_roots, index_c_symbols(sm64_c_symbols)
+    )
+    return {
+        "sm64_c_call_sites": call_sites,
+        "sm64_behavior_functions": functions,
+        "sm64_behavior_data_spawns": data_spawns,
+    }
+
+
+def _stage_mario_actions(repo: Path) -> Dict[str, Any]:
     # Mario's action state machine: the ACT_* nodes and the transitions mined
     # from each action handler's reachable C code (src/game/mario*.c).
     parsed_mario_actions = parse_mario_actions(repo)
-    sm64_mario_actions = parsed_mario_actions.actions
-    sm64_mario_action_calls = parsed_mario_actions.calls
-    sm64_mario_action_data_transitions = parsed_mario_actions.data_transitions
+    return {
+        "sm64_mario_actions": parsed_mario_actions.actions,
+        "sm64_mario_action_calls": parsed_mario_actions.calls,
+        "sm64_mario_action_data_transitions": parsed_mario_actions.data_transitions,
+    }
+
+
+def _stage_camera_triggers(repo: Path) -> Dict[str, Any]:
     # Camera trigger zones: world-space boxes that switch the camera's behaviour
     # while Mario is inside them. Overlaid on the Map tab. The defined-but-unused
     # sCamBOB table is captured too (its rows resolve to level = NULL).
-    sm64_camera_triggers = parse_camera_triggers(repo)
+    return {"sm64_camera_triggers": parse_camera_triggers(repo)}
+
+
+def _stage_save_layout(repo: Path) -> Dict[str, Any]:
     # The EEPROM save-file layout: every struct that makes up the on-cartridge
     # save buffer, sized under the N64 ABI, plus the bit decode of the flags word.
     # Rendered as a memory-map block diagram (the Save tab).
     parsed_save = parse_save_layout(repo)
-    sm64_save_structs = parsed_save.structs
-    sm64_save_fields = parsed_save.fields
-    sm64_save_flags = parsed_save.flags
-    sm64_mario_animations = parse_mario_animations(
-        repo / "include" / "mario_animation_ids.h"
-    )
-    sm64_sounds = parse_sounds(repo / "include" / "sounds.h")
+    return {
+        "sm64_save_structs": parsed_save.structs,
+        "sm64_save_fields": parsed_save.fields,
+        "sm64_save_flags": parsed_save.flags,
+    }
+
+
+def _stage_mario_animations(repo: Path) -> Dict[str, Any]:
+    return {
+        "sm64_mario_animations": parse_mario_animations(
+            repo / "include" / "mario_animation_ids.h"
+        )
+    }
+
+
+def _stage_sounds(repo: Path) -> Dict[str, Any]:
+    return {"sm64_sounds": parse_sounds(repo / "include" / "sounds.h")}
+
+
+def _stage_course_text(repo: Path) -> Dict[str, Any]:
     # Course and star names are per-language under text/<lang>/; default to US.
     courses_text_file = repo / "text" / "us" / "courses.h"
     if courses_text_file.is_file():
         sm64_course_names, sm64_stars = parse_course_text(courses_text_file)
     else:
         sm64_course_names, sm64_stars = [], []
+    return {"sm64_course_names": sm64_course_names, "sm64_stars": sm64_stars}
+
+
+def _stage_constants(repo: Path) -> Dict[str, Any]:
     # Named integer constants used by behavior params (WARP_NODE_*, STAR_INDEX_*).
-    sm64_constants = parse_constants(
-        repo / "include" / "object_constants.h",
-        repo / "src" / "game" / "level_update.h",
-    )
+    return {
+        "sm64_constants": parse_constants(
+            repo / "include" / "object_constants.h",
+            repo / "src" / "game" / "level_update.h",
+        )
+    }
+
+
+# The build, as a dependency graph (see scheduler.py). Each stage declares the
+# named values it needs and produces; every SM64Everything field is produced by
+# exactly one stage, and the rest (special_preset_ids, symbol_values,
+# native_roots) are intermediate values handed between stages. Only a few edges
+# exist today: the level placements need the special preset ids, they and the
+# macro presets need the header symbols to resolve params, and the native-code
+# walk needs the CALL_NATIVE roots and the C symbol index -- everything else can
+# run at once. The slow, tree-sitter-backed stages are listed first and run in
+# the building process (``in_process``): they share one C corpus, which parses
+# each file once for all three and fans the files out over the build's pool,
+# alongside the other stages (see c_corpus.py). c_symbols leads
+# because it parses all of src/, extracting the behavior and Mario facts for
+# the stages after it. behavior_calls' call sites are lazy, so running it here
+# also lets --stream write them as they are found. ``sources``
+# lists every file a stage reads: incremental.py re-runs a stage only when one
+# of them changed, so a parser that starts reading a new file must add it here.
+BUILD_STAGES: List[Stage] = [
+    Stage(
+        "c_symbols",
+        _stage_c_symbols,
+        outputs=("sm64_c_symbols",),
+        sources=("src/**/*.c",),
+        in_process=True,
+    ),
+    Stage(
+        "behavior_commands",
+        _stage_behavior_commands,
+        outputs=("sm64_behavior_commands", "native_roots"),
+        sources=("data/behavior_data.c",),
+    ),
+    Stage(
+        "behavior_calls",
+        _stage_behavior_calls,
+        inputs=("native_roots", "sm64_c_symbols"),
+        outputs=(
+            "sm64_c_call_sites",
+            "sm64_behavior_functions",
+            "sm64_behavior_data_spawns",
+        ),
+        # behaviors/, plus the files outside it defining a CALL_NATIVE root --
+        # found through sm64_c_symbols, so a change there re-runs this stage too.
+        sources=("src/game/behaviors/*.inc.c",),
+        in_process=True,
+    ),
+    Stage(
+        "mario_actions",
+        _stage_mario_actions,
+        outputs=(
+            "sm64_mario_actions",
+            "sm64_mario_action_calls",
+            "sm64_mario_action_data_transitions",
+        ),
+        sources=("include/sm64.h", "src/game/mario*.c"),
+        in_process=True,
+    ),
+    Stage(
+        "special_preset_ids",
+        _stage_special_preset_ids,
+        outputs=("special_preset_ids",),
+        sources=("include/special_presets.h",),
+    ),
+    Stage(
+        "symbols",
+        _stage_symbols,
+        outputs=("symbol_values",),
+        sources=SYMBOL_SOURCES,
+    ),
+    Stage(
+        "levels",
+        _stage_levels,
+        inputs=("special_preset_ids", "symbol_values"),
+        outputs=_LEVEL_OUTPUTS,
+        sources=(
+            "levels/*/script.c",
+            "levels/*/**/macro.inc.c",
+            "levels/*/**/collision.inc.c",
+            "levels/scripts.c",
+        ),
+        partitioning=Partitioning("level", _level_partition_key, _stage_level),
+    ),
+    Stage(
+        "models",
+        _stage_models,
+        outputs=("sm64_models",),
+        sources=("include/model_ids.h",),
+    ),
+    Stage(
+        "macro_presets",
+        _stage_macro_presets,
+        inputs=("symbol_values",),
+        outputs=("sm64_macro_presets",),
+        sources=("include/macro_presets.h", "include/macro_presets.inc.c"),
+    ),
+    Stage(
+        "level_defines",
+        _stage_level_defines,
+        outputs=("sm64_levels",),
+        sources=("levels/level_defines.h",),
+    ),
+    Stage(
+        "courses",
+        _stage_courses,
+        outputs=("sm64_courses",),
+        sources=("levels/course_defines.h",),
+    ),
+    Stage(
+        "sequences",
+        _stage_sequences,
+        outputs=("sm64_sequences",),
+        sources=("include/seq_ids.h",),
+    ),
+    Stage(
+        "dialogs",
+        _stage_dialogs,
+        outputs=("sm64_dialogs",),
+        sources=("text/us/dialogs.h", "include/dialog_ids.h"),
+    ),
+    Stage(
+        "special_presets",
+        _stage_special_presets,
+        outputs=("sm64_special_presets",),
+        sources=("include/special_presets.h", "include/special_presets.inc.c"),
+    ),
+    Stage(
+        "behaviors",
+        _stage_behaviors,
+        outputs=("sm64_behaviors",),
+        sources=("include/behavior_data.h", "data/behavior_data.c"),
+    ),
+    Stage(
+        "camera_triggers",
+        _stage_camera_triggers,
+        outputs=("sm64_camera_triggers",),
+        sources=("src/game/camera.c", "levels/level_defines.h"),
+    ),
+    Stage(
+        "save_layout",
+        _stage_save_layout,
+        outputs=("sm64_save_structs", "sm64_save_fields", "sm64_save_flags"),
+        sources=(
+            "src/game/save_file.h",
+            "include/types.h",
+            "levels/course_defines.h",
+        ),
+    ),
+    Stage(
+        "mario_animations",
+        _stage_mario_animations,
+        outputs=("sm64_mario_animations",),
+        sources=("include/mario_animation_ids.h",),
+    ),
+    Stage(
+        "sounds",
+        _stage_sounds,
+        outputs=("sm64_sounds",),
+        sources=("include/sounds.h",),
+    ),
+    Stage(
+        "course_text",
+        _stage_course_text,
+        outputs=("sm64_course_names", "sm64_stars"),
+        sources=("text/us/courses.h",),
+    ),
+    Stage(
+        "constants",
+        _stage_constants,
+        outputs=("sm64_constants",),
+        sources=("include/object_constants.h", "src/game/level_update.h"),
+    ),
+]
+
+
+def _init_worker(cache: Optional[extract_cache.ExtractionCache]) -> None:
+    """Share the parent's extraction cache with a pool worker."""
+    extract_cache.activate(cache)
+
+
+# The C corpus kind each in-process C stage takes (see c_corpus.session).
+_CORPUS_KINDS = {
+    "c_symbols": "c_symbols",
+    "behavior_calls": "behavior_file",
+    "mario_actions": "mario_file",
+}
+
+
+@contextlib.contextmanager
+def _build(
+    stages: List[Stage], repo: Path, jobs: int
+) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """The build's one process pool (None for a serial build) and C corpus.
+
+    The stages run in the pool, and the in-process C stages fan their files
+    out over it through c_corpus.use_pool, so ``jobs`` bounds the whole build.
+    The corpus lasts for this build only and extracts ahead just the kinds
+    whose stages are among ``stages`` and run in this process.
+    """
+    ahead = {
+        _CORPUS_KINDS[s.name]
+        for s in stages
+        if s.name in _CORPUS_KINDS and s.in_process
+    }
+    with c_corpus.session(repo, ahead):
+        if jobs <= 1:
+            yield None
+            return
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(extract_cache.active(),),
+        ) as pool, c_corpus.use_pool(pool, jobs):
+            yield pool
+
+
+def run_build_stages(stages: List[Stage], repo: Path, jobs: int = 1) -> Dict[str, Any]:
+    """``run_stages`` over the build's pool and corpus (see ``_build``)."""
+    with _build(stages, repo, jobs) as pool:
+        return run_stages(stages, repo, jobs, pool=pool)
+
+
+def parse_repo(
+    repo: Path, jobs: int = 1, stats: Optional[List[BuildStat]] = None
+) -> SM64Everything:
+    """Parse a decomp checkout into every entity table.
+
+    ``jobs`` > 1 runs independent stages concurrently in a process pool; the
+    result is identical to the serial build. With ``stats``, every stage is
+    profiled and its BuildStat appended, in BUILD_STAGES order.
+    """
+    stages = BUILD_STAGES if stats is None else profiled(BUILD_STAGES)
+    values = run_build_stages(stages, repo, jobs)
+    if stats is not None:
+        stats.extend(values[STATS_PREFIX + stage.name] for stage in BUILD_STAGES)
     return SM64Everything(
-        sm64_objects=sm64_objects,
-        sm64_macro_objects=sm64_macro_objects,
-        sm64_models=sm64_models,
-        sm64_macro_presets=sm64_macro_presets,
-        sm64_levels=sm64_levels,
-        sm64_courses=sm64_courses,
-        sm64_sequences=sm64_sequences,
-        sm64_dialogs=sm64_dialogs,
-        sm64_special_presets=sm64_special_presets,
-        sm64_special_objects=sm64_special_objects,
-        sm64_behaviors=sm64_behaviors,
-        sm64_warps=sm64_warps,
-        sm64_instant_warps=sm64_instant_warps,
-        sm64_areas=sm64_areas,
-        sm64_mario_animations=sm64_mario_animations,
-        sm64_sounds=sm64_sounds,
-        sm64_course_names=sm64_course_names,
-        sm64_stars=sm64_stars,
-        sm64_model_loads=sm64_model_loads,
-        sm64_constants=sm64_constants,
-        sm64_behavior_commands=sm64_behavior_commands,
-        sm64_behavior_calls=sm64_behavior_calls,
-        sm64_behavior_data_spawns=sm64_behavior_data_spawns,
-        sm64_mario_actions=sm64_mario_actions,
-        sm64_mario_action_calls=sm64_mario_action_calls,
-        sm64_mario_action_data_transitions=sm64_mario_action_data_transitions,
-        sm64_camera_triggers=sm64_camera_triggers,
-        sm64_save_structs=sm64_save_structs,
-        sm64_save_fields=sm64_save_fields,
-        sm64_save_flags=sm64_save_flags,
+        **{
+            field.name: values[field.name]
+            for field in dataclasses.fields(SM64Everything)
+        }
     )
+
+
+def stream_repo(
+    repo: Path, jobs: int = 1, stats: Optional[List[BuildStat]] = None
+) -> Iterator[Dict[str, Any]]:
+    """``parse_repo`` one stage at a time, for a writer that never holds it all.
+
+    Yields each stage's outputs as it finishes (tables keyed by their
+    SM64Everything field name, plus the intermediate values); some of the row
+    collections are one-shot iterators rather than lists. ``stats`` is as for
+    ``parse_repo``, but in completion order.
+    """
+    stages = BUILD_STAGES if stats is None else profiled(BUILD_STAGES)
+    with _build(stages, repo, jobs) as pool:
+        for stage, result in iter_stages(stages, repo, jobs, pool=pool):
+            if stats is not None:
+                stats.append(result[STATS_PREFIX + stage.name])
+            yield result
@@ -0,0 +1,132 @@
+"""Persistent on-disk cache of per-file tree-sitter extraction results.
+
+Parsing and walking the C corpus (``src/game/behaviors/*.inc.c``, the
+``mario*.c`` files, and the part of ``src/`` that defines external
+``CALL_NATIVE`` roots) is the most expensive part of a build, yet a file's
+extracted facts -- its ``Func``/``Call`` lists, action and behavior tables,
+switch/return observations -- depend only on its bytes and the grammar. They
+are pickled under a key built from:
+
+- the file's content (SHA-256) and repo-relative path (stored in ``Func.file``),
+- the extractor ``kind`` (each analysis caches its own facts),
+- the installed tree-sitter and tree-sitter-c versions, and
+- ``SCHEMA_VERSION``, bumped whenever a cached extractor's output changes.
+
+so a warm build skips tree-sitter entirely for unchanged files, and a stale
+entry can never be read back (nothing is invalidated; old keys just stop being
+asked for). ``--clear-cache`` removes the directory.
+
+The cache is opt-in at the library level: extractors call ``cached()``, which
+computes directly unless a cache has been ``activate``-d (the CLI does, unless
+``--no-cache``). Process-pool workers activate the same cache through the pool
+initializer, and the hit/miss counters live in shared memory so they add up
+across processes.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Bump when the shape or meaning of any cached extraction result changes.
+SCHEMA_VERSION = 1
+
+
+def _library_versions() -> str:
+    versions = []
+    for dist in ("tree-sitter", "tree-sitter-c"):
+        try:
+            versions.append(f"{dist}={metadata.version(dist)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{dist}=?")
+    return ";".join(versions)
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/sm64-sql``, defaulting to ``~/.cache/sm64-sql``."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "sm64-sql"
+
+
+class ExtractionCache:
+    """A directory of pickled extraction results keyed by content and versions."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._salt = f"schema={SCHEMA_VERSION};{_library_versions()}".encode()
+        # Shared with pool workers (handed over via the pool initializer).
+        self._hits = multiprocessing.Value("l", 0)
+        self._misses = multiprocessing.Value("l", 0)
+
+    @property
+    def hits(self) -> int:
+        return self._hits.value
+
+    @property
+    def misses(self) -> int:
+        return self._misses.value
+
+    def _entry(self, kind: str, source: bytes, rel: str) -> Path:
+        digest = hashlib.sha256(self._salt)
+        for part in (kind.encode(), rel.encode(), source):
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        key = digest.hexdigest()
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def get_or_compute(
+        self, kind: str, source: bytes, rel: str, compute: Callable[[], T]
+    ) -> T:
+        entry = self._entry(kind, source, rel)
+        try:
+            with entry.open("rb") as f:
+                value = pickle.load(f)
+        except Exception:  # missing, truncated or unreadable: just a miss
+            pass
+        else:
+            with self._hits.get_lock():
+                self._hits.value += 1
+            return value
+        value = compute()
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename, so a concurrent reader never sees a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        with self._misses.get_lock():
+            self._misses.value += 1
+        return value
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_active: Optional[ExtractionCache] = None
+
+
+def activate(cache: Optional[ExtractionCache]) -> None:
+    """Route ``cached()`` through ``cache`` in this process (None disables)."""
+    global _active
+    _active = cache
+
+
+def active() -> Optional[ExtractionCache]:
+    return _active
+
+
+def cached(kind: str, source: bytes, rel: str, compute: Callable[[], T]) -> T:
+    """``compute()``'s result for this file, from the active cache if any.
+
+    ``compute`` must depend only on ``source`` and ``rel`` (and the grammar).
+    """
+    if _active is None:
+        return compute()
+    return _active.get_or_compute(kind, source, rel, compute)
@@ -0,0 +1,120 @@
+"""Reachability over small directed graphs, with Python ints as bitsets.
+
+Nodes are numbered 0..n-1 and a set of nodes is an int with those bits set, so
+a union over a whole BFS frontier is a handful of big-int ORs. Used for the
+C call graph (c_parse.CallGraph) and for the closure tables the build
+precomputes (spawn_closure.py, mario_action_graph.py).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+
+def iter_bits(value: int) -> Iterator[int]:
+    """The indices of the set bits of ``value``, lowest first."""
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def strongly_connected_components(succ: Sequence[Sequence[int]]) -> List[List[int]]:
+    """Tarjan's strongly connected components, sinks first, members sorted.
+
+    Iterative, so a long chain cannot hit the recursion limit.
+    """
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    stack: List[int] = []
+    on_stack: Set[int] = set()
+    components: List[List[int]] = []
+    for root in range(len(succ)):
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            if i < len(succ[node]):
+                work.append((node, i + 1))
+                child = succ[node][i]
+                if child not in index:
+                    work.append((child, 0))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return components
+
+
+class BitGraph:
+    """A directed graph condensed into its strongly connected components.
+
+    Every node of a component reaches the same set, so ``reach`` is computed
+    once per component, over the condensation DAG from the sinks up. A
+    component reaches its own members only if it has a cycle (or a self-loop).
+    """
+
+    def __init__(self, node_count: int, edges: Iterable[Tuple[int, int]]):
+        self.succ: List[List[int]] = [[] for _ in range(node_count)]
+        self.succ_bits = [0] * node_count
+        self.pred_bits = [0] * node_count
+        for a, b in sorted(set(edges)):
+            self.succ[a].append(b)
+            self.succ_bits[a] |= 1 << b
+            self.pred_bits[b] |= 1 << a
+
+        self.components = strongly_connected_components(self.succ)
+        self.component_of = [0] * node_count
+        self._reach: List[int] = []
+        for c, members in enumerate(self.components):
+            member_bits = 0
+            out = 0
+            for member in members:
+                self.component_of[member] = c
+                member_bits |= 1 << member
+                out |= self.succ_bits[member]
+            bits = member_bits if out & member_bits else 0
+            for node in iter_bits(out & ~member_bits):
+                bits |= self._reach[self.component_of[node]] | (1 << node)
+            self._reach.append(bits)
+
+    def reach(self, node: int) -> int:
+        """The nodes reachable from ``node`` in one or more steps."""
+        return self._reach[self.component_of[node]]
+
+    def layers(self, source: int) -> Iterator[Tuple[int, int, int]]:
+        """``(depth, node, prev)`` for each node ``source`` reaches, nearest first.
+
+        A breadth-first search that steps a whole frontier at a time and stops
+        once it has found ``reach(source)``. ``prev`` is the lowest-numbered
+        node of the previous layer with an edge to ``node``, so following it
+        back gives one shortest path; it is ``source`` itself for depth 1 and
+        never ``source`` after that (a node after the source on a cycle would
+        have been found at depth 1).
+        """
+        target = self.reach(source)
+        found, frontier, depth = 0, 1 << source, 0
+        while frontier and found != target:
+            depth += 1
+            step = 0
+            for node in iter_bits(frontier):
+                step |= self.succ_bits[node]
+            new = step & ~found
+            for node in iter_bits(new):
+                yield depth, node, next(iter_bits(self.pred_bits[node] & frontier))
+            found |= new
+            frontier = new
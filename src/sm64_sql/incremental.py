@@ -0,0 +1,345 @@
+"""Incremental rebuilds driven by a manifest of the source files each stage read.
+
+A full build records, in the ``build_manifest`` table, every file matched by a
+stage's ``sources`` patterns (see BUILD_STAGES): its size, mtime and SHA-256,
+and the rows the unit that read it produced. ``update_db`` rescans those files
+against the manifest and rebuilds only what changed:
+
+* A file whose size and mtime are unchanged is trusted without being hashed
+  (the same shortcut ``make`` and ``git status`` take); otherwise it is hashed,
+  and a touched-but-identical file counts as unchanged.
+* A stage with a changed, added or deleted source re-runs, and so does every
+  stage downstream of it; their tables are emptied and refilled. Stages whose
+  outputs are only needed as *inputs* (``native_roots``) re-run in memory
+  without touching their tables.
+* A partitioned stage (``levels``, one unit per level folder) whose own
+  inputs are unchanged re-parses only the dirty folders and replaces just the
+  rows whose ``level`` is that folder -- so editing one ``script.c`` re-reads
+  that level and nothing else.
+
+The views read the tables, so they need no refresh; views materialized with
+``--materialize-views``, the ``spatial_index`` grid, the
+``camera_trigger_object`` and ``placement_surface`` tables, the warp-graph
+tables, ``behavior_spawn_closure``, ``mario_action_graph`` and
+``mario_action_step`` are recomputed whenever anything was rebuilt. The
+manifest does not fingerprint sm64-sql itself: after upgrading it, do a full
+build.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sm64_sql.db import (
+    create_camera_trigger_objects,
+    create_mario_action_graph,
+    create_placement_surfaces,
+    create_spatial_index,
+    create_spawn_closure,
+    create_table,
+    create_warp_graph,
+    insert_values,
+    refresh_materialized_views,
+)
+from sm64_sql.everything import (
+    BUILD_STAGES,
+    ENTITY_TABLES,
+    SM64Everything,
+    run_build_stages,
+)
+from sm64_sql.scheduler import Stage, dependents, prerequisites
+
+MANIFEST_TABLE = "build_manifest"
+
+
+@dataclass
+class ManifestEntry:
+    """One source file as seen by one stage (or one partition of a stage)."""
+
+    path: str  # repo-relative, POSIX
+    stage: str
+    partition_key: Optional[str]  # e.g. the level folder; NULL if unpartitioned
+    size: int
+    mtime_ns: int
+    sha256: str
+    rows_json: str  # {table: row count} for the stage/partition this file feeds
+
+
+# (path, stage) -> entry
+Manifest = Dict[Tuple[str, str], ManifestEntry]
+
+_ENTRY_FIELDS = dataclasses.fields(ManifestEntry)
+_TABLE_OF = {attr: table for table, _row_type, attr in ENTITY_TABLES}
+_ROW_TYPE_OF = {attr: row_type for _table, row_type, attr in ENTITY_TABLES}
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _source_files(repo: Path, stage: Stage) -> List[Path]:
+    found = {path for pattern in stage.sources for path in repo.glob(pattern)}
+    return sorted(path for path in found if path.is_file())
+
+
+def scan_sources(
+    repo: Path, stages: Sequence[Stage], previous: Optional[Manifest] = None
+) -> Manifest:
+    """Fingerprint every stage's source files, reusing ``previous`` hashes.
+
+    ``rows_json`` is left empty; the caller fills it in once it knows the rows.
+    """
+    previous = previous or {}
+    hashes: Dict[str, str] = {}  # a file several stages read is hashed once
+    manifest: Manifest = {}
+    for stage in stages:
+        for path in _source_files(repo, stage):
+            rel = path.relative_to(repo).as_posix()
+            stat = path.stat()
+            old = previous.get((rel, stage.name))
+            if rel not in hashes:
+                if (
+                    old is not None
+                    and old.size == stat.st_size
+                    and old.mtime_ns == stat.st_mtime_ns
+                ):
+                    hashes[rel] = old.sha256
+                else:
+                    hashes[rel] = _sha256(path)
+            manifest[(rel, stage.name)] = ManifestEntry(
+                path=rel,
+                stage=stage.name,
+                partition_key=(
+                    stage.partitioning.key_of(rel) if stage.partitioning else None
+                ),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                sha256=hashes[rel],
+                rows_json="{}",
+            )
+    return manifest
+
+
+def _row_counts(stage: Stage, values: Dict[str, Any], key: Optional[str]) -> str:
+    counts = {}
+    for output in stage.outputs:
+        if output not in _TABLE_OF:
+            continue  # an intermediate value, not a table
+        rows = values[output]
+        if key is not None and stage.partitioning is not None:
+            column = stage.partitioning.column
+            rows = [row for row in rows if getattr(row, column) == key]
+        counts[_TABLE_OF[output]] = len(rows)
+    return json.dumps(counts, sort_keys=True)
+
+
+def _fill_row_counts(
+    manifest: Manifest, stages: Iterable[Stage], values: Dict[str, Any]
+) -> None:
+    for stage in stages:
+        for (_rel, stage_name), entry in manifest.items():
+            if stage_name == stage.name:
+                entry.rows_json = _row_counts(stage, values, entry.partition_key)
+
+
+def _db_row_counts(conn: sqlite3.Connection, stage: Stage, key: Optional[str]) -> str:
+    """``_row_counts`` read back from the tables the stage filled."""
+    counts = {}
+    for output in stage.outputs:
+        if output not in _TABLE_OF:
+            continue
+        table = _TABLE_OF[output]
+        if key is not None and stage.partitioning is not None:
+            column = stage.partitioning.column
+            query = f"SELECT COUNT(*) FROM {table} WHERE {column} = ?"
+            (counts[table],) = conn.execute(query, (key,)).fetchone()
+        else:
+            (counts[table],) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+    return json.dumps(counts, sort_keys=True)
+
+
+def _save_manifest(conn: sqlite3.Connection, manifest: Manifest) -> None:
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {MANIFEST_TABLE}")
+    create_table(cursor, MANIFEST_TABLE, _ENTRY_FIELDS)
+    insert_values(
+        cursor,
+        MANIFEST_TABLE,
+        _ENTRY_FIELDS,
+        sorted(manifest.values(), key=lambda e: (e.stage, e.path)),
+    )
+
+
+def has_manifest(conn: sqlite3.Connection) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (MANIFEST_TABLE,),
+        ).fetchone()
+        is not None
+    )
+
+
+def load_manifest(conn: sqlite3.Connection) -> Manifest:
+    names = ", ".join(field.name for field in _ENTRY_FIELDS)
+    manifest: Manifest = {}
+    for row in conn.execute(f"SELECT {names} FROM {MANIFEST_TABLE}"):
+        entry = ManifestEntry(*row)
+        manifest[(entry.path, entry.stage)] = entry
+    return manifest
+
+
+def write_manifest(
+    conn: sqlite3.Connection,
+    repo: Path,
+    everything: Optional[SM64Everything] = None,
+) -> None:
+    """Record the manifest for a database that was just built from ``repo``.
+
+    The row counts come from ``everything`` when given, else from the tables
+    themselves (after ``stream_to_db``, when no SM64Everything exists).
+    """
+    manifest = scan_sources(repo, BUILD_STAGES)
+    if everything is not None:
+        values = {
+            field.name: getattr(everything, field.name)
+            for field in dataclasses.fields(SM64Everything)
+        }
+        _fill_row_counts(manifest, BUILD_STAGES, values)
+    else:
+        by_name = {stage.name: stage for stage in BUILD_STAGES}
+        for entry in manifest.values():
+            entry.rows_json = _db_row_counts(
+                conn, by_name[entry.stage], entry.partition_key
+            )
+    _save_manifest(conn, manifest)
+    conn.commit()
+
+
+def _fingerprints(
+    manifest: Manifest, stage: str
+) -> Dict[Optional[str], Set[Tuple[str, str]]]:
+    """Per partition key, the (path, sha256) pairs a stage read."""
+    result: Dict[Optional[str], Set[Tuple[str, str]]] = {}
+    for (rel, stage_name), entry in manifest.items():
+        if stage_name == stage:
+            result.setdefault(entry.partition_key, set()).add((rel, entry.sha256))
+    return result
+
+
+def _dirty_units(
+    old: Manifest, new: Manifest, stages: Sequence[Stage]
+) -> Tuple[Set[str], Dict[str, List[str]]]:
+    """Stages to re-run whole, and dirty partition keys of the other stages."""
+    whole: Set[str] = set()
+    partial: Dict[str, List[str]] = {}
+    for stage in stages:
+        before = _fingerprints(old, stage.name)
+        after = _fingerprints(new, stage.name)
+        if before == after:
+            continue
+        if stage.partitioning is None:
+            whole.add(stage.name)
+        else:
+            partial[stage.name] = sorted(
+                str(key)
+                for key in set(before) | set(after)
+                if before.get(key) != after.get(key)
+            )
+    whole = dependents(stages, whole)
+    return whole, {name: keys for name, keys in partial.items() if name not in whole}
+
+
+def _run_partitions(
+    stage: Stage, keys: List[str], repo: Path, **inputs: Any
+) -> Dict[str, Any]:
+    assert stage.partitioning is not None
+    values: Dict[str, Any] = {output: [] for output in stage.outputs}
+    for key in keys:
+        for output, rows in stage.partitioning.func(repo, key, **inputs).items():
+            values[output].extend(rows)
+    return values
+
+
+def _replace_rows(
+    cursor: sqlite3.Cursor,
+    attr: str,
+    rows: List[Any],
+    column: Optional[str] = None,
+    keys: Sequence[str] = (),
+) -> None:
+    table = _TABLE_OF[attr]
+    if column is None:
+        cursor.execute(f"DELETE FROM {table}")
+    else:
+        for key in keys:
+            cursor.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+    insert_values(cursor, table, dataclasses.fields(_ROW_TYPE_OF[attr]), rows)
+
+
+def update_db(conn: sqlite3.Connection, repo: Path, jobs: int = 1) -> List[str]:
+    """Bring a database built from ``repo`` up to date; return what was rebuilt.
+
+    Each returned unit is a stage name, or ``stage[key]`` for one partition of a
+    partitioned stage. An empty list means the database was already current.
+    """
+    old = load_manifest(conn)
+    new = scan_sources(repo, BUILD_STAGES, old)
+    whole, partial = _dirty_units(old, new, BUILD_STAGES)
+    by_name = {stage.name: stage for stage in BUILD_STAGES}
+
+    to_run = []
+    for stage in BUILD_STAGES:
+        if stage.name in partial:
+            to_run.append(
+                dataclasses.replace(
+                    stage,
+                    func=functools.partial(_run_partitions, stage, partial[stage.name]),
+                )
+            )
+        elif stage.name in prerequisites(BUILD_STAGES, whole | set(partial)):
+            to_run.append(stage)
+    values = run_build_stages(to_run, repo, jobs)
+
+    cursor = conn.cursor()
+    for name in whole:
+        for attr in by_name[name].outputs:
+            if attr in _TABLE_OF:
+                _replace_rows(cursor, attr, values[attr])
+    for name, keys in partial.items():
+        partitioning = by_name[name].partitioning
+        assert partitioning is not None
+        for attr in by_name[name].outputs:
+            _replace_rows(cursor, attr, values[attr], partitioning.column, keys)
+
+    # Re-count the rebuilt units; everything else keeps its recorded counts.
+    for key, entry in new.items():
+        stage = by_name[entry.stage]
+        rebuilt = stage.name in whole or entry.partition_key in partial.get(
+            stage.name, ()
+        )
+        if rebuilt:
+            entry.rows_json = _row_counts(stage, values, entry.partition_key)
+        elif key in old:
+            entry.rows_json = old[key].rows_json
+    _save_manifest(conn, new)
+    conn.commit()
+    if whole or partial:
+        refresh_materialized_views(conn)
+        create_spatial_index(conn)
+        create_camera_trigger_objects(conn)
+        create_placement_surfaces(conn)
+        create_warp_graph(conn)
+        create_spawn_closure(conn)
+        create_mario_action_graph(conn)
+        conn.commit()
+
+    units = [s.name for s in BUILD_STAGES if s.name in whole]
+    for name, keys in partial.items():
+        units.extend(f"{name}[{key}]" for key in keys)
+    return units
@@ -0,0 +1,179 @@
+"""Read a level's script.c once into its objects, warps, areas and model loads.
+
+A level script is a list of macro calls, one per line, grouped into
+``static const LevelScript name[]`` arrays::
+
+    static const LevelScript script_func_local_1[] = {
+        OBJECT(MODEL_BOB_CHAIN_CHOMP_GATE, 1456, 768, 446, 0, 326, 0, 0, bhvChainChompGate),
+        RETURN(),
+    };
+
+    const LevelScript level_bob_entry[] = {
+        LOAD_MODEL_FROM_GEO(MODEL_BOB_BUBBLY_TREE, bubbly_tree_geo),
+        AREA(1, bob_geo_000488),
+            JUMP_LINK(script_func_local_1),
+            WARP_NODE(WARP_NODE_0A, LEVEL_BOB, 1, WARP_NODE_0A, WARP_NO_CHECKPOINT),
+            TERRAIN_TYPE(TERRAIN_GRASS),
+        END_AREA(),
+        ...
+
+``read_level_script`` walks the file once, through ``iter_macro_calls`` (which
+finds only the calls it has a row builder for) merged with the array
+declarations. It keeps one piece of context -- the array being read, and the
+``AREA`` block if inside one -- and hands each call to the row builder for its
+macro.
+
+An object's area is only known once the whole file is read. Objects usually
+sit in a ``script_func_local_N`` array that an ``AREA`` block pulls in with
+``JUMP_LINK``, so the object belongs to whichever area ``JUMP_LINK``s its array
+(or to the ``AREA`` it sits in directly). Warps take the enclosing ``AREA``, or
+0 for a level-global warp.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sm64_sql.area import SM64Area
+from sm64_sql.model_load import SM64ModelLoad, model_load_from_call
+from sm64_sql.object import SM64Object, object_from_call
+from sm64_sql.parse_utils import MacroCall, iter_macro_calls
+from sm64_sql.warp import (
+    SM64InstantWarp,
+    SM64Warp,
+    instant_warp_from_call,
+    warp_from_call,
+)
+
+_ARRAY = re.compile(r"^\s*static const LevelScript (\w+)\[\]", re.MULTILINE)
+
+
+@dataclass
+class LevelScriptRows:
+    """Every row one script.c contributes, each list in file order."""
+
+    objects: List[SM64Object] = field(default_factory=list)
+    warps: List[SM64Warp] = field(default_factory=list)
+    instant_warps: List[SM64InstantWarp] = field(default_factory=list)
+    areas: List[SM64Area] = field(default_factory=list)
+    model_loads: List[SM64ModelLoad] = field(default_factory=list)
+
+
+class _Reader:
+    """The walk's state; one method per recognised macro."""
+
+    def __init__(self, level: str):
+        self.level = level
+        self.rows = LevelScriptRows()
+        self.array: Optional[str] = None  # "@<n>" for objects directly in AREA n
+        self.area: Optional[SM64Area] = None  # the open AREA block
+        self.area_of_array: Dict[str, int] = {}
+        self.object_arrays: List[Optional[str]] = []  # parallel to rows.objects
+
+    def on_array(self, name: str) -> None:
+        self.array = name
+        self.area = None
+
+    def on_area(self, call: MacroCall) -> None:
+        args = call.args
+        try:
+            index = int(args[0]) if args else 0
+        except ValueError:
+            index = 0
+        # An AREA opened before the previous one's END_AREA discards that one.
+        self.area = SM64Area(
+            level=self.level,
+            area=index,
+            geo=args[1] if len(args) > 1 else "",
+            terrain_type="",
+            background_music=None,
+            dialog=None,
+        )
+        self.array = f"@{index}"
+
+    def on_end_area(self, call: MacroCall) -> None:
+        if self.area is not None:
+            self.rows.areas.append(self.area)
+        self.area = None
+        self.array = None
+
+    def on_jump_link(self, call: MacroCall) -> None:
+        if self.area is not None and call.args:
+            self.area_of_array[call.args[0]] = self.area.area
+
+    def on_terrain_type(self, call: MacroCall) -> None:
+        if self.area is not None and call.args:
+            self.area.terrain_type = call.args[0]
+
+    def on_background_music(self, call: MacroCall) -> None:
+        if self.area is not None and len(call.args) >= 2:
+            self.area.background_music = call.args[1]
+
+    def on_show_dialog(self, call: MacroCall) -> None:
+        if self.area is not None and len(call.args) >= 2:
+            self.area.dialog = call.args[1]
+
+    def on_object(self, call: MacroCall) -> None:
+        self.rows.objects.append(object_from_call(call, self.level))
+        self.object_arrays.append(self.array)
+
+    def on_warp(self, call: MacroCall) -> None:
+        self.rows.warps.append(warp_from_call(call, self.level, self._area_index()))
+
+    def on_instant_warp(self, call: MacroCall) -> None:
+        self.rows.instant_warps.append(
+            instant_warp_from_call(call, self.level, self._area_index())
+        )
+
+    def on_model_load(self, call: MacroCall) -> None:
+        self.rows.model_loads.append(model_load_from_call(call, self.level))
+
+    def _area_index(self) -> int:
+        return self.area.area if self.area is not None else 0
+
+    def finish(self) -> LevelScriptRows:
+        for sm64_object, array in zip(self.rows.objects, self.object_arrays):
+            if array is not None and array.startswith("@"):
+                sm64_object.area = int(array[1:])
+            elif array is not None:
+                sm64_object.area = self.area_of_array.get(array, 0)
+            else:
+                sm64_object.area = 0
+        return self.rows
+
+
+# Macro name -> the _Reader method for that call.
+_BUILDERS: Dict[str, Callable[[_Reader, MacroCall], None]] = {
+    "AREA": _Reader.on_area,
+    "END_AREA": _Reader.on_end_area,
+    "JUMP_LINK": _Reader.on_jump_link,
+    "TERRAIN_TYPE": _Reader.on_terrain_type,
+    "SET_BACKGROUND_MUSIC": _Reader.on_background_music,
+    "SHOW_DIALOG": _Reader.on_show_dialog,
+    "OBJECT": _Reader.on_object,
+    "OBJECT_WITH_ACTS": _Reader.on_object,
+    "WARP_NODE": _Reader.on_warp,
+    "PAINTING_WARP_NODE": _Reader.on_warp,
+    "INSTANT_WARP": _Reader.on_instant_warp,
+    "LOAD_MODEL_FROM_GEO": _Reader.on_model_load,
+    "LOAD_MODEL_FROM_DL": _Reader.on_model_load,
+}
+
+
+def read_level_script(path: Path, level: str) -> LevelScriptRows:
+    """Every object, warp, area and model load in one level script.c."""
+    text = path.read_text()
+    reader = _Reader(level)
+    # (1-based line, array name) of each array declaration, in file order.
+    arrays = [
+        (text.count("\n", 0, match.start(1)) + 1, match.group(1))
+        for match in _ARRAY.finditer(text)
+    ]
+    next_array = 0
+    for call in iter_macro_calls(text, _BUILDERS):
+        while next_array < len(arrays) and arrays[next_array][0] < call.line:
+            reader.on_array(arrays[next_array][1])
+            next_array += 1
+        _BUILDERS[call.name](reader, call)
+    return reader.finish()
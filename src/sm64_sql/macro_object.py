@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from typing import Optional
 
-from sm64_sql.behavior_param import parse_behavior_param
-from sm64_sql.parse_utils import extract_macro_args
+from sm64_sql.behavior_param import PLACEMENT_PARAM_BYTE, parse_behavior_param
+from sm64_sql.parse_utils import MacroCall, iter_macro_calls
 
 
 @dataclass
@@ -15,29 +15,43 @@ class SM64MacroObject:
     pos_y: int
     pos_z: int
     bhv_param: str  # per-placement behavior param (16-bit), e.g. DIALOG_089 or 0
-    bhv_param_value: Optional[int]  # resolved value, or NULL if symbolic
+    bhv_param_value: Optional[int]  # resolved value, or NULL if unresolvable
+    bhv_param_1_value: Optional[int]  # 1st byte's integer value, or NULL
+    bhv_param_2_value: Optional[int]  # 2nd byte's integer value, or NULL
+    bhv_param_3_value: Optional[int]  # 3rd byte's integer value, or NULL
+    bhv_param_4_value: Optional[int]  # 4th byte's integer value, or NULL
+
+
+# The macro is spelled MACRO_OBJECT_WITH_BHV_PARAM in the decomp. It adds a
+# trailing bhvParam argument; the preset/yaw/pos arguments keep their
+# positions, so both variants are read the same way.
+MACRO_OBJECT_MACROS = ("MACRO_OBJECT", "MACRO_OBJECT_WITH_BHV_PARAM")
 
 
 def try_parse_macro_object(
     line: str, level_name: str, area: int = 0
 ) -> Optional[SM64MacroObject]:
-    # The macro is spelled MACRO_OBJECT_WITH_BHV_PARAM in the decomp. It adds a
-    # trailing bhvParam argument; the preset/yaw/pos arguments keep their
-    # positions, so both variants are read the same way.
-    has_bhv_param = line.strip().startswith("MACRO_OBJECT_WITH_BHV_PARAM")
-    macro = "MACRO_OBJECT_WITH_BHV_PARAM" if has_bhv_param else "MACRO_OBJECT"
-    line_parts = extract_macro_args(line, macro)
-    if line_parts is None:
-        return None
+    for call in iter_macro_calls(line, MACRO_OBJECT_MACROS):
+        return macro_object_from_call(call, level_name, area)
+    return None
 
+
+def macro_object_from_call(
+    call: MacroCall, level_name: str, area: int = 0
+) -> SM64MacroObject:
+    """The row for a ``MACRO_OBJECT`` or ``MACRO_OBJECT_WITH_BHV_PARAM`` call."""
+    line_parts = call.args
+    has_bhv_param = call.name == "MACRO_OBJECT_WITH_BHV_PARAM"
     expected = 6 if has_bhv_param else 5
     if len(line_parts) != expected:
         raise ValueError(
-            f"Expected {expected} args in {macro}, got {len(line_parts)}: "
-            f"{line.strip()}"
+            f"Expected {expected} args in {call.name}, got {len(line_parts)}: "
+            f"{call.text}"
         )
     # MACRO_OBJECT carries no param; MACRO_OBJECT_WITH_BHV_PARAM adds it last.
-    bhv_param = parse_behavior_param(line_parts[5] if has_bhv_param else "0")
+    bhv_param = parse_behavior_param(
+        line_parts[5] if has_bhv_param else "0", byte=PLACEMENT_PARAM_BYTE
+    )
     return SM64MacroObject(
         macro_name=line_parts[0],
         level=level_name,
@@ -48,4 +62,8 @@ def try_parse_macro_object(
         pos_z=int(line_parts[4]),
         bhv_param=bhv_param.raw,
         bhv_param_value=bhv_param.value,
+        bhv_param_1_value=bhv_param.byte1,
+        bhv_param_2_value=bhv_param.byte2,
+        bhv_param_3_value=bhv_param.byte3,
+        bhv_param_4_value=bhv_param.byte4,
     )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from sm64_sql.behavior_param import parse_behavior_param
 from sm64_sql.parse_utils import split_top_level, strip_block_comments
@@ -12,7 +12,7 @@ class SM64MacroPreset:
     behavior: str
     model_name: str
     param: str  # the preset's default param expression, or "0"
-    param_value: Optional[int]  # resolved value, or NULL if symbolic
+    param_value: Optional[int]  # resolved value, or NULL if unresolvable
 
 
 def _strip_comments(line: str) -> str:
@@ -45,7 +45,9 @@ def get_macro_preset_names(path: Path) -> List[str]:
 
 
 def parse_macro_presets(
-    macro_preset_path: Path, macro_preset_names_path: Path
+    macro_preset_path: Path,
+    macro_preset_names_path: Path,
+    symbols: Optional[Dict[str, int]] = None,
 ) -> List[SM64MacroPreset]:
     macro_preset_names = get_macro_preset_names(macro_preset_names_path)
     lines = macro_preset_path.read_text().splitlines()
@@ -75,7 +77,7 @@ def parse_macro_presets(
                 "More preset rows than names in enum MacroPresets "
                 f"(row {enum_index}): {line}"
             )
-        param = parse_behavior_param(line_parts[2])
+        param = parse_behavior_param(line_parts[2], symbols)
         macro_presets.append(
             SM64MacroPreset(
                 macro_name=macro_preset_names[enum_index],
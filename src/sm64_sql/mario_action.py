@@ -14,7 +14,7 @@ unnamed, inside those handlers and the helpers they call. This mines all three:
   authoritative: it handles shared handlers and fall-through cases that a
   name-convention guess would miss.
 - **Edges** -- ``mario_action_call`` is the backbone: from each action's handler
-  we follow the static call graph (via the shared ``reachable`` walk) through
+  we follow the static call graph (via the shared ``CallGraph``) through
   Mario's action code, and every call to a transition *setter* is recorded,
   attributed to the action(s) that reach it. The setters that take the
   destination as an argument are leaves (the relation vocabulary); the
@@ -32,9 +32,12 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+from sm64_sql.c_corpus import Extractor, corpus, register
 from sm64_sql.c_parse import (
+    Call,
+    CallGraph,
     Func,
     collect_calls,
     find_descendant,
@@ -42,8 +45,6 @@ from sm64_sql.c_parse import (
     function_params,
     functions_from_tree,
     iter_nodes,
-    parse_tree,
-    reachable,
 )
 
 # The action state machine lives in mario.c (the setters + shared helpers) and
@@ -168,6 +169,33 @@ class ParsedMarioActions:
     data_transitions: List[SM64MarioActionDataTransition]
 
 
+@dataclass
+class _CaseFacts:
+    value: str  # the case label, e.g. AIR_STEP_GRABBED_CEILING
+    calls: List[Call]  # every call inside the case, in source order
+
+
+@dataclass
+class _BodyFacts:
+    text: str  # the function body's source text
+    cases: List[_CaseFacts]  # every labelled case of every switch in the body
+
+
+@dataclass
+class _MarioFileFacts:
+    """Everything the action walk needs from one Mario C file (cacheable).
+
+    The analyses below used to share live tree-sitter trees; they now read
+    these plain facts, so a warm build never parses the file at all.
+    """
+
+    funcs: List[Func]
+    handlers: Dict[str, str]  # ACT_* -> act_* from the dispatcher switches
+    dispatcher_groups: Dict[str, Set[str]]  # dispatcher -> its ACT_* labels
+    bodies: Dict[str, _BodyFacts]  # function -> body (first definition wins)
+    returns: List[Tuple[str, Optional[str]]]  # (returned CONST, gating flag)
+
+
 def _parse_action_constants(
     header: str,
 ) -> Tuple[List[Tuple[str, int]], Dict[int, str], List[Tuple[str, int]]]:
@@ -251,7 +279,7 @@ def _handlers_from_switch(node, handlers: Dict[str, str]) -> None:
         pending = []
 
 
-def _dispatch_handlers(trees: List) -> Dict[str, str]:
+def _dispatch_handlers(tree) -> Dict[str, str]:
     handlers: Dict[str, str] = {}
 
     def visit(node) -> None:
@@ -263,12 +291,11 @@ def _dispatch_handlers(trees: List) -> Dict[str, str]:
         for child in node.children:
             visit(child)
 
-    for tree in trees:
-        visit(tree.root_node)
+    visit(tree.root_node)
     return handlers
 
 
-def _dispatcher_groups(trees: List) -> Dict[str, Set[str]]:
+def _dispatcher_groups(tree) -> Dict[str, Set[str]]:
     """Map each mario_execute_*_action dispatcher to the ACT_* it dispatches.
 
     The dispatcher's switch labels are the whole group of actions that run that
@@ -298,8 +325,7 @@ def _dispatcher_groups(trees: List) -> Dict[str, Set[str]]:
         for child in node.children:
             visit(child)
 
-    for tree in trees:
-        visit(tree.root_node)
+    visit(tree.root_node)
     return groups
 
 
@@ -423,15 +449,29 @@ def _action_flag_gate(condition: Optional[str], flags: Set[str]) -> Optional[str
     return None
 
 
-def _function_nodes(trees: List) -> Dict[str, Any]:
-    """Map function name -> its function_definition node, across the given trees."""
-    nodes: Dict[str, Any] = {}
-    for tree in trees:
-        for fn_node in iter_nodes(tree.root_node, "function_definition"):
-            name = function_name(fn_node)
-            if name is not None:
-                nodes.setdefault(name, fn_node)
-    return nodes
+def _function_bodies(tree) -> Dict[str, _BodyFacts]:
+    """Map function name -> its body text and switch cases (for _refuted_edges)."""
+    bodies: Dict[str, _BodyFacts] = {}
+    for fn_node in iter_nodes(tree.root_node, "function_definition"):
+        name = function_name(fn_node)
+        body = fn_node.child_by_field_name("body")
+        if name is None or body is None or name in bodies:
+            continue
+        cases: List[_CaseFacts] = []
+        for switch in iter_nodes(body, "switch_statement"):
+            sbody = switch.child_by_field_name("body")
+            if sbody is None:
+                continue
+            for case in sbody.named_children:
+                if case.type != "case_statement":
+                    continue
+                value = case.child_by_field_name("value")
+                if value is not None:
+                    cases.append(
+                        _CaseFacts(value.text.decode().strip(), collect_calls(case))
+                    )
+        bodies[name] = _BodyFacts(body.text.decode(), cases)
+    return bodies
 
 
 def _enclosing_param_flag(node, params: Set[str]) -> Optional[str]:
@@ -455,6 +495,66 @@ def _enclosing_param_flag(node, params: Set[str]) -> Optional[str]:
     return None
 
 
+def _return_observations(tree) -> List[Tuple[str, Optional[str]]]:
+    """Every ``return CONST;`` in a function with parameters, with its gate.
+
+    The gate is the flag from ``_enclosing_param_flag`` (None if ungated).
+    """
+    const_re = re.compile(r"^[A-Z][A-Z0-9_]+$")
+    observations: List[Tuple[str, Optional[str]]] = []
+    for fn_node in iter_nodes(tree.root_node, "function_definition"):
+        params = {p for p in function_params(fn_node) if p}
+        body = fn_node.child_by_field_name("body")
+        if not params or body is None:
+            continue
+        for ret in iter_nodes(body, "return_statement"):
+            val = next((c for c in ret.named_children if c.type != "comment"), None)
+            if val is None or not const_re.match(val.text.decode().strip()):
+                continue
+            observations.append(
+                (val.text.decode().strip(), _enclosing_param_flag(ret, params))
+            )
+    return observations
+
+
+def _extract_file(tree, rel: str) -> _MarioFileFacts:
+    return _MarioFileFacts(
+        funcs=functions_from_tree(tree, rel),
+        handlers=_dispatch_handlers(tree),
+        dispatcher_groups=_dispatcher_groups(tree),
+        bodies=_function_bodies(tree),
+        returns=_return_observations(tree),
+    )
+
+
+# Strip preprocessor conditionals so brace-splitting #if ENABLE_RUMBLE blocks
+# don't drop handlers like act_lava_boost / act_start_sleeping.
+register(
+    Extractor(
+        "mario_file",
+        _extract_file,
+        tuple(
+            "/".join((*MARIO_SUBDIR, filename))
+            for filename in (*MARIO_FILES, *MARIO_STEP_FILES)
+        ),
+        strip_conditionals=True,
+    )
+)
+
+
+def _gate_map(observations: List[Tuple[str, Optional[str]]]) -> Dict[str, str]:
+    seen: Dict[str, Set[Optional[str]]] = {}
+    for const, flag in observations:
+        seen.setdefault(const, set()).add(flag)
+    gate: Dict[str, str] = {}
+    for const, flags in seen.items():
+        if len(flags) == 1 and None not in flags:
+            flag = next(iter(flags))
+            if flag is not None:
+                gate[const] = flag
+    return gate
+
+
 def _return_gate_map(repo: Path) -> Dict[str, str]:
     """Discover, from the code, which returned constants are gated by which flag.
 
@@ -467,38 +567,20 @@ def _return_gate_map(repo: Path) -> Dict[str, str]:
     returned ungated (like ``AIR_STEP_NONE``) is correctly *not* gated.
     """
     game_dir = repo.joinpath(*MARIO_SUBDIR)
-    const_re = re.compile(r"^[A-Z][A-Z0-9_]+$")
-    seen: Dict[str, Set[Optional[str]]] = {}
+    observations: List[Tuple[str, Optional[str]]] = []
+    c_files = corpus(repo)
     for filename in (*MARIO_FILES, *MARIO_STEP_FILES):
         path = game_dir / filename
-        if not path.is_file():
-            continue
-        tree = parse_tree(path, strip_conditionals=True)
-        for fn_node in iter_nodes(tree.root_node, "function_definition"):
-            params = {p for p in function_params(fn_node) if p}
-            body = fn_node.child_by_field_name("body")
-            if not params or body is None:
-                continue
-            for ret in iter_nodes(body, "return_statement"):
-                val = next((c for c in ret.named_children if c.type != "comment"), None)
-                if val is None or not const_re.match(val.text.decode().strip()):
-                    continue
-                seen.setdefault(val.text.decode().strip(), set()).add(
-                    _enclosing_param_flag(ret, params)
-                )
-    gate: Dict[str, str] = {}
-    for const, flags in seen.items():
-        if len(flags) == 1 and None not in flags:
-            flag = next(iter(flags))
-            if flag is not None:
-                gate[const] = flag
-    return gate
+        if path.is_file():
+            rel = path.relative_to(repo).as_posix()
+            observations.extend(c_files.facts("mario_file", rel).returns)
+    return _gate_map(observations)
 
 
 def _refuted_edges(
-    repo: Path,
+    gate_map: Dict[str, str],
     funcs: Dict[str, Func],
-    func_nodes: Dict[str, Any],
+    bodies: Dict[str, _BodyFacts],
     func_actions: Dict[str, Set[str]],
     action_names: Set[str],
 ) -> Dict[Tuple[str, str, str], str]:
@@ -514,7 +596,6 @@ def _refuted_edges(
     can never grab a ceiling). A helper that passes the flag itself (a
     self-contained handler like ``act_water_jump``) satisfies it for everyone.
     """
-    gate_map = _return_gate_map(repo)
     if not gate_map:
         return {}
 
@@ -525,46 +606,35 @@ def _refuted_edges(
 
     refuted: Dict[Tuple[str, str, str], str] = {}
     for hname, sources in func_actions.items():
-        fn_node = func_nodes.get(hname)
-        body = fn_node.child_by_field_name("body") if fn_node is not None else None
+        body = bodies.get(hname)
         if body is None:
             continue
-        body_text = body.text.decode()
-        for switch in iter_nodes(body, "switch_statement"):
-            sbody = switch.child_by_field_name("body")
-            if sbody is None:
+        for case in body.cases:
+            flag = gate_map.get(case.value)
+            if flag is None:
                 continue
-            for case in sbody.named_children:
-                if case.type != "case_statement":
-                    continue
-                value = case.child_by_field_name("value")
-                if value is None:
-                    continue
-                flag = gate_map.get(value.text.decode().strip())
-                if flag is None:
-                    continue
-                targets = {
-                    call.args[_ACTION_ARG]
-                    for call in collect_calls(case)
-                    if call.callee in TRANSITION_SETTERS
-                    and len(call.args) > _ACTION_ARG
-                    and call.args[_ACTION_ARG] in action_names
-                }
-                if not targets:
-                    continue
-                flag_re = re.compile(rf"\b{re.escape(flag)}\b")
-                # The helper passes the flag itself -> reachable for all sources.
-                if flag_re.search(body_text):
-                    continue
-                # Forwarded flag: only callers that pass it can reach the case.
-                valid: Set[str] = set()
-                for caller, cargs in callers.get(hname, ()):
-                    if any(flag_re.search(a) for a in cargs):
-                        valid |= func_actions.get(caller, set())
-                for to_action in targets:
-                    for src in sources:
-                        if src not in valid:
-                            refuted[(src, hname, to_action)] = flag
+            targets = {
+                call.args[_ACTION_ARG]
+                for call in case.calls
+                if call.callee in TRANSITION_SETTERS
+                and len(call.args) > _ACTION_ARG
+                and call.args[_ACTION_ARG] in action_names
+            }
+            if not targets:
+                continue
+            flag_re = re.compile(rf"\b{re.escape(flag)}\b")
+            # The helper passes the flag itself -> reachable for all sources.
+            if flag_re.search(body.text):
+                continue
+            # Forwarded flag: only callers that pass it can reach the case.
+            valid: Set[str] = set()
+            for caller, cargs in callers.get(hname, ()):
+                if any(flag_re.search(a) for a in cargs):
+                    valid |= func_actions.get(caller, set())
+            for to_action in targets:
+                for src in sources:
+                    if src not in valid:
+                        refuted[(src, hname, to_action)] = flag
     return refuted
 
 
@@ -580,23 +650,38 @@ def parse_mario_actions(repo: Path) -> ParsedMarioActions:
     )
     action_names = {name for name, _ in actions}
 
-    # Parse mario.c + the per-group action files into one function table and keep
-    # their trees for the dispatcher-switch walk.
+    # Extract mario.c + the per-group action files (and mario_step.c, read only
+    # for its return gates) once each, and merge them into one function table,
+    # dispatcher map and body index.
     funcs: Dict[str, Func] = {}
-    trees = []
-    for filename in MARIO_FILES:
+    handlers: Dict[str, str] = {}
+    dispatcher_groups: Dict[str, Set[str]] = {}
+    bodies: Dict[str, _BodyFacts] = {}
+    returns: List[Tuple[str, Optional[str]]] = []
+    c_files = corpus(repo)
+    c_files.prefetch(
+        "mario_file",
+        [
+            (game_dir / filename).relative_to(repo).as_posix()
+            for filename in (*MARIO_FILES, *MARIO_STEP_FILES)
+            if (game_dir / filename).is_file()
+        ],
+    )
+    for filename in (*MARIO_FILES, *MARIO_STEP_FILES):
         path = game_dir / filename
         if not path.is_file():
             continue
-        rel = path.relative_to(repo).as_posix()
-        # Strip preprocessor conditionals so brace-splitting #if ENABLE_RUMBLE
-        # blocks don't drop handlers like act_lava_boost / act_start_sleeping.
-        tree = parse_tree(path, strip_conditionals=True)
-        trees.append(tree)
-        for fn in functions_from_tree(tree, rel):
+        facts = c_files.facts("mario_file", path.relative_to(repo).as_posix())
+        returns.extend(facts.returns)
+        if filename not in MARIO_FILES:
+            continue
+        for fn in facts.funcs:
             funcs[fn.name] = fn
+        handlers.update(facts.handlers)
+        dispatcher_groups.update(facts.dispatcher_groups)
+        for name, body in facts.bodies.items():
+            bodies.setdefault(name, body)
 
-    handlers = _dispatch_handlers(trees)
     nodes = _action_nodes(actions, group_by_value, flag_bits, handlers, funcs)
 
     # Reachability: from each action's handler, follow the call graph through
@@ -608,11 +693,12 @@ def parse_mario_actions(repo: Path) -> ParsedMarioActions:
         for name in funcs
         if name not in TRANSITION_SETTERS and name not in _SETTER_INTERNALS
     }
+    graph = CallGraph(funcs, recursion_set)
     func_actions: Dict[str, Set[str]] = {}
     for action, handler in handlers.items():
         if action not in action_names or handler not in funcs:
             continue
-        for reached in reachable(handler, funcs, recursion_set):
+        for reached in graph.reachable(handler):
             func_actions.setdefault(reached, set()).add(action)
 
     # Group-wide cancels: each per-group dispatcher mario_execute_*_action runs
@@ -624,14 +710,14 @@ def parse_mario_actions(repo: Path) -> ParsedMarioActions:
     # (so only the ambient pre/post-switch code is reached) and attribute it to
     # the whole group.
     handler_fns = set(handlers.values())
-    ambient_set = recursion_set - handler_fns
-    for dispatcher, labels in _dispatcher_groups(trees).items():
+    ambient = CallGraph(funcs, recursion_set - handler_fns)
+    for dispatcher, labels in dispatcher_groups.items():
         if dispatcher not in funcs:
             continue
         group = {a for a in labels if a in action_names}
         if not group:
             continue
-        for reached in reachable(dispatcher, funcs, ambient_set):
+        for reached in ambient.reachable(dispatcher):
             func_actions.setdefault(reached, set()).update(group)
 
     # Refute call-graph edges a flag argument disproves: a literal transition
@@ -639,8 +725,9 @@ def parse_mario_actions(repo: Path) -> ParsedMarioActions:
     # under case AIR_STEP_GRABBED_CEILING) is only real for callers that pass the
     # gating flag (AIR_STEP_CHECK_HANG). The rest are tagged on the backbone and
     # dropped from mario_transition; see _refuted_edges.
-    func_nodes = _function_nodes(trees)
-    refuted = _refuted_edges(repo, funcs, func_nodes, func_actions, action_names)
+    refuted = _refuted_edges(
+        _gate_map(returns), funcs, bodies, func_actions, action_names
+    )
 
     # Each action's own flags, to refute edges guarded by m->action & ACT_FLAG_*:
     # a group-wide cancel like check_for_instant_quicksand only fires for
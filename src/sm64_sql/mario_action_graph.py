@@ -0,0 +1,116 @@
+"""Reachability between Mario's actions, packed into one row per action.
+
+The edges are ``mario_all_transitions``: the literal transitions of
+``mario_transition`` (so the flag-refuted, ``gated_by`` calls are left out) and
+the runtime targets ``mario_action_data_transition`` resolves. Most of the few
+hundred actions reach most of the others, so one row per reachable pair would
+run to tens of thousands of rows. Instead each action gets a single
+``mario_action_graph`` row whose BLOBs are indexed by every action's
+``ordinal`` (its position in name order):
+
+- ``reach``: a bitset, bit ``ordinal % 8`` of byte ``ordinal // 8`` set for
+  each action reachable in one or more transitions;
+- ``steps``: one byte per action, the fewest transitions to it (0 if it is
+  unreachable);
+- ``via``: a little-endian uint16 per action, the ordinal of the action before
+  it on one shortest path (0xFFFF if unreachable). A path is read back from
+  its end, one ``via`` at a time, within the same row.
+
+SQLite cannot read a BLOB back as an integer without going through ``hex()``
+a digit at a time, so ``mario_action_step`` holds the BLOBs unpacked, one
+indexed row per reachable pair, for SQL (see db.create_mario_action_graph).
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from sm64_sql.graph_utils import BitGraph
+
+UNREACHABLE = 0xFFFF  # ``via`` of an action that cannot be reached
+
+
+@dataclass
+class SM64MarioActionGraph:
+    action_name: str
+    ordinal: int  # the action's index into every row's BLOBs
+    in_degree: int  # distinct actions with a transition into this one
+    out_degree: int  # distinct actions this one transitions to
+    # Its strongly connected component, numbered in topological order: a
+    # transition never leads to a lower-numbered component.
+    scc: int
+    scc_size: int  # 1 unless the action is on a cycle with others
+    reach_count: int  # actions reachable in one or more steps (itself on a cycle)
+    reach: bytes  # bitset over ordinals
+    steps: bytes  # uint8 per ordinal: fewest transitions, 0 = unreachable
+    via: bytes  # little-endian uint16 per ordinal: previous action on the path
+
+
+@dataclass
+class SM64MarioActionStep:
+    action_name: str
+    to_action: str  # an action reachable from action_name
+    steps: int  # fewest transitions from action_name to it
+    via: str  # the action before to_action on one such path
+
+
+def mario_action_graph(
+    actions: Sequence[str], edges: Iterable[Tuple[str, str]]
+) -> List[SM64MarioActionGraph]:
+    """One row per action, in name order, for the (action, to_action) edges.
+
+    Edges from or to a name not in ``actions`` are ignored. Where two paths
+    are equally short, ``via`` picks the action first in name order.
+    """
+    names = sorted(set(actions))
+    if len(names) >= UNREACHABLE:
+        raise ValueError(f"Too many actions to pack: {len(names)}")
+    number = {name: i for i, name in enumerate(names)}
+    graph = BitGraph(
+        len(names),
+        ((number[a], number[b]) for a, b in edges if a in number and b in number),
+    )
+    scc = [0] * len(names)
+    for c, members in enumerate(graph.components):
+        for member in members:
+            scc[member] = len(graph.components) - 1 - c
+
+    rows = []
+    for source, name in enumerate(names):
+        steps = bytearray(len(names))
+        via = [UNREACHABLE] * len(names)
+        for depth, node, prev in graph.layers(source):
+            if depth > 0xFF:
+                raise ValueError(f"Path from {name} too long to pack: {depth}")
+            steps[node] = depth
+            via[node] = prev
+        reach = graph.reach(source)
+        rows.append(
+            SM64MarioActionGraph(
+                action_name=name,
+                ordinal=source,
+                in_degree=bin(graph.pred_bits[source]).count("1"),
+                out_degree=len(graph.succ[source]),
+                scc=scc[source],
+                scc_size=len(graph.components[graph.component_of[source]]),
+                reach_count=bin(reach).count("1"),
+                reach=reach.to_bytes((len(names) + 7) // 8, "little"),
+                steps=bytes(steps),
+                via=b"".join(v.to_bytes(2, "little") for v in via),
+            )
+        )
+    return rows
+
+
+def mario_action_steps(
+    graph: Sequence[SM64MarioActionGraph],
+) -> Iterator[SM64MarioActionStep]:
+    """The reachable pairs of ``graph`` (its rows, in ordinal order), unpacked."""
+    names = [row.action_name for row in graph]
+    for row in graph:
+        via = struct.unpack(f"<{len(names)}H", row.via)
+        for ordinal, steps in enumerate(row.steps):
+            if steps:
+                yield SM64MarioActionStep(
+                    row.action_name, names[ordinal], steps, names[via[ordinal]]
+                )
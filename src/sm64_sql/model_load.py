@@ -16,7 +16,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-from sm64_sql.parse_utils import extract_macro_args
+from sm64_sql.parse_utils import MacroCall, iter_macro_calls
 
 
 @dataclass
@@ -28,26 +28,29 @@ class SM64ModelLoad:
     kind: str  # "geo" or "dl"
 
 
-def try_parse_model_load(line: str, level: str) -> Optional[SM64ModelLoad]:
-    geo_args = extract_macro_args(line, "LOAD_MODEL_FROM_GEO")
-    if geo_args is not None:
-        if len(geo_args) != 2:
-            raise ValueError(f"Expected 2 LOAD_MODEL_FROM_GEO args: {line.strip()}")
-        return SM64ModelLoad(level, geo_args[0], geo_args[1], None, "geo")
-
-    dl_args = extract_macro_args(line, "LOAD_MODEL_FROM_DL")
-    if dl_args is not None:
-        if len(dl_args) != 3:
-            raise ValueError(f"Expected 3 LOAD_MODEL_FROM_DL args: {line.strip()}")
-        return SM64ModelLoad(level, dl_args[0], dl_args[1], dl_args[2], "dl")
+MODEL_LOAD_MACROS = ("LOAD_MODEL_FROM_GEO", "LOAD_MODEL_FROM_DL")
+
 
+def try_parse_model_load(line: str, level: str) -> Optional[SM64ModelLoad]:
+    for call in iter_macro_calls(line, MODEL_LOAD_MACROS):
+        return model_load_from_call(call, level)
     return None
 
 
+def model_load_from_call(call: MacroCall, level: str) -> SM64ModelLoad:
+    """The row for a ``LOAD_MODEL_FROM_GEO`` or ``LOAD_MODEL_FROM_DL`` call."""
+    args = call.args
+    if call.name == "LOAD_MODEL_FROM_GEO":
+        if len(args) != 2:
+            raise ValueError(f"Expected 2 LOAD_MODEL_FROM_GEO args: {call.text}")
+        return SM64ModelLoad(level, args[0], args[1], None, "geo")
+    if len(args) != 3:
+        raise ValueError(f"Expected 3 LOAD_MODEL_FROM_DL args: {call.text}")
+    return SM64ModelLoad(level, args[0], args[1], args[2], "dl")
+
+
 def parse_model_loads(path: Path, level: str) -> List[SM64ModelLoad]:
-    loads = []
-    for line in path.read_text().splitlines():
-        load = try_parse_model_load(line.strip(), level)
-        if load is not None:
-            loads.append(load)
-    return loads
+    return [
+        model_load_from_call(call, level)
+        for call in iter_macro_calls(path.read_text(), MODEL_LOAD_MACROS)
+    ]
@@ -2,14 +2,14 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 from sm64_sql.behavior_param import parse_behavior_param
-from sm64_sql.parse_utils import extract_macro_args
+from sm64_sql.parse_utils import MacroCall, iter_macro_calls
 
 
 @dataclass
 class SM64Object:
     model_name: str
     level: str
-    area: int  # AREA the object is placed in (resolved in parse_levelscript); 0 if none
+    area: int  # AREA the object is placed in (resolved in read_level_script); 0 if none
     initial_x: int
     initial_y: int
     initial_z: int
@@ -17,11 +17,15 @@ class SM64Object:
     initial_rot_y: int
     initial_rot_z: int
     bhv_param: str  # behavior-param expression as written (e.g. BPARAM2(...))
-    bhv_param_value: Optional[int]  # resolved 32-bit value, or NULL if symbolic
+    bhv_param_value: Optional[int]  # resolved 32-bit value, or NULL if unresolvable
     bhv_param_1: Optional[str]  # BPARAM1 arg: 1st byte (oBhvParams >> 24)
     bhv_param_2: Optional[str]  # BPARAM2 arg: 2nd byte (oBhvParams2ndByte)
     bhv_param_3: Optional[str]  # BPARAM3 arg: 3rd byte
     bhv_param_4: Optional[str]  # BPARAM4 arg: 4th byte
+    bhv_param_1_value: Optional[int]  # 1st byte's integer value, or NULL
+    bhv_param_2_value: Optional[int]  # 2nd byte's integer value, or NULL
+    bhv_param_3_value: Optional[int]  # 3rd byte's integer value, or NULL
+    bhv_param_4_value: Optional[int]  # 4th byte's integer value, or NULL
     behavior: str
     in_act_1: bool
     in_act_2: bool
@@ -42,18 +46,24 @@ def parse_acts(acts: str) -> List[bool]:
     return act_presence
 
 
+OBJECT_MACROS = ("OBJECT", "OBJECT_WITH_ACTS")
+
+
 def try_parse_object(line: str, level: str) -> Optional[SM64Object]:
-    has_acts = line.strip().startswith("OBJECT_WITH_ACTS")
-    macro_name = "OBJECT_WITH_ACTS" if has_acts else "OBJECT"
-    line_parts = extract_macro_args(line, macro_name)
-    if line_parts is None:
-        return None
+    for call in iter_macro_calls(line, OBJECT_MACROS):
+        return object_from_call(call, level)
+    return None
+
 
+def object_from_call(call: MacroCall, level: str) -> SM64Object:
+    """The row for an ``OBJECT`` or ``OBJECT_WITH_ACTS`` call."""
+    line_parts = call.args
+    has_acts = call.name == "OBJECT_WITH_ACTS"
     expected = 10 if has_acts else 9
     if len(line_parts) != expected:
         raise ValueError(
-            f"Expected {expected} args in {macro_name}, got {len(line_parts)}: "
-            f"{line.strip()}"
+            f"Expected {expected} args in {call.name}, got {len(line_parts)}: "
+            f"{call.text}"
         )
 
     # If ACT_* not present, the object is in all the acts
@@ -63,7 +73,7 @@ def try_parse_object(line: str, level: str) -> Optional[SM64Object]:
 
     return SM64Object(
         level=level,
-        area=0,  # filled in by parse_levelscript once AREA/JUMP_LINK is resolved
+        area=0,  # filled in by read_level_script once AREA/JUMP_LINK is resolved
         model_name=line_parts[0],
         initial_x=int(line_parts[1]),
         initial_y=int(line_parts[2]),
@@ -77,6 +87,10 @@ def try_parse_object(line: str, level: str) -> Optional[SM64Object]:
         bhv_param_2=bhv_param.param2,
         bhv_param_3=bhv_param.param3,
         bhv_param_4=bhv_param.param4,
+        bhv_param_1_value=bhv_param.byte1,
+        bhv_param_2_value=bhv_param.byte2,
+        bhv_param_3_value=bhv_param.byte3,
+        bhv_param_4_value=bhv_param.byte4,
         behavior=line_parts[8],
         in_act_1=act_presence[0],
         in_act_2=act_presence[1],
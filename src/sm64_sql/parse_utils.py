@@ -1,5 +1,22 @@
 import ast
-from typing import Callable, Dict, List, Optional, Tuple
+import functools
+import re
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+_BRACKET = re.compile(r"[()\[\]{}]")
+_PAREN = re.compile(r"[()]")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/")
+_ENUM_START = re.compile(r"^[ \t]*enum[ \t]+(\w+)[ \t]*(?:\{|$)", re.MULTILINE)
 
 
 def strip_block_comments(line: str) -> str:
@@ -31,22 +48,21 @@ def split_top_level(text: str, separator: str = ",") -> List[str]:
     would mishandle any argument that contained a comma inside its brackets, so
     only commas at bracket depth zero count as argument separators.
     """
+    if not _BRACKET.search(text):
+        return text.split(separator)
     parts: List[str] = []
     depth = 0
-    current = ""
-    openers = "([{"
-    closers = ")]}"
-    for char in text:
-        if char in openers:
+    start = 0
+    for match in re.finditer(r"[()\[\]{}]|" + re.escape(separator), text):
+        char = match.group()
+        if char in "([{":
             depth += 1
-        elif char in closers:
+        elif char in ")]}":
             depth = max(0, depth - 1)
-        if char == separator and depth == 0:
-            parts.append(current)
-            current = ""
-        else:
-            current += char
-    parts.append(current)
+        elif depth == 0:
+            parts.append(text[start : match.start()])
+            start = match.end()
+    parts.append(text[start:])
     return parts
 
 
@@ -105,6 +121,16 @@ def parse_c_enum(text: str, enum_name: str) -> List[Tuple[str, int]]:
     return entries
 
 
+def c_enum_names(text: str) -> List[str]:
+    """The names of the ``enum NAME`` definitions in ``text``, in order.
+
+    Only a line that starts ``enum NAME`` and opens (or is followed by) its
+    brace counts, as :func:`parse_c_enum` reads it; anonymous and
+    ``typedef enum`` forms are not listed.
+    """
+    return _ENUM_START.findall(text)
+
+
 class _UnresolvableExpr(Exception):
     """Raised when a C expression cannot be reduced to an integer."""
 
@@ -184,7 +210,13 @@ def evaluate_int(
     """
     try:
         tree = ast.parse(expr, mode="eval")
-        return _eval_int_node(tree, symbols or {}, functions or {})
+        # ``is None``, not falsiness: a symbol dict that resolves names on
+        # demand can be empty and still know them.
+        return _eval_int_node(
+            tree,
+            symbols if symbols is not None else {},
+            functions if functions is not None else {},
+        )
     except (_UnresolvableExpr, SyntaxError, ValueError, TypeError):
         return None
 
@@ -204,19 +236,12 @@ def _logical_lines(text: str) -> List[str]:
     return lines
 
 
-def parse_c_defines(
-    text: str, base_symbols: Optional[Dict[str, int]] = None
-) -> List[Tuple[str, int]]:
-    """Harvest ``#define NAME <int expr>`` entries that reduce to an integer.
+def iter_c_define_exprs(text: str) -> Iterator[Tuple[str, str]]:
+    """Every object-like ``#define NAME <value>`` as ``(name, value text)``.
 
-    Definitions are read in order so later ones can reference earlier ones (and
-    anything in ``base_symbols``). Function-like macros (``NAME(args)``),
-    value-less guards, and non-integer values are skipped. Preprocessor
-    conditionals are ignored, which is correct for the linearly-defined headers
-    here (no name is defined twice).
+    Function-like macros (``NAME(args)``) and value-less guards are skipped;
+    the value is not evaluated, so it may be any expression.
     """
-    symbols: Dict[str, int] = dict(base_symbols or {})
-    entries: List[Tuple[str, int]] = []
     for line in _logical_lines(text):
         line = strip_comments(line)
         if not line.startswith("#define "):
@@ -231,6 +256,23 @@ def parse_c_defines(
         expr = rest[end:].strip()
         if not expr:
             continue  # a value-less guard such as the header's include guard
+        yield name, expr
+
+
+def parse_c_defines(
+    text: str, base_symbols: Optional[Dict[str, int]] = None
+) -> List[Tuple[str, int]]:
+    """Harvest ``#define NAME <int expr>`` entries that reduce to an integer.
+
+    Definitions are read in order so later ones can reference earlier ones (and
+    anything in ``base_symbols``). Function-like macros (``NAME(args)``),
+    value-less guards, and non-integer values are skipped. Preprocessor
+    conditionals are ignored, which is correct for the linearly-defined headers
+    here (no name is defined twice).
+    """
+    symbols: Dict[str, int] = dict(base_symbols or {})
+    entries: List[Tuple[str, int]] = []
+    for name, expr in iter_c_define_exprs(text):
         value = evaluate_int(expr, symbols)
         if value is not None:
             entries.append((name, value))
@@ -324,17 +366,7 @@ def extract_call(line: str) -> Optional[Tuple[str, List[str]]]:
     if start >= len(line) or line[start] != "(":
         return None
 
-    depth = 0
-    close = -1
-    for index in range(start, len(line)):
-        char = line[index]
-        if char == "(":
-            depth += 1
-        elif char == ")":
-            depth -= 1
-            if depth == 0:
-                close = index
-                break
+    close = _close_paren(line, start)
     if close == -1:
         return None
 
@@ -344,6 +376,21 @@ def extract_call(line: str) -> Optional[Tuple[str, List[str]]]:
     return name, [part.strip() for part in split_top_level(inner, ",")]
 
 
+def _close_paren(text: str, start: int, stop: Optional[int] = None) -> int:
+    """Index of the ``)`` matching the ``(`` at ``start`` (before ``stop``), or -1."""
+    if stop is None:
+        stop = len(text)
+    close = text.find(")", start, stop)
+    if close == -1 or text.find("(", start + 1, close) == -1:
+        return close  # the common case: no nested parens
+    depth = 0
+    for match in _PAREN.finditer(text, start, stop):
+        depth += 1 if match.group() == "(" else -1
+        if depth == 0:
+            return match.start()
+    return -1
+
+
 def extract_macro_args(line: str, macro_name: str) -> Optional[List[str]]:
     """Return the comment-stripped arguments of ``macro_name(...)`` in ``line``.
 
@@ -367,21 +414,74 @@ def extract_macro_args(line: str, macro_name: str) -> Optional[List[str]]:
     if start >= len(line) or line[start] != "(":
         return None
 
-    # Walk from the opening paren to its matching close paren so that trailing
-    # tokens (e.g. a stray comma or comment) outside the call are ignored.
-    depth = 0
-    end = -1
-    for index in range(start, len(line)):
-        char = line[index]
-        if char == "(":
-            depth += 1
-        elif char == ")":
-            depth -= 1
-            if depth == 0:
-                end = index
-                break
+    # Find the opening paren's matching close paren so that trailing tokens
+    # (e.g. a stray comma or comment) outside the call are ignored.
+    end = _close_paren(line, start)
     if end == -1:
         return None
 
     inner = strip_block_comments(line[start + 1 : end])
     return [part.strip() for part in split_top_level(inner, ",")]
+
+
+class MacroCall(NamedTuple):
+    """One ``NAME(args)`` invocation at the start of a source line."""
+
+    name: str
+    args: List[str]  # top-level, comment-stripped; [] for ``NAME()``
+    line: int  # 1-based source line
+
+    @property
+    def text(self) -> str:
+        """The call as ``NAME(arg, ...)``, for error messages."""
+        return f"{self.name}({', '.join(self.args)})"
+
+
+@functools.lru_cache(maxsize=None)
+def _call_start(names: Optional[Tuple[str, ...]]) -> Pattern[str]:
+    # Longest first, so a name is never cut short by a prefix of it. Group 2
+    # is the argument text when it holds no parens (the common case).
+    alternatives = (
+        "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+        if names is not None
+        else r"[A-Za-z_]\w*"
+    )
+    return re.compile(
+        rf"^[^\S\r\n]*({alternatives})[ \t]*\((?:([^()\n]*)\))?", re.MULTILINE
+    )
+
+
+def iter_macro_calls(
+    text: str, names: Optional[Iterable[str]] = None
+) -> Iterator[MacroCall]:
+    """Every line of ``text`` that begins with a ``NAME(...)`` call, in order.
+
+    Reads the line-oriented files -- level scripts, ``macro.inc.c``,
+    ``collision.inc.c`` -- a whole file at a time: one compiled pattern finds
+    the lines that start a call (and, unless it nests parens, its argument
+    text), so the others -- most of a collision file -- are never looked at in
+    Python. With ``names``, only calls to those macros are returned. A call is
+    read as :func:`extract_macro_args` reads one line: the name is the exact
+    leading identifier, alignment whitespace may precede the ``(``, the call
+    must close on the same line, and block comments are stripped from the
+    arguments.
+    """
+    start = _call_start(None if names is None else tuple(sorted(set(names))))
+    line = 1
+    counted = 0
+    for match in start.finditer(text):
+        inner = match.group(2)
+        if inner is None:  # nested parens, or no close paren on the line
+            open_paren = text.index("(", match.start(1))
+            eol = text.find("\n", open_paren)
+            close = _close_paren(text, open_paren, len(text) if eol == -1 else eol)
+            if close == -1:
+                continue
+            inner = text[open_paren + 1 : close]
+        line += text.count("\n", counted, match.start())
+        counted = match.start()
+        if "*/" in inner:
+            inner = _BLOCK_COMMENT.sub("", inner)
+        inner = inner.strip()
+        args = [part.strip() for part in split_top_level(inner, ",")] if inner else []
+        yield MacroCall(match.group(1), args, line)
@@ -0,0 +1,261 @@
+"""The collision floor below, and the ceiling above, every placed object.
+
+For each ``object``, ``macro_object`` and ``special_object`` row, this looks
+the placement up against the geometry of its area's ``collision.inc.c`` (see
+collision.py) the way the game's ``find_floor`` / ``find_ceil`` do:
+
+- A triangle is a floor if its normal's y component is above 0.01, and a
+  ceiling if it is below -0.01; the rest are walls (surface_load.c).
+- A floor counts if the placement's (x, z) lies inside the triangle seen from
+  above and the triangle's height there is at most 78 units above the
+  placement; the highest such floor wins. Ceilings mirror that: at most 78
+  units below, the lowest wins (surface_collision.c).
+
+Only the area's own mesh (``levels/<lvl>/areas/<n>/collision.inc.c``) is used;
+object meshes (doors, platforms) move at run time and are left out. A
+placement with no floor under it -- out of bounds, or in area 0 -- gets NULLs.
+
+The table is computed after the placements are loaded
+(db.create_placement_surfaces), so each row names its placement by ``kind``
+and ``source_rowid``, like ``camera_trigger_object``, and is rebuilt whenever
+the placement tables are.
+
+The lookup is batched per area with NumPy. The triangles are binned into the
+1024-unit XZ grid cells the game partitions static surfaces into, each
+placement is paired with the triangles of its own cell only, and the
+inside-test and plane height are evaluated for all of the pairs at once.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from sm64_sql.collision import SM64CollisionMesh, SM64CollisionSurface
+from sm64_sql.macro_object import SM64MacroObject
+from sm64_sql.object import SM64Object
+from sm64_sql.special import SM64SpecialObject
+
+CELL_SIZE = 1024  # side of the game's static-surface partition cells
+_BUFFER = 78.0  # find_floor / find_ceil's tolerance, in world units
+_MIN_NORMAL_Y = 0.01  # |normal.y| below this is a wall
+
+_Placement = Union[SM64Object, SM64MacroObject, SM64SpecialObject]
+
+
+@dataclass
+class SM64PlacementSurface:
+    kind: str  # the placement's table: object, macro_object or special_object
+    source_rowid: int  # the placement's rowid in that table
+    name: str  # its behavior, macro_name or preset_name
+    level: str  # level folder
+    area: int
+    x: int  # position, as in the placement's own table
+    y: int
+    z: int
+    floor_y: Optional[float]  # height of the floor below, or NULL if none
+    floor_surface_type: Optional[str]  # SURFACE_* of that floor
+    floor_distance: Optional[float]  # y - floor_y (down to -78)
+    ceiling_y: Optional[float]  # height of the ceiling above, or NULL if none
+    ceiling_surface_type: Optional[str]
+    ceiling_distance: Optional[float]  # ceiling_y - y (down to -78)
+
+
+def _describe(placement: _Placement) -> Tuple[str, str, int, int, int]:
+    if isinstance(placement, SM64Object):
+        return (
+            "object",
+            placement.behavior,
+            placement.initial_x,
+            placement.initial_y,
+            placement.initial_z,
+        )
+    if isinstance(placement, SM64MacroObject):
+        kind, name = "macro_object", placement.macro_name
+    else:
+        kind, name = "special_object", placement.preset_name
+    return kind, name, placement.pos_x, placement.pos_y, placement.pos_z
+
+
+class _Terrain:
+    """One area's floors and ceilings, as (n, 3, 3) vertex arrays."""
+
+    def __init__(
+        self,
+        meshes: Sequence[SM64CollisionMesh],
+        surfaces: Sequence[SM64CollisionSurface],
+    ):
+        vertices = {
+            mesh.collision_name: np.frombuffer(mesh.vertices, "<i2")
+            .reshape(-1, 3)
+            .astype(np.float64)
+            for mesh in meshes
+        }
+        self.type_names: List[str] = []
+        triangles = [np.empty((0, 3, 3))]
+        types = [np.empty(0, np.int64)]
+        for surface in surfaces:
+            if surface.collision_name not in vertices:
+                continue
+            indices = np.frombuffer(surface.triangles, "<u2").reshape(-1, 3)
+            triangles.append(vertices[surface.collision_name][indices])
+            types.append(np.full(len(indices), len(self.type_names)))
+            self.type_names.append(surface.surface_type)
+        tris = np.concatenate(triangles)
+        self.types = np.concatenate(types)
+
+        v1, v2, v3 = tris[:, 0], tris[:, 1], tris[:, 2]
+        normal = np.cross(v2 - v1, v3 - v2)
+        magnitude = np.linalg.norm(normal, axis=1)
+        normal_y = np.divide(
+            normal[:, 1], magnitude, out=np.zeros(len(tris)), where=magnitude > 0
+        )
+        self.floors = self._select(tris, normal, normal_y > _MIN_NORMAL_Y)
+        self.ceilings = self._select(tris, normal, normal_y < -_MIN_NORMAL_Y)
+
+    def _select(
+        self, tris: np.ndarray, normal: np.ndarray, mask: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        tris, normal = tris[mask], normal[mask]
+        return {
+            "tris": tris,
+            "normal": normal,
+            # The plane offset: n . p + offset = 0 for every point p on it.
+            "offset": -np.einsum("ij,ij->i", normal, tris[:, 0]),
+            "types": self.types[mask],
+        }
+
+
+def _cell(coord: np.ndarray) -> np.ndarray:
+    return np.floor_divide(coord, CELL_SIZE).astype(np.int64)
+
+
+def _cell_key(cx: np.ndarray, cz: np.ndarray) -> np.ndarray:
+    return (cx << 32) + (cz + (1 << 31))
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenated ``arange(start, start + count)`` for each pair."""
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) else 0) - np.repeat(
+        ends - counts - starts, counts
+    )
+
+
+def _candidates(
+    tris: np.ndarray, px: np.ndarray, pz: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(placement, triangle) index pairs that share a grid cell."""
+    cx0, cx1 = _cell(tris[:, :, 0].min(1)), _cell(tris[:, :, 0].max(1))
+    cz0, cz1 = _cell(tris[:, :, 2].min(1)), _cell(tris[:, :, 2].max(1))
+    width = cz1 - cz0 + 1
+    spans = (cx1 - cx0 + 1) * width
+    tri = np.repeat(np.arange(len(tris)), spans)
+    step = _ranges(np.zeros_like(spans), spans)
+    keys = _cell_key(cx0[tri] + step // width[tri], cz0[tri] + step % width[tri])
+    order = np.argsort(keys, kind="stable")
+    keys, tri = keys[order], tri[order]
+
+    point_keys = _cell_key(_cell(px), _cell(pz))
+    lo = np.searchsorted(keys, point_keys, "left")
+    counts = np.searchsorted(keys, point_keys, "right") - lo
+    return np.repeat(np.arange(len(px)), counts), tri[_ranges(lo, counts)]
+
+
+def _lookup(
+    side: Dict[str, np.ndarray], points: np.ndarray, floor: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per point, the chosen triangle's index into ``side`` (-1 if none) and height."""
+    chosen = np.full(len(points), -1)
+    heights = np.zeros(len(points))
+    if not len(side["tris"]) or not len(points):
+        return chosen, heights
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    p, t = _candidates(side["tris"], x, z)
+    px, py, pz = x[p], y[p], z[p]
+    tris = side["tris"][t]
+
+    # The game's XZ inside test: a floor is wound so that each edge's cross
+    # product with the point is >= 0; a ceiling, the other way round.
+    inside = np.ones(len(p), bool)
+    for i in range(3):
+        a, b = tris[:, i], tris[:, (i + 1) % 3]
+        edge = (a[:, 2] - pz) * (b[:, 0] - a[:, 0]) - (a[:, 0] - px) * (
+            b[:, 2] - a[:, 2]
+        )
+        inside &= edge >= 0 if floor else edge <= 0
+    normal = side["normal"][t]
+    height = -(normal[:, 0] * px + normal[:, 2] * pz + side["offset"][t]) / normal[:, 1]
+    if floor:
+        ok = inside & (height <= py + _BUFFER)
+        rank = -height  # highest first
+    else:
+        ok = inside & (height >= py - _BUFFER)
+        rank = height  # lowest first
+    p, t, height, rank = p[ok], t[ok], height[ok], rank[ok]
+
+    # The best pair per point (ties to the earliest triangle).
+    order = np.lexsort((t, rank, p))
+    first = order[np.unique(p[order], return_index=True)[1]]
+    chosen[p[first]] = t[first]
+    heights[p[first]] = height[first]
+    return chosen, heights
+
+
+def locate_placement_surfaces(
+    placements: Sequence[Tuple[int, _Placement]],
+    meshes: Sequence[SM64CollisionMesh],
+    surfaces: Sequence[SM64CollisionSurface],
+) -> List[SM64PlacementSurface]:
+    """One row per (rowid, placement) pair (in order), against the collision rows.
+
+    Each placement is looked up in the meshes of its own level and area.
+    """
+    rowids = [rowid for rowid, _placement in placements]
+    described = [(p.level, p.area, _describe(p)) for _rowid, p in placements]
+    rows: List[Optional[SM64PlacementSurface]] = [None] * len(placements)
+    by_area: Dict[Tuple[str, int], List[int]] = {}
+    for i, (level, area, _info) in enumerate(described):
+        by_area.setdefault((level, area), []).append(i)
+
+    for (level, area), members in by_area.items():
+        terrain = _Terrain(
+            [m for m in meshes if (m.level, m.area) == (level, area) and area > 0],
+            [s for s in surfaces if (s.level, s.area) == (level, area) and area > 0],
+        )
+        points = np.array([described[i][2][2:] for i in members], np.float64)
+        points = points.reshape(-1, 3)
+        floor, floor_y = _lookup(terrain.floors, points, floor=True)
+        ceiling, ceiling_y = _lookup(terrain.ceilings, points, floor=False)
+        for j, i in enumerate(members):
+            _level, _area, (kind, name, x, y, z) = described[i]
+            row = SM64PlacementSurface(
+                kind=kind,
+                source_rowid=rowids[i],
+                name=name,
+                level=level,
+                area=area,
+                x=x,
+                y=y,
+                z=z,
+                floor_y=None,
+                floor_surface_type=None,
+                floor_distance=None,
+                ceiling_y=None,
+                ceiling_surface_type=None,
+                ceiling_distance=None,
+            )
+            if floor[j] >= 0:
+                row.floor_y = float(floor_y[j])
+                row.floor_surface_type = terrain.type_names[
+                    terrain.floors["types"][floor[j]]
+                ]
+                row.floor_distance = y - row.floor_y
+            if ceiling[j] >= 0:
+                row.ceiling_y = float(ceiling_y[j])
+                row.ceiling_surface_type = terrain.type_names[
+                    terrain.ceilings["types"][ceiling[j]]
+                ]
+                row.ceiling_distance = row.ceiling_y - y
+            rows[i] = row
+    return [row for row in rows if row is not None]
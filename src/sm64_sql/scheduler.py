@@ -0,0 +1,260 @@
+"""Run the build's parse stages as a dependency graph, optionally in parallel.
+
+``parse_repo`` used to call every parser one after another, although most of
+them read disjoint files and never look at each other's rows. Each parser is now
+a :class:`Stage` that *declares* what it needs and what it produces -- named
+values such as ``sm64_objects`` or ``native_roots`` -- so the scheduler can work
+out the real data dependencies (``behavior_calls`` needs the ``CALL_NATIVE`` roots
+from ``behavior_commands``; almost nothing else needs anything) and run every
+stage whose inputs are ready at the same time.
+
+With ``jobs == 1`` the stages run serially, in declaration order, in this
+process -- the reference behaviour, and what the tests use. With more jobs the
+ready stages are submitted to a process pool (tree-sitter and the line parsers
+are CPU-bound, so threads would serialise on the GIL). Stage functions and their
+results cross the process boundary, so both must be picklable: module-level
+functions returning plain dataclasses, dicts and lists.
+
+A stage marked ``in_process`` runs in this process even when there is a pool,
+in between collecting the pool's results; the others keep the pool busy
+meanwhile.
+
+A stage may also return a lazy iterator (e.g. a generator) for an output. From
+a stage run in this process ``iter_stages`` hands it on unconsumed, so a
+streaming build can write rows to the database as they are produced; anywhere
+else -- a pool worker's result, a value another stage takes as input,
+``run_stages`` -- it is collected into a list first. A stage with lazy outputs
+should therefore be ``in_process``, or streaming only helps with ``jobs == 1``.
+"""
+
+import contextlib
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    """How a stage's work splits into independent units (see incremental.py).
+
+    ``key_of`` maps a source path (repo-relative, POSIX) to the unit it belongs
+    to; ``func`` is called as ``func(repo, key, **inputs)`` and returns the same
+    outputs as the whole stage, restricted to the rows whose ``column`` equals
+    ``key``. Every output of a partitioned stage must be a list of rows carrying
+    that column.
+    """
+
+    column: str
+    key_of: Callable[[str], str]
+    func: Callable[..., Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One parse step: the named values it consumes and the ones it produces.
+
+    ``func`` is called as ``func(repo, **inputs)`` and must return a dict whose
+    keys are exactly ``outputs``. ``sources`` are glob patterns (relative to the
+    repo) covering every file the stage reads; incremental builds re-run the
+    stage only when one of them changes. ``in_process`` keeps the stage out of
+    the pool (see the module docstring).
+    """
+
+    name: str
+    func: Callable[..., Dict[str, Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    sources: Tuple[str, ...] = ()
+    partitioning: Optional[Partitioning] = None
+    in_process: bool = False
+
+
+def order_stages(stages: Sequence[Stage]) -> List[Stage]:
+    """Return ``stages`` in a dependency-respecting order.
+
+    Stages keep their declaration order wherever the dependencies allow, so the
+    serial schedule is the obvious reading of the declaration list. Raises
+    ``ValueError`` for an output produced twice, an input nobody produces, or a
+    dependency cycle.
+    """
+    producer: Dict[str, str] = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producer:
+                raise ValueError(
+                    f"{output!r} is produced by both {producer[output]!r} "
+                    f"and {stage.name!r}"
+                )
+            producer[output] = stage.name
+    for stage in stages:
+        for needed in stage.inputs:
+            if needed not in producer:
+                raise ValueError(f"stage {stage.name!r} needs unknown {needed!r}")
+
+    ordered: List[Stage] = []
+    available: Set[str] = set()
+    pending = list(stages)
+    while pending:
+        ready = next(
+            (s for s in pending if all(i in available for i in s.inputs)), None
+        )
+        if ready is None:
+            names = ", ".join(s.name for s in pending)
+            raise ValueError(f"dependency cycle among stages: {names}")
+        pending.remove(ready)
+        ordered.append(ready)
+        available.update(ready.outputs)
+    return ordered
+
+
+def run_stage(stage: Stage, repo: Path, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one stage and check it produced exactly what it declared."""
+    result = stage.func(repo, **inputs)
+    if set(result) != set(stage.outputs):
+        raise ValueError(
+            f"stage {stage.name!r} produced {sorted(result)}, "
+            f"declared {sorted(stage.outputs)}"
+        )
+    return result
+
+
+def _collected(value: Any) -> Any:
+    return list(value) if isinstance(value, Iterator) else value
+
+
+def run_stage_collected(
+    stage: Stage, repo: Path, inputs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """``run_stage`` with any lazy outputs collected into lists."""
+    result = run_stage(stage, repo, inputs)
+    return {name: _collected(value) for name, value in result.items()}
+
+
+def iter_stages(
+    stages: Sequence[Stage],
+    repo: Path,
+    jobs: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+    pool: Optional[Executor] = None,
+) -> Iterator[Tuple[Stage, Dict[str, Any]]]:
+    """Run every stage, yielding each one's outputs as soon as it finishes.
+
+    Nothing is accumulated: only the values a later stage takes as input are
+    kept, so a consumer that writes each result away and drops it never holds
+    the whole build in memory. ``jobs`` and ``initializer`` are as for
+    ``run_stages``; with a pool, stages finish (and are yielded) in any order.
+    ``pool`` is an executor to use instead of starting one (``jobs`` is then
+    ignored), so the caller can share it with the stages run in this process.
+    """
+    ordered = order_stages(stages)
+    needed = {name for stage in ordered for name in stage.inputs}
+    values: Dict[str, Any] = {}
+
+    def run_here(stage: Stage) -> Dict[str, Any]:
+        inputs = {name: values[name] for name in stage.inputs}
+        result = run_stage(stage, repo, inputs)
+        for name in needed.intersection(result):
+            values[name] = result[name] = _collected(result[name])
+        return result
+
+    if pool is None and jobs <= 1:
+        for stage in ordered:
+            yield stage, run_here(stage)
+        return
+
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=jobs, initializer=initializer, initargs=initargs
+                )
+            )
+        pending = list(ordered)
+        running: Dict[Future, Stage] = {}
+        while pending or running:
+            ready = [s for s in pending if all(i in values for i in s.inputs)]
+            for stage in ready:
+                if not stage.in_process:
+                    pending.remove(stage)
+                    inputs = {name: values[name] for name in stage.inputs}
+                    future = pool.submit(run_stage_collected, stage, repo, inputs)
+                    running[future] = stage
+            here = next((s for s in ready if s.in_process), None)
+            if here is not None:
+                pending.remove(here)
+                yield here, run_here(here)
+            if not running:
+                continue
+            # Block on the pool only when there is nothing to run here.
+            done, _ = wait(
+                running,
+                timeout=0 if here is not None else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                stage = running.pop(future)
+                result = future.result()
+                values.update({n: result[n] for n in needed.intersection(result)})
+                yield stage, result
+
+
+def run_stages(
+    stages: Sequence[Stage],
+    repo: Path,
+    jobs: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+    pool: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """Run every stage and return all of their outputs, keyed by name.
+
+    ``jobs`` is the size of the worker pool; 1 (or fewer) runs serially in
+    this process. ``initializer(*initargs)`` runs once in each pool worker, to
+    carry over process-wide setup such as the extraction cache. ``pool`` is as
+    for ``iter_stages``.
+    """
+    values: Dict[str, Any] = {}
+    stream = iter_stages(stages, repo, jobs, initializer, initargs, pool)
+    for _stage, result in stream:
+        values.update({name: _collected(v) for name, v in result.items()})
+    return values
+
+
+def dependents(stages: Sequence[Stage], names: Set[str]) -> Set[str]:
+    """The named stages plus every stage that (transitively) consumes them."""
+    result = set(names)
+    for stage in order_stages(stages):
+        if any(producer in result for producer in _producers_of(stages, stage)):
+            result.add(stage.name)
+    return result
+
+
+def prerequisites(stages: Sequence[Stage], names: Set[str]) -> Set[str]:
+    """The named stages plus every stage they (transitively) take inputs from."""
+    result = set(names)
+    for stage in reversed(order_stages(stages)):
+        if stage.name in result:
+            result.update(_producers_of(stages, stage))
+    return result
+
+
+def _producers_of(stages: Sequence[Stage], stage: Stage) -> Set[str]:
+    return {s.name for s in stages if set(s.outputs) & set(stage.inputs)}
@@ -0,0 +1,71 @@
+"""A grid index over everything placed in the world, as a plain table.
+
+SQLite's R*Tree module would serve box queries directly, but the sql.js build
+the web playground loads does not include it, so ``spatial_index`` is an
+ordinary table instead: the x/z plane is cut into ``CELL_SIZE`` square cells,
+and each placement (a point) gets one row for its cell, each camera trigger one
+row for every cell its box touches. Its primary key starts with (level, area,
+cell_x, cell_z), so a box query becomes a range of cells on that key, and the
+``min_*``/``max_*`` columns then test the exact box.
+
+A coordinate's cell is ``(CAST(x AS INTEGER) + 32768) / 1024`` -- the offset
+keeps it non-negative, so SQL's integer division is a floor. SM64 positions
+are s16s, so every cell is in 0..63.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, Tuple
+
+CELL_SIZE = 1024
+CELL_ORIGIN = 0x8000  # added to a coordinate before dividing by CELL_SIZE
+CELL_COUNT = 0x10000 // CELL_SIZE  # cells along each axis
+
+
+@dataclass
+class SM64SpatialIndex:
+    level: str
+    area: int  # -1 for a camera trigger that applies to the whole level
+    cell_x: int  # the cell along x, see cell_of
+    cell_z: int
+    kind: str  # the source table: object, macro_object, special_object, camera_trigger
+    source_rowid: int  # the row's rowid in that table
+    # The axis-aligned box (a point for a placement: min == max).
+    min_x: float
+    max_x: float
+    min_y: float
+    max_y: float
+    min_z: float
+    max_z: float
+
+
+def cell_of(value: float) -> int:
+    """The cell containing the coordinate ``value``, clamped to the grid."""
+    return min(max((int(value) + CELL_ORIGIN) // CELL_SIZE, 0), CELL_COUNT - 1)
+
+
+def cells(
+    min_x: float, max_x: float, min_z: float, max_z: float
+) -> Iterator[Tuple[int, int]]:
+    """Every (cell_x, cell_z) a box on the x/z plane touches."""
+    for cell_x in range(cell_of(math.floor(min_x)), cell_of(math.ceil(max_x)) + 1):
+        for cell_z in range(cell_of(math.floor(min_z)), cell_of(math.ceil(max_z)) + 1):
+            yield cell_x, cell_z
+
+
+def trigger_box(
+    center: Tuple[int, int, int], bounds: Tuple[int, int, int], yaw: int
+) -> Tuple[float, ...]:
+    """(min_x, max_x, min_y, max_y, min_z, max_z) of a yaw-rotated trigger box."""
+    angle = yaw * 2 * math.pi / 0x10000
+    cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+    half_x = bounds[0] * cos + bounds[2] * sin
+    half_z = bounds[0] * sin + bounds[2] * cos
+    return (
+        center[0] - half_x,
+        center[0] + half_x,
+        center[1] - bounds[1],
+        center[1] + bounds[1],
+        center[2] - half_z,
+        center[2] + half_z,
+    )
@@ -0,0 +1,94 @@
+"""Everything a behavior can ultimately bring into existence.
+
+The direct edges are ``behavior_all_spawns`` (an object spawning another:
+``script``, ``c`` and ``data`` origins) and ``behavior_calls_morph`` (an object
+turning into another behavior, origin ``morph``: what the new behavior spawns,
+the object now spawns). ``spawn_closure`` follows them transitively and gives
+one row per (ancestor, descendant) pair with the fewest edges between the two
+and one shortest witness path.
+
+Spawn and morph loops are common (a spawner spawning itself, a coin morphing
+back), so the graph is first condensed into its strongly connected
+components: every behavior in a component reaches the same set, computed once
+per component with Python ints as bitsets (see graph_utils.py). A
+breadth-first search from each behavior then steps a whole frontier at a time
+with the same bitsets, and stops as soon as it has found that set.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Set, Tuple
+
+from sm64_sql.graph_utils import BitGraph
+
+# Each edge's origins are listed in this order.
+ORIGINS = ("script", "c", "data", "morph")
+
+
+@dataclass
+class SM64SpawnClosure:
+    behavior_name: str  # the ancestor
+    descendant: str  # a behavior it can bring into existence (itself on a cycle)
+    depth: int  # fewest spawn/morph edges from the ancestor to the descendant
+    path_json: str  # one such path: the behaviors visited, ancestor first
+    # Per edge of that path, the origins it has, e.g. [["script"], ["c", "data"]].
+    origins_json: str
+    origin_mix: str  # the distinct origins along the path, comma-separated
+
+
+def spawn_closure(edges: Sequence[Tuple[str, str, str]]) -> List[SM64SpawnClosure]:
+    """The closure rows of the (parent, child, origin) edges.
+
+    Rows are ordered by ancestor, then depth, then descendant. Where two paths
+    are equally short, the witness goes through the alphabetically first
+    behavior at each step, so it is the same on every build.
+    """
+    names = sorted(
+        {name for parent, child, _origin in edges for name in (parent, child)}
+    )
+    number = {name: i for i, name in enumerate(names)}
+    origins: Dict[Tuple[int, int], Set[str]] = {}
+    for parent, child, origin in edges:
+        origins.setdefault((number[parent], number[child]), set()).add(origin)
+    graph = BitGraph(len(names), origins)
+
+    # Everything a row needs per edge, worked out once: its origins as JSON,
+    # and as a bitmask over the origin names for the path's mix.
+    kinds = list(ORIGINS) + sorted(
+        {o for present in origins.values() for o in present} - set(ORIGINS)
+    )
+    edge_json: Dict[Tuple[int, int], str] = {}
+    edge_mask: Dict[Tuple[int, int], int] = {}
+    for edge, present in origins.items():
+        ordered = [kind for kind in kinds if kind in present]
+        edge_json[edge] = json.dumps(ordered)
+        edge_mask[edge] = sum(1 << kinds.index(kind) for kind in ordered)
+    quoted = [json.dumps(name) for name in names]
+
+    rows: List[SM64SpawnClosure] = []
+    for source in range(len(names)):
+        # Per descendant: the path from the source (as a JSON list body), its
+        # edges' origins (likewise) and their mix.
+        path_of: Dict[int, Tuple[str, str, int]] = {}
+        root = (quoted[source], "", 0)
+        for depth, node, prev in graph.layers(source):
+            path, steps, mask = root if depth == 1 else path_of[prev]
+            edge = (prev, node)
+            path, steps, mask = path_of[node] = (
+                f"{path}, {quoted[node]}",
+                f"{steps}, {edge_json[edge]}" if steps else edge_json[edge],
+                mask | edge_mask[edge],
+            )
+            rows.append(
+                SM64SpawnClosure(
+                    behavior_name=names[source],
+                    descendant=names[node],
+                    depth=depth,
+                    path_json=f"[{path}]",
+                    origins_json=f"[{steps}]",
+                    origin_mix=",".join(
+                        kind for i, kind in enumerate(kinds) if mask >> i & 1
+                    ),
+                )
+            )
+    return rows
@@ -2,17 +2,16 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from sm64_sql.behavior_param import parse_behavior_param
+from sm64_sql.behavior_param import PLACEMENT_PARAM_BYTE, parse_behavior_param
 from sm64_sql.parse_utils import (
-    extract_macro_args,
+    MacroCall,
+    iter_macro_calls,
     parse_c_enum,
     split_top_level,
     strip_comments,
 )
 
-# Try the more specific macro names first; extract_macro_args only matches an
-# exact `name(` anyway, but this keeps the intent obvious.
-_SPECIAL_OBJECT_MACROS = (
+SPECIAL_OBJECT_MACROS = (
     "SPECIAL_OBJECT_WITH_YAW_AND_PARAM",
     "SPECIAL_OBJECT_WITH_YAW",
     "SPECIAL_OBJECT",
@@ -40,7 +39,11 @@ class SM64SpecialObject:
     pos_z: int
     yaw: int  # 0 when the placement macro carries no yaw
     bhv_param: str  # per-placement param, or "0" when the macro carries none
-    bhv_param_value: Optional[int]  # resolved value, or NULL if symbolic
+    bhv_param_value: Optional[int]  # resolved value, or NULL if unresolvable
+    bhv_param_1_value: Optional[int]  # 1st byte's integer value, or NULL
+    bhv_param_2_value: Optional[int]  # 2nd byte's integer value, or NULL
+    bhv_param_3_value: Optional[int]  # 3rd byte's integer value, or NULL
+    bhv_param_4_value: Optional[int]  # 4th byte's integer value, or NULL
 
 
 def parse_special_presets(data_path: Path, names_path: Path) -> List[SM64SpecialPreset]:
@@ -80,6 +83,36 @@ def parse_special_presets(data_path: Path, names_path: Path) -> List[SM64Special
     return presets
 
 
+def special_object_from_call(
+    call: MacroCall, level: str, area: int, preset_ids: Dict[str, int]
+) -> SM64SpecialObject:
+    """The special object one ``SPECIAL_OBJECT*`` call places."""
+    args = call.args
+    if len(args) < 4:
+        raise ValueError(f"Too few args in {call.name}: {call.text}")
+    yaw = int(args[4]) if len(args) >= 5 else 0
+    # Only SPECIAL_OBJECT_WITH_YAW_AND_PARAM has a 6th (param) arg.
+    bhv_param = parse_behavior_param(
+        args[5] if len(args) >= 6 else "0", byte=PLACEMENT_PARAM_BYTE
+    )
+    return SM64SpecialObject(
+        preset_name=args[0],
+        preset_id=preset_ids.get(args[0], -1),
+        level=level,
+        area=area,
+        pos_x=int(args[1]),
+        pos_y=int(args[2]),
+        pos_z=int(args[3]),
+        yaw=yaw,
+        bhv_param=bhv_param.raw,
+        bhv_param_value=bhv_param.value,
+        bhv_param_1_value=bhv_param.byte1,
+        bhv_param_2_value=bhv_param.byte2,
+        bhv_param_3_value=bhv_param.byte3,
+        bhv_param_4_value=bhv_param.byte4,
+    )
+
+
 def parse_special_objects(
     path: Path, level: str, area: int, preset_ids: Dict[str, int]
 ) -> List[SM64SpecialObject]:
@@ -87,33 +120,10 @@ def parse_special_objects(
 
     ``preset_ids`` is the enum SpecialPresets name->id map; it resolves preset
     aliases (e.g. special_haunted_door is an alias of special_wooden_door) so
-    the placement still joins to a special_preset row by id.
+    the placement still joins to a special_preset row by id. (The level build
+    reads the placements along with the geometry; see collision.py.)
     """
-    special_objects = []
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        for macro in _SPECIAL_OBJECT_MACROS:
-            args = extract_macro_args(line, macro)
-            if args is None:
-                continue
-            if len(args) < 4:
-                raise ValueError(f"Too few args in {macro}: {line}")
-            yaw = int(args[4]) if len(args) >= 5 else 0
-            # Only SPECIAL_OBJECT_WITH_YAW_AND_PARAM has a 6th (param) arg.
-            bhv_param = parse_behavior_param(args[5] if len(args) >= 6 else "0")
-            special_objects.append(
-                SM64SpecialObject(
-                    preset_name=args[0],
-                    preset_id=preset_ids.get(args[0], -1),
-                    level=level,
-                    area=area,
-                    pos_x=int(args[1]),
-                    pos_y=int(args[2]),
-                    pos_z=int(args[3]),
-                    yaw=yaw,
-                    bhv_param=bhv_param.raw,
-                    bhv_param_value=bhv_param.value,
-                )
-            )
-            break
-    return special_objects
+    return [
+        special_object_from_call(call, level, area, preset_ids)
+        for call in iter_macro_calls(path.read_text(), SPECIAL_OBJECT_MACROS)
+    ]
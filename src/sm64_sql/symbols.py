@@ -0,0 +1,110 @@
+"""Integer values for every named constant the headers define.
+
+Behavior params are mostly written with symbols -- ``BPARAM2(WARP_NODE_0A)``,
+``DIALOG_089``, ``BPARAM1(STAR_INDEX_ACT_3)`` -- so evaluating them needs the
+``#define`` and ``enum`` tables scattered across ``include/`` and
+``src/game/``. ``parse_symbols`` harvests both, from every header under
+``SYMBOL_SOURCES``, into one ``name -> value`` dict that the placement
+stages use to fill ``bhv_param_value`` and the per-byte columns (see
+behavior_param.py).
+
+A ``#define`` may refer to a name from another header, or one defined further
+down. Each definition is therefore recorded first as unevaluated text, then
+evaluated on demand, and every result (including a failure) is memoized. So
+each expression is parsed at most once, however many others use it. An enum is
+read in full with ``parse_c_enum``; an enum whose values cannot be evaluated
+that way is skipped.
+
+A name is defined once; later definitions of it are ignored. The files are read
+in sorted order, with the enums of a file before its defines. Preprocessor
+conditionals are not evaluated, so for a name defined in both arms of an
+``#ifdef VERSION_JP``, the first arm wins.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from sm64_sql.parse_utils import (
+    c_enum_names,
+    evaluate_int,
+    iter_c_define_exprs,
+    parse_c_enum,
+)
+
+# Repo-relative globs of the headers harvested, in priority order.
+SYMBOL_SOURCES = ("include/**/*.h", "src/game/*.h")
+
+
+class _Resolver(Dict[str, int]):
+    """A symbol dict for ``evaluate_int`` that evaluates ``#define``s on demand.
+
+    Looking a name up evaluates its definition once (recursively, through this
+    same dict) and keeps the result; a name that cannot be evaluated, or whose
+    definition refers back to itself, is simply absent.
+    """
+
+    def __init__(self, exprs: Dict[str, str], values: Dict[str, int]):
+        super().__init__(values)
+        self._exprs = exprs
+        self._failed: Set[str] = set()
+        self._evaluating: Set[str] = set()
+
+    def _resolve(self, name: str) -> Optional[int]:
+        if dict.__contains__(self, name):
+            return dict.__getitem__(self, name)
+        expr = self._exprs.get(name)
+        if expr is None or name in self._failed or name in self._evaluating:
+            return None
+        self._evaluating.add(name)
+        try:
+            value = evaluate_int(expr, self)
+        finally:
+            self._evaluating.discard(name)
+        if value is None:
+            self._failed.add(name)
+        else:
+            self[name] = value
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._resolve(name) is not None
+
+    def __getitem__(self, name: str) -> int:
+        value = self._resolve(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+
+def _header_paths(repo: Path) -> List[Path]:
+    seen: Set[Path] = set()
+    paths: List[Path] = []
+    for pattern in SYMBOL_SOURCES:
+        for path in sorted(repo.glob(pattern)):
+            if path.is_file() and path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def parse_symbols(repo: Path) -> Dict[str, int]:
+    """Every ``#define`` and ``enum`` name in the headers that has an int value."""
+    values: Dict[str, int] = {}  # enumerators, already evaluated
+    exprs: Dict[str, str] = {}  # #defines, evaluated below
+    for path in _header_paths(repo):
+        text = path.read_text(errors="replace")
+        for enum_name in c_enum_names(text):
+            try:
+                entries = parse_c_enum(text, enum_name)
+            except ValueError:
+                continue  # a value parse_c_enum cannot evaluate
+            for name, value in entries:
+                if name not in values and name not in exprs:
+                    values[name] = value
+        for name, expr in iter_c_define_exprs(text):
+            if name not in values and name not in exprs:
+                exprs[name] = expr
+    resolver = _Resolver(exprs, values)
+    for name in exprs:
+        resolver._resolve(name)
+    return dict(resolver)
@@ -0,0 +1,313 @@
+"""A fake but structurally faithful decomp tree, at any scale, for benchmarks.
+
+``generate_decomp(root, scale)`` writes every file ``parse_repo`` reads, in the
+decomp's own layout and macro syntax: level folders with AREA blocks that
+JUMP_LINK their OBJECT arrays, per-area ``macro.inc.c`` and ``collision.inc.c``
+(a vertex grid, its triangles, SPECIAL_OBJECTs), a ``behavior_data.c`` whose
+scripts CALL_NATIVE into ``src/game/behaviors/*.inc.c``, and behavior C that
+exercises what the native-code walk handles -- per-file helpers shared by
+several behaviors, action tables dispatched through
+``cur_obj_call_action_function``, literal spawns, sounds and dialogs.
+
+At ``scale`` 1 the counts are roughly vanilla's (see :class:`Shape`); ``scale``
+multiplies the number of levels, behaviors and models, and keeps per-area and
+per-file density fixed, which is how large ROM-hack forks grow. Output is fully
+determined by ``scale``, ``shape`` and ``seed``.
+"""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+
+@dataclass(frozen=True)
+class Shape:
+    """Entity counts at scale 1 (roughly vanilla's)."""
+
+    levels: int = 30
+    areas_per_level: int = 2
+    objects_per_area: int = 40
+    macro_objects_per_area: int = 25
+    special_objects_per_area: int = 5
+    collision_grid: int = 8  # vertices per side of each area's floor grid
+    behaviors: int = 500
+    behaviors_per_file: int = 4
+    models: int = 120
+    macro_presets: int = 60
+    special_presets: int = 20
+    sounds: int = 40
+    dialogs: int = 40
+
+
+def _level(i: int) -> str:
+    return f"lvl{i:05d}"
+
+
+def _behavior(i: int) -> str:
+    return f"bhvSynth{i:06d}"
+
+
+def _native(i: int, part: str) -> str:
+    return f"bhv_synth_{i:06d}_{part}"
+
+
+def _model(i: int) -> str:
+    return f"MODEL_SYNTH_{i:05d}"
+
+
+def _headers(shape: Shape, scale: int) -> Dict[str, str]:
+    behaviors = shape.behaviors * scale
+    models = shape.models * scale
+    files: Dict[str, str] = {}
+    files["include/model_ids.h"] = "".join(
+        f"#define {_model(i)} {i}\n" for i in range(models)
+    )
+    files["include/behavior_data.h"] = "".join(
+        f"extern const BehaviorScript {_behavior(i)}[];\n" for i in range(behaviors)
+    )
+    files["include/macro_presets.h"] = (
+        "enum MacroPresets {\n"
+        + "".join(f"    macro_synth_{i},\n" for i in range(shape.macro_presets))
+        + "    macro_count\n};\n"
+    )
+    files["include/macro_presets.inc.c"] = (
+        "struct MacroPreset sMacroObjectPresets[] = {\n"
+        + "".join(
+            f"    {{ {_behavior(i % behaviors)}, {_model(i % models)}, 0 }},\n"
+            for i in range(shape.macro_presets)
+        )
+        + "};\n"
+    )
+    files["include/special_presets.h"] = (
+        "enum SpecialPresets {\n    special_null_start,\n"
+        + "".join(f"    special_synth_{i},\n" for i in range(shape.special_presets))
+        + "};\n"
+    )
+    files["include/special_presets.inc.c"] = (
+        "static struct SpecialPreset sSpecialObjectPresets[] = {\n"
+        + "".join(
+            f"    {{ special_synth_{i}, SPTYPE_NO_YROT_OR_PARAMS, 0x00, "
+            f"{_model(i % models)}, {_behavior(i % behaviors)} }},\n"
+            for i in range(shape.special_presets)
+        )
+        + "};\n"
+    )
+    files["include/seq_ids.h"] = "enum SeqId {\n    SEQ_NONE,\n    SEQ_SYNTH,\n};\n"
+    files["include/mario_animation_ids.h"] = (
+        "enum MarioAnimID {\n    MARIO_ANIM_RUN,\n    MARIO_ANIM_WALK,\n};\n"
+    )
+    files["include/sounds.h"] = "".join(
+        f"#define SOUND_SYNTH_{i} "
+        f"SOUND_ARG_LOAD(SOUND_BANK_OBJ, 0x{i % 256:02X}, 0xFF, SOUND_DISCRETE) "
+        f"/* 0x50{i % 256:02X}FF81 */\n"
+        for i in range(shape.sounds)
+    )
+    files["include/dialog_ids.h"] = (
+        "enum DialogID {\n    DIALOG_NONE = -1,\n"
+        + "".join(f"    DIALOG_{i:03d},\n" for i in range(shape.dialogs))
+        + "    DIALOG_COUNT\n};\n"
+    )
+    files["text/us/dialogs.h"] = "".join(
+        f'DEFINE_DIALOG(DIALOG_{i:03d}, 1, 4, 95, 200, _("\\\n'
+        f"Synthetic dialog {i}.\\n\\\n"
+        'Press [B] to talk."))\n\n'
+        for i in range(shape.dialogs)
+    )
+    return files
+
+
+def _level_files(shape: Shape, scale: int, rng: random.Random) -> Dict[str, str]:
+    levels = shape.levels * scale
+    behaviors = shape.behaviors * scale
+    models = shape.models * scale
+    files: Dict[str, str] = {}
+    files["levels/level_defines.h"] = "".join(
+        f'DEFINE_LEVEL("SYNTH {i}", LEVEL_{_level(i).upper()}, '
+        f"COURSE_{_level(i).upper()}, {_level(i)}, generic, 20000, "
+        "0x00, 0x00, 0x00, _, _)\n"
+        for i in range(levels)
+    )
+    files["levels/course_defines.h"] = "".join(
+        f"DEFINE_COURSE(COURSE_{_level(i).upper()}, 0x44440000) // ({i + 1}) "
+        f"Synthetic {i}\n"
+        for i in range(levels)
+    )
+    files["levels/scripts.c"] = (
+        "const LevelScript level_main_scripts_entry[] = {\n"
+        f"    LOAD_MODEL_FROM_GEO({_model(0)}, synth_geo_0),\n"
+        "};\n"
+    )
+
+    def coord() -> int:
+        return rng.randrange(-8000, 8000)
+
+    for lvl in range(levels):
+        name = _level(lvl)
+        arrays: List[str] = []
+        entry = [
+            f"const LevelScript level_{name}_entry[] = {{\n",
+            f"    LOAD_MODEL_FROM_GEO({_model(lvl % models)}, synth_geo_{lvl}),\n",
+        ]
+        for area in range(1, shape.areas_per_level + 1):
+            lines = []
+            for _ in range(shape.objects_per_area):
+                lines.append(
+                    f"    OBJECT(/*model*/ {_model(rng.randrange(models))}, "
+                    f"/*pos*/ {coord()}, {rng.randrange(-2000, 6000)}, {coord()}, "
+                    f"/*angle*/ 0, {rng.randrange(0, 360)}, 0, "
+                    f"/*bhvParam*/ 0x{rng.randrange(256):02X}000000, "
+                    f"/*bhv*/ {_behavior(rng.randrange(behaviors))}),\n"
+                )
+            arrays.append(
+                f"static const LevelScript script_func_local_{area}[] = {{\n"
+                + "".join(lines)
+                + "    RETURN(),\n};\n\n"
+            )
+            dest = _level((lvl + 1) % levels).upper()
+            entry += [
+                f"    AREA(/*index*/ {area}, {name}_geo_{area}),\n",
+                f"        JUMP_LINK(script_func_local_{area}),\n",
+                f"        WARP_NODE(/*id*/ 0x0A, /*destLevel*/ LEVEL_{dest}, "
+                "/*destArea*/ 1, /*destNode*/ 0x0A, /*flags*/ WARP_NO_CHECKPOINT),\n",
+                "        TERRAIN_TYPE(/*terrainType*/ TERRAIN_GRASS),\n",
+                "    END_AREA(),\n",
+            ]
+
+            area_dir = f"levels/{name}/areas/{area}"
+            files[f"{area_dir}/macro.inc.c"] = (
+                f"const MacroObject {name}_seg7_area_{area}_macro_objs[] = {{\n"
+                + "".join(
+                    f"    MACRO_OBJECT(/*preset*/ "
+                    f"macro_synth_{rng.randrange(shape.macro_presets)}, "
+                    f"/*yaw*/ 0, /*pos*/ {coord()}, {rng.randrange(0, 4000)}, "
+                    f"{coord()}),\n"
+                    for _ in range(shape.macro_objects_per_area)
+                )
+                + "    MACRO_OBJECT_END(),\n};\n"
+            )
+            files[f"{area_dir}/collision.inc.c"] = _collision(
+                f"{name}_seg7_area_{area}_collision", shape, rng
+            )
+        entry.append("    RETURN(),\n};\n")
+        files[f"levels/{name}/script.c"] = "".join(arrays) + "".join(entry)
+    return files
+
+
+def _collision(symbol: str, shape: Shape, rng: random.Random) -> str:
+    n = shape.collision_grid
+    step = 16000 // max(n - 1, 1)
+    vertices = [
+        f"    COL_VERTEX({-8000 + x * step}, {rng.randrange(-200, 200)}, "
+        f"{-8000 + z * step}),\n"
+        for z in range(n)
+        for x in range(n)
+    ]
+    tris = []
+    for z in range(n - 1):
+        for x in range(n - 1):
+            a = z * n + x
+            tris.append(f"    COL_TRI({a}, {a + n}, {a + 1}),\n")
+            tris.append(f"    COL_TRI({a + 1}, {a + n}, {a + n + 1}),\n")
+    specials = [
+        f"    SPECIAL_OBJECT(/*preset*/ "
+        f"special_synth_{rng.randrange(shape.special_presets)}, "
+        f"/*pos*/ {rng.randrange(-8000, 8000)}, 0, {rng.randrange(-8000, 8000)}),\n"
+        for _ in range(shape.special_objects_per_area)
+    ]
+    return (
+        f"const Collision {symbol}[] = {{\n"
+        "    COL_INIT(),\n"
+        f"    COL_VERTEX_INIT(0x{len(vertices):X}),\n"
+        + "".join(vertices)
+        + f"    COL_TRI_INIT(SURFACE_DEFAULT, {len(tris)}),\n"
+        + "".join(tris)
+        + "    COL_TRI_STOP(),\n"
+        + f"    COL_SPECIAL_INIT({len(specials)}),\n"
+        + "".join(specials)
+        + "    COL_END(),\n};\n"
+    )
+
+
+def _behavior_files(shape: Shape, scale: int, rng: random.Random) -> Dict[str, str]:
+    behaviors = shape.behaviors * scale
+    models = shape.models * scale
+    files: Dict[str, str] = {}
+    scripts = []
+    for i in range(behaviors):
+        child = ""
+        if i % 10 == 0:  # a few scripts spawn a child object directly
+            child = (
+                f"    SPAWN_CHILD(/*Model*/ {_model(rng.randrange(models))}, "
+                f"/*Behavior*/ {_behavior(rng.randrange(behaviors))}),\n"
+            )
+        scripts.append(
+            f"const BehaviorScript {_behavior(i)}[] = {{\n"
+            "    BEGIN(OBJ_LIST_GENACTOR),\n"
+            "    OR_INT(oFlags, OBJ_FLAG_UPDATE_GFX_POS_AND_ANGLE),\n"
+            + child
+            + f"    CALL_NATIVE({_native(i, 'init')}),\n"
+            "    BEGIN_LOOP(),\n"
+            f"        CALL_NATIVE({_native(i, 'loop')}),\n"
+            "    END_LOOP(),\n"
+            "};\n"
+        )
+    files["data/behavior_data.c"] = "\n".join(scripts)
+
+    per_file = shape.behaviors_per_file
+    for f, first in enumerate(range(0, behaviors, per_file)):
+        helper = f"synth_file_{f:05d}_helper"
+        spawned = _behavior(rng.randrange(behaviors))
+        parts = [
+            f"static void {helper}(void) {{\n"
+            f"    cur_obj_play_sound_2(SOUND_SYNTH_{rng.randrange(shape.sounds)});\n"
+            f"    spawn_object(o, {_model(rng.randrange(models))}, {spawned});\n"
+            "}\n\n"
+        ]
+        for i in range(first, min(first + per_file, behaviors)):
+            actions = f"sSynth{i:06d}Actions"
+            idle, talk = _native(i, "act_idle"), _native(i, "act_talk")
+            parts.append(
+                f"static void {idle}(void) {{\n"
+                "    if (o->oTimer > 30) {\n"
+                "        o->oAction = 1;\n"
+                "    }\n"
+                f"    {helper}();\n"
+                "}\n\n"
+                f"static void {talk}(void) {{\n"
+                "    if (cur_obj_update_dialog(MARIO_DIALOG_LOOK_FRONT, "
+                f"DIALOG_FLAG_NONE, DIALOG_{rng.randrange(shape.dialogs):03d}, 0)) "
+                "{\n"
+                "        o->oAction = 0;\n"
+                "    }\n"
+                "}\n\n"
+                f"static void (*{actions}[])(void) = {{\n"
+                f"    {idle},\n"
+                f"    {talk},\n"
+                "};\n\n"
+                f"void {_native(i, 'init')}(void) {{\n"
+                f"    cur_obj_set_model({_model(rng.randrange(models))});\n"
+                "}\n\n"
+                f"void {_native(i, 'loop')}(void) {{\n"
+                f"    cur_obj_call_action_function({actions});\n"
+                "}\n\n"
+            )
+        files[f"src/game/behaviors/synth_{f:05d}.inc.c"] = "".join(parts)
+    return files
+
+
+def generate_decomp(
+    root: Path, scale: int = 1, shape: Shape = Shape(), seed: int = 0
+) -> Path:
+    """Write a synthetic decomp tree under ``root`` and return ``root``."""
+    if scale < 1:
+        raise ValueError(f"scale must be at least 1, got {scale}")
+    rng = random.Random(seed)
+    files = _headers(shape, scale)
+    files.update(_level_files(shape, scale, rng))
+    files.update(_behavior_files(shape, scale, rng))
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
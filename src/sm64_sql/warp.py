@@ -1,8 +1,18 @@
-from dataclasses import dataclass
-from pathlib import Path
-from typing import List, Tuple
+"""Warp nodes, instant warps, and the area-level graph they link.
 
-from sm64_sql.parse_utils import extract_macro_args
+``WARP_NODE`` / ``PAINTING_WARP_NODE`` rows send Mario from an area to an area
+of any level (``dest_level`` is a LEVEL_* name); ``INSTANT_WARP`` rows move him
+between areas of his own level. ``warp_graph`` joins the two into one directed
+graph over (level folder, area) and answers reachability for every pair in the
+build, so the playground needs no recursive CTE for it.
+"""
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from sm64_sql.parse_utils import MacroCall
 
 
 @dataclass
@@ -28,62 +38,160 @@ class SM64InstantWarp:
     displace_z: int
 
 
-def parse_warps(path: Path, level: str) -> Tuple[List[SM64Warp], List[SM64InstantWarp]]:
-    """Parse warp commands from a level script.c, tracking the AREA context."""
-    warps: List[SM64Warp] = []
-    instant_warps: List[SM64InstantWarp] = []
-    area = 0
-    for line in path.read_text().splitlines():
-        line = line.strip()
-
-        area_args = extract_macro_args(line, "AREA")
-        if area_args is not None:
-            try:
-                area = int(area_args[0])
-            except ValueError:
-                area = 0
-            continue
-        if line.startswith("END_AREA"):
-            area = 0
+@dataclass
+class SM64WarpClosure:
+    """An area reachable from another through one or more warps."""
+
+    level: str  # source level folder
+    area: int
+    dest_level: str  # destination level folder (resolved from LEVEL_*)
+    dest_area: int
+    hops: int  # fewest warps taken; an area on a cycle reaches itself
+    path_json: str  # the areas visited, [[level, area], ...], source first
+
+
+@dataclass
+class SM64WarpShortestPath:
+    """The warps taken along the fewest-hop route between two areas."""
+
+    level: str  # source level folder
+    area: int
+    dest_level: str  # destination level folder
+    dest_area: int
+    hops: int
+    # One object per warp taken: {"level", "area", "kind", "via", "dest_node"},
+    # kind being warp, painting or instant_warp, and via the WARP_NODE_* id
+    # (or the INSTANT_WARP index) it leaves through.
+    path_json: str
+
+
+@dataclass
+class WarpGraphRows:
+    """Both warp-graph tables, ordered by source then destination."""
+
+    closure: List[SM64WarpClosure] = field(default_factory=list)
+    shortest_paths: List[SM64WarpShortestPath] = field(default_factory=list)
+
+
+WARP_MACROS = ("WARP_NODE", "PAINTING_WARP_NODE")
+
+_Area = Tuple[str, int]
+# (warp kind, node id or instant-warp index, dest_node) of an edge.
+_Via = Tuple[str, Union[str, int], Optional[str]]
+
+
+def warp_from_call(call: MacroCall, level: str, area: int) -> SM64Warp:
+    """The row for a ``WARP_NODE`` or ``PAINTING_WARP_NODE`` in AREA ``area``."""
+    args = call.args
+    if len(args) != 5:
+        raise ValueError(f"Expected 5 args in {call.name}: {call.text}")
+    return SM64Warp(
+        level=level,
+        area=area,
+        node_id=args[0],
+        dest_level=args[1],
+        dest_area=int(args[2]),
+        dest_node=args[3],
+        flags=args[4],
+        is_painting=call.name == "PAINTING_WARP_NODE",
+    )
+
+
+def instant_warp_from_call(call: MacroCall, level: str, area: int) -> SM64InstantWarp:
+    """The row for an ``INSTANT_WARP`` in AREA ``area``."""
+    args = call.args
+    if len(args) != 5:
+        raise ValueError(f"Expected 5 args in INSTANT_WARP: {call.text}")
+    return SM64InstantWarp(
+        level=level,
+        area=area,
+        warp_index=int(args[0]),
+        dest_area=int(args[1]),
+        displace_x=int(args[2]),
+        displace_y=int(args[3]),
+        displace_z=int(args[4]),
+    )
+
+
+def warp_graph(
+    warps: Sequence[SM64Warp],
+    instant_warps: Sequence[SM64InstantWarp],
+    level_folders: Dict[str, str],
+) -> WarpGraphRows:
+    """The closure and shortest-path rows of the area-level warp graph.
+
+    ``level_folders`` maps each LEVEL_* name to its folder; a warp to a level
+    without one (a stub, or an unknown name) leads nowhere and is left out.
+    Each source is searched breadth-first, taking a node's edges in the order
+    given (warps, then instant warps), so ties between equally short routes
+    resolve the same way on every build.
+    """
+    edges: Dict[_Area, List[Tuple[_Area, _Via]]] = {}
+    for warp in warps:
+        folder = level_folders.get(warp.dest_level)
+        if folder is None:
             continue
+        kind = "painting" if warp.is_painting else "warp"
+        edges.setdefault((warp.level, warp.area), []).append(
+            ((folder, warp.dest_area), (kind, warp.node_id, warp.dest_node))
+        )
+    for instant in instant_warps:
+        edges.setdefault((instant.level, instant.area), []).append(
+            (
+                (instant.level, instant.dest_area),
+                ("instant_warp", instant.warp_index, None),
+            )
+        )
 
-        matched = False
-        for macro, is_painting in (("WARP_NODE", False), ("PAINTING_WARP_NODE", True)):
-            args = extract_macro_args(line, macro)
-            if args is None:
-                continue
-            if len(args) != 5:
-                raise ValueError(f"Expected 5 args in {macro}: {line}")
-            warps.append(
-                SM64Warp(
-                    level=level,
-                    area=area,
-                    node_id=args[0],
-                    dest_level=args[1],
-                    dest_area=int(args[2]),
-                    dest_node=args[3],
-                    flags=args[4],
-                    is_painting=is_painting,
+    rows = WarpGraphRows()
+    for source in sorted(edges):
+        # The edge each area was first reached by: (previous area, via).
+        reached: Dict[_Area, Tuple[_Area, _Via]] = {}
+        queue = deque([source])
+        while queue:
+            here = queue.popleft()
+            for there, via in edges.get(here, []):
+                if there not in reached:
+                    reached[there] = (here, via)
+                    queue.append(there)
+        for dest in sorted(reached):
+            steps: List[Tuple[_Area, _Via]] = []
+            here = dest
+            while True:
+                here, via = reached[here]
+                steps.append((here, via))
+                if here == source:
+                    break
+            steps.reverse()
+            areas = [list(area) for area, _via in steps] + [list(dest)]
+            taken = [
+                {
+                    "level": area[0],
+                    "area": area[1],
+                    "kind": kind,
+                    "via": node,
+                    "dest_node": arrive,
+                }
+                for area, (kind, node, arrive) in steps
+            ]
+            rows.closure.append(
+                SM64WarpClosure(
+                    level=source[0],
+                    area=source[1],
+                    dest_level=dest[0],
+                    dest_area=dest[1],
+                    hops=len(steps),
+                    path_json=json.dumps(areas),
                 )
             )
-            matched = True
-            break
-        if matched:
-            continue
-
-        instant_args = extract_macro_args(line, "INSTANT_WARP")
-        if instant_args is not None:
-            if len(instant_args) != 5:
-                raise ValueError(f"Expected 5 args in INSTANT_WARP: {line}")
-            instant_warps.append(
-                SM64InstantWarp(
-                    level=level,
-                    area=area,
-                    warp_index=int(instant_args[0]),
-                    dest_area=int(instant_args[1]),
-                    displace_x=int(instant_args[2]),
-                    displace_y=int(instant_args[3]),
-                    displace_z=int(instant_args[4]),
+            rows.shortest_paths.append(
+                SM64WarpShortestPath(
+                    level=source[0],
+                    area=source[1],
+                    dest_level=dest[0],
+                    dest_area=dest[1],
+                    hops=len(steps),
+                    path_json=json.dumps(taken),
                 )
             )
-    return warps, instant_warps
+    return rows
@@ -0,0 +1,133 @@
+"""Shared fixtures: a tiny on-disk decomp tree that ``parse_repo`` can read.
+
+Each parser has its own unit tests against inline source; this is the smallest
+tree that exercises the *whole* build -- every file ``parse_repo`` requires is
+present, with one or two rows each -- for tests of the build machinery itself
+(scheduling, caching, loading) rather than any one parser.
+"""
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+MINI_DECOMP: Dict[str, str] = {
+    "include/special_presets.h": (
+        "enum SpecialPresets {\n"
+        "    special_null_start,\n"
+        "    special_yellow_coin,\n"
+        "};\n"
+    ),
+    "include/model_ids.h": (
+        "#define MODEL_NONE 0x00\n"
+        "#define MODEL_GOOMBA 0xC0\n"
+        "#define MODEL_YELLOW_COIN 0x74\n"
+    ),
+    "include/macro_presets.h": (
+        "enum MacroPresets {\n"
+        "    macro_yellow_coin,\n"
+        "    macro_goomba,\n"
+        "    macro_count\n"
+        "};\n"
+    ),
+    "include/macro_presets.inc.c": (
+        "struct MacroPreset sMacroObjectPresets[] = {\n"
+        "    { bhvYellowCoin, MODEL_YELLOW_COIN, 0 },\n"
+        "    { bhvGoomba, MODEL_GOOMBA, 0 },\n"
+        "};\n"
+    ),
+    "include/seq_ids.h": "enum SeqId {\n    SEQ_NONE,\n    SEQ_LEVEL_GRASS,\n};\n",
+    "include/behavior_data.h": (
+        "extern const BehaviorScript bhvGoomba[];\n"
+        "extern const BehaviorScript bhvYellowCoin[];\n"
+    ),
+    "include/mario_animation_ids.h": "enum MarioAnimID {\n    MARIO_ANIM_RUN,\n};\n",
+    "include/sounds.h": (
+        "#define SOUND_OBJ_GOOMBA_WALK "
+        "SOUND_ARG_LOAD(SOUND_BANK_OBJ, 0x20, 0xFF, SOUND_DISCRETE) "
+        "/* 0x5020FF81 */\n"
+    ),
+    "levels/level_defines.h": (
+        'DEFINE_LEVEL("BATTLE FIELD", LEVEL_BOB, COURSE_BOB, bob, generic, '
+        "20000, 0x00, 0x00, 0x00, _, _)\n"
+    ),
+    "levels/course_defines.h": "DEFINE_COURSE(COURSE_BOB, 0x44440000) // (1) Bob\n",
+    "levels/bob/script.c": (
+        "static const LevelScript script_func_local_1[] = {\n"
+        "    OBJECT(/*model*/ MODEL_GOOMBA, /*pos*/ 1, 2, 3, /*angle*/ 0, 0, 0, "
+        "/*bhvParam*/ 0, /*bhv*/ bhvGoomba),\n"
+        "    RETURN(),\n"
+        "};\n"
+        "const LevelScript level_bob_entry[] = {\n"
+        "    LOAD_MODEL_FROM_GEO(MODEL_GOOMBA, goomba_geo),\n"
+        "    AREA(/*index*/ 1, bob_geo_000488),\n"
+        "        JUMP_LINK(script_func_local_1),\n"
+        "        WARP_NODE(/*id*/ 0x0A, /*destLevel*/ LEVEL_BOB, /*destArea*/ 1, "
+        "/*destNode*/ 0x0A, /*flags*/ WARP_NO_CHECKPOINT),\n"
+        "        TERRAIN_TYPE(/*terrainType*/ TERRAIN_GRASS),\n"
+        "    END_AREA(),\n"
+        "};\n"
+    ),
+    "levels/bob/areas/1/macro.inc.c": (
+        "const MacroObject bob_seg7_macro_objs[] = {\n"
+        "    MACRO_OBJECT(/*preset*/ macro_yellow_coin, /*yaw*/ 0, "
+        "/*pos*/ 10, 20, 30),\n"
+        "    MACRO_OBJECT_END(),\n"
+        "};\n"
+    ),
+    "levels/bob/areas/1/collision.inc.c": (
+        "const Collision bob_seg7_collision_level[] = {\n"
+        "    COL_INIT(),\n"
+        "    COL_VERTEX_INIT(0x3),\n"
+        "    COL_VERTEX(-100, 0, -100),\n"
+        "    COL_VERTEX(100, 0, -100),\n"
+        "    COL_VERTEX(0, 0, 100),\n"
+        "    COL_TRI_INIT(SURFACE_DEFAULT, 1),\n"
+        "    COL_TRI(0, 2, 1),\n"
+        "    COL_TRI_STOP(),\n"
+        "    COL_SPECIAL_INIT(1),\n"
+        "    SPECIAL_OBJECT(/*preset*/ special_yellow_coin, /*pos*/ 5, 6, 7),\n"
+        "    COL_END(),\n"
+        "};\n"
+    ),
+    "data/behavior_data.c": (
+        "const BehaviorScript bhvGoomba[] = {\n"
+        "    BEGIN(OBJ_LIST_PUSHABLE),\n"
+        "    CALL_NATIVE(bhv_goomba_init),\n"
+        "    BEGIN_LOOP(),\n"
+        "        CALL_NATIVE(bhv_goomba_update),\n"
+        "    END_LOOP(),\n"
+        "};\n"
+        "const BehaviorScript bhvYellowCoin[] = {\n"
+        "    BEGIN(OBJ_LIST_LEVEL),\n"
+        "    SPAWN_CHILD(/*Model*/ MODEL_GOOMBA, /*Behavior*/ bhvGoomba),\n"
+        "    BREAK(),\n"
+        "};\n"
+    ),
+    "src/game/behaviors/goomba.inc.c": (
+        "void goomba_spawn_coin(void) {\n"
+        "    spawn_object(o, MODEL_YELLOW_COIN, bhvYellowCoin);\n"
+        "}\n"
+        "void bhv_goomba_init(void) {\n"
+        "    cur_obj_play_sound_2(SOUND_OBJ_GOOMBA_WALK);\n"
+        "}\n"
+        "void bhv_goomba_update(void) {\n"
+        "    if (o->oHealth == 0) {\n"
+        "        goomba_spawn_coin();\n"
+        "    }\n"
+        "}\n"
+    ),
+}
+
+
+def write_tree(root: Path, files: Dict[str, str]) -> Path:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+@pytest.fixture
+def mini_decomp(tmp_path: Path) -> Path:
+    return write_tree(tmp_path / "sm64", MINI_DECOMP)
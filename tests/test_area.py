@@ -1,4 +1,4 @@
-from sm64_sql.area import parse_areas
+from sm64_sql.level_script import read_level_script
 
 SCRIPT_C = """\
     AREA(/*index*/ 1, bob_geo_000488),
@@ -16,7 +16,7 @@ SCRIPT_C = """\
 def test_parse_areas(tmp_path):
     path = tmp_path / "script.c"
     path.write_text(SCRIPT_C)
-    areas = parse_areas(path, "bob")
+    areas = read_level_script(path, "bob").areas
     by_index = {a.area: a for a in areas}
     assert len(areas) == 2
 
@@ -7,7 +7,8 @@ be exercised without a full checkout.
 from pathlib import Path
 from typing import Dict, List
 
-from sm64_sql.behavior_call import parse_behavior_calls, parse_c_functions
+from sm64_sql.behavior_call import parse_behavior_calls
+from sm64_sql.c_parse import parse_c_functions
 
 
 def _behaviors_dir(tmp_path: Path) -> Path:
@@ -87,10 +88,19 @@ def test_shared_helper_attributed_to_every_caller(tmp_path: Path):
         "void bhv_b_loop(void) { make_respawner(); }\n"
     )
     roots = {"bhv_a_loop": ["bhvA"], "bhv_b_loop": ["bhvB"]}
-    rows = parse_behavior_calls(tmp_path, roots).calls
+    parsed = parse_behavior_calls(tmp_path, roots)
     # The shared helper's spawn is attributed to both behaviors that reach it.
-    respawner = {r.behavior_name for r in rows if r.call == "spawn_object"}
+    respawner = {r.behavior_name for r in parsed.calls if r.call == "spawn_object"}
     assert respawner == {"bhvA", "bhvB"}
+    # ...but the call site itself is stored once.
+    assert [s.function for s in parsed.call_sites if s.call == "spawn_object"] == [
+        "make_respawner"
+    ]
+    assert {
+        (f.behavior_name, f.function)
+        for f in parsed.functions
+        if f.function == "make_respawner"
+    } == {("bhvA", "make_respawner"), ("bhvB", "make_respawner")}
 
 
 def test_external_root_outside_behaviors_dir(tmp_path: Path):
@@ -65,3 +65,18 @@ def test_or_of_symbols_unresolved():
 def test_whitespace_is_normalized():
     p = parse_behavior_param("BPARAM1(0x08)  |   BPARAM2(0xA6)")
     assert p.raw == "BPARAM1(0x08) | BPARAM2(0xA6)"
+
+
+def test_symbols_resolve_the_value_and_every_byte():
+    symbols = {"WARP_NODE_03": 3, "DIALOG_089": 89}
+    p = parse_behavior_param("BPARAM1(0x01) | BPARAM2(WARP_NODE_03)", symbols)
+    assert p.value == (0x01 << 24) | (3 << 16)
+    assert (p.byte1, p.byte2, p.byte3, p.byte4) == (1, 3, 0, 0)
+    # A bare symbol is the whole 32-bit param.
+    assert parse_behavior_param("DIALOG_089", symbols).byte4 == 89
+
+
+def test_resolvable_slots_keep_their_bytes_when_another_is_unknown():
+    p = parse_behavior_param("BPARAM1(0x01) | BPARAM2(WARP_NODE_03)")
+    assert p.value is None
+    assert (p.byte1, p.byte2, p.byte3, p.byte4) == (1, None, None, None)
@@ -0,0 +1,54 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import List
+
+from sm64_sql.build_stats import BuildStat, measure, write_json
+from sm64_sql.db import write_build_stats, write_to_db
+from sm64_sql.everything import BUILD_STAGES, ENTITY_VIEWS, parse_repo
+
+
+def test_measure_counts_reads_under_root_only(tmp_path: Path):
+    (tmp_path / "a.c").write_text("12345")
+    (tmp_path / "b.c").write_bytes(b"123")
+    stats: List[BuildStat] = []
+    with measure("step", "stage", stats, tmp_path) as stat:
+        (tmp_path / "a.c").read_text()
+        with open(tmp_path / "b.c", "rb") as f:
+            f.read()
+        (tmp_path / "out.txt").write_text("written, not read")
+        Path(__file__).read_text()  # outside the root
+        stat.rows = 7
+    assert len(stats) == 1
+    assert (stat.files_read, stat.bytes_read, stat.rows) == (2, 8, 7)
+    assert stat.wall_seconds >= 0 and stat.peak_memory_bytes > 0
+    with measure("off", "stage", None, tmp_path) as off:
+        (tmp_path / "a.c").read_text()
+    assert off.files_read == 0
+
+
+def test_profiled_build_records_every_step(mini_decomp: Path, tmp_path: Path):
+    stats: List[BuildStat] = []
+    everything = parse_repo(mini_decomp, stats=stats)
+    assert everything == parse_repo(mini_decomp)
+    assert [s.step for s in stats] == [stage.name for stage in BUILD_STAGES]
+    by_step = {s.step: s for s in stats}
+    levels = next(stage for stage in BUILD_STAGES if stage.name == "levels")
+    assert by_step["levels"].rows == sum(
+        len(getattr(everything, output)) for output in levels.outputs
+    )
+    assert by_step["behavior_calls"].files_read > 0
+
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, everything, stats=stats)
+    kinds = {s.kind for s in stats}
+    assert kinds == {"stage", "schema", "table", "index", "view"}
+    assert next(s for s in stats if s.step == "object").rows == 1
+    views = [s.step for s in stats if s.kind == "view"]
+    assert views == [name for name, _sql in ENTITY_VIEWS]
+
+    write_build_stats(conn, stats)
+    assert conn.execute("SELECT COUNT(*) FROM build_stats").fetchone() == (len(stats),)
+    write_json(tmp_path / "stats.json", stats)
+    dumped = json.loads((tmp_path / "stats.json").read_text())
+    assert dumped[0]["step"] == BUILD_STAGES[0].name
@@ -0,0 +1,103 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import sm64_sql.behavior_call  # noqa: F401 -- registers the behavior_file extractor
+import sm64_sql.mario_action  # noqa: F401 -- registers the mario_file extractor
+from sm64_sql.c_corpus import CCorpus, corpus, session, use_pool
+
+
+def _write(repo: Path, rel: str, text: str) -> None:
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_each_file_is_parsed_once_for_every_extractor(tmp_path: Path):
+    rel = "src/game/behaviors/goomba.inc.c"
+    _write(tmp_path, rel, "void bhv_goomba_loop(void) { spawn_object(o); }\n")
+    corpus = CCorpus(tmp_path)
+
+    symbols = corpus.facts("c_symbols", rel)
+    assert [s.name for s in symbols] == ["bhv_goomba_loop"]
+    # The behavior facts came out of the same parse and are handed over once.
+    facts = corpus.facts("behavior_file", rel)
+    assert [fn.name for fn in facts.funcs] == ["bhv_goomba_loop"]
+    assert corpus.parses == 1
+    corpus.facts("behavior_file", rel)
+    assert corpus.parses == 2
+
+
+def test_held_facts_are_dropped_when_the_file_changes(tmp_path: Path):
+    rel = "src/game/behaviors/goomba.inc.c"
+    _write(tmp_path, rel, "void old_name(void) {}\n")
+    corpus = CCorpus(tmp_path)
+    corpus.facts("c_symbols", rel)
+    _write(tmp_path, rel, "void new_name(void) {}\n")
+    facts = corpus.facts("behavior_file", rel)
+    assert [fn.name for fn in facts.funcs] == ["new_name"]
+    assert corpus.parses == 2
+
+
+def test_a_file_is_parsed_the_way_its_strictest_extractor_needs(tmp_path: Path):
+    # The #if splits a brace pair, so only the stripped parse keeps both
+    # functions; the symbol index sees the same tree the action walk does.
+    rel = "src/game/mario.c"
+    _write(
+        tmp_path,
+        rel,
+        "void a(void) {\n"
+        "#if ENABLE_RUMBLE\n"
+        "    if (x) {\n"
+        "#endif\n"
+        "        f();\n"
+        "#if ENABLE_RUMBLE\n"
+        "    }\n"
+        "#endif\n"
+        "}\n"
+        "void b(void) {}\n",
+    )
+    corpus = CCorpus(tmp_path)
+    assert [s.name for s in corpus.facts("c_symbols", rel)] == ["a", "b"]
+    assert [fn.name for fn in corpus.facts("mario_file", rel).funcs] == ["a", "b"]
+    assert corpus.parses == 1
+
+
+def test_prefetch_extracts_in_workers_and_hands_over_the_same_facts(tmp_path: Path):
+    rels = [f"src/game/behaviors/b{i}.inc.c" for i in range(4)]
+    for i, rel in enumerate(rels):
+        _write(tmp_path, rel, f"void bhv_{i}_loop(void) {{ spawn_object(o); }}\n")
+    serial = [CCorpus(tmp_path).facts("behavior_file", rel) for rel in rels]
+
+    corpus = CCorpus(tmp_path)
+    with ProcessPoolExecutor(2) as pool, use_pool(pool, 2):
+        corpus.prefetch("behavior_file", rels)
+    assert [corpus.facts("behavior_file", rel) for rel in rels] == serial
+    # The symbols came back from the workers' parses as well.
+    assert [corpus.facts("c_symbols", rel)[0].name for rel in rels] == [
+        f"bhv_{i}_loop" for i in range(4)
+    ]
+    assert corpus.parses == 0
+
+
+def test_a_corpus_extracts_ahead_only_the_kinds_it_is_told(tmp_path: Path):
+    rel = "src/game/behaviors/goomba.inc.c"
+    _write(tmp_path, rel, "void bhv_goomba_loop(void) {}\n")
+    corpus = CCorpus(tmp_path, ahead=("c_symbols",))
+    corpus.facts("c_symbols", rel)
+    corpus.facts("behavior_file", rel)  # not extracted ahead: parsed again
+    assert corpus.parses == 2
+    corpus.facts("c_symbols", rel)  # extracted ahead by that parse
+    assert corpus.parses == 2
+
+
+def test_a_session_scopes_the_corpus_to_one_build(tmp_path: Path):
+    rel = "src/game/behaviors/goomba.inc.c"
+    _write(tmp_path, rel, "void bhv_goomba_loop(void) {}\n")
+    with session(tmp_path, {"behavior_file"}) as build:
+        assert corpus(tmp_path) is build
+        build.facts("c_symbols", rel)
+    # The held behavior facts went with the session.
+    after = corpus(tmp_path)
+    assert after is not build and after is not corpus(tmp_path)
+    after.facts("behavior_file", rel)
+    assert after.parses == 1
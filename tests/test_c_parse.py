@@ -0,0 +1,284 @@
+"""Unit tests for the shared call-graph reachability in c_parse."""
+
+import random
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from sm64_sql.c_parse import (
+    Call,
+    CallGraph,
+    Func,
+    collect_calls,
+    function_name,
+    function_params,
+    functions_from_tree,
+    iter_nodes,
+    parse_source,
+    reachable,
+)
+
+
+def _funcs(graph: Dict[str, List[str]]) -> Dict[str, Func]:
+    return {
+        name: Func(name, "f.c", [Call(callee, [], 1) for callee in callees])
+        for name, callees in graph.items()
+    }
+
+
+def _walk(root: str, graph: Dict[str, List[str]], recursion_set: Set[str]):
+    """The plain per-root DFS the closure must agree with."""
+    seen, stack = {root}, [root]
+    while stack:
+        for callee in graph.get(stack.pop(), ()):
+            if callee in recursion_set and callee not in seen:
+                seen.add(callee)
+                stack.append(callee)
+    return seen
+
+
+def test_cycles_share_a_closure_and_leaves_stop_the_walk():
+    funcs = _funcs(
+        {
+            "root": ["a", "leaf"],
+            "a": ["b"],
+            "b": ["a", "c"],  # a <-> b is one component
+            "c": [],
+            "leaf": ["never"],
+            "outside": ["a"],
+        }
+    )
+    graph = CallGraph(funcs, {"a", "b", "c", "never"})
+    assert graph.reachable("root") == {"root", "a", "b", "c"}
+    assert graph.reachable("a") == graph.reachable("b") == {"a", "b", "c"}
+    # A root outside the recursion set is still an entry point.
+    assert graph.reachable("outside") == {"outside", "a", "b", "c"}
+    assert graph.reachable("unknown") == {"unknown"}
+
+
+def test_dispatch_follows_the_named_action_table():
+    funcs = {
+        "loop": Func(
+            "loop", "f.c", [Call("cur_obj_call_action_function", ["sActions"], 3)]
+        ),
+        "act_a": Func("act_a", "f.c", []),
+        "act_b": Func("act_b", "f.c", [Call("act_a", [], 9)]),
+    }
+    graph = CallGraph(
+        funcs,
+        set(funcs),
+        {"sActions": ["act_b"]},
+        frozenset({"cur_obj_call_action_function"}),
+    )
+    assert graph.reachable("loop") == {"loop", "act_a", "act_b"}
+    assert reachable("loop", funcs, set(funcs)) == {"loop"}
+
+
+def test_matches_a_per_root_walk_on_random_graphs():
+    rng = random.Random(0)
+    for _ in range(20):
+        names = [f"f{i}" for i in range(60)]
+        graph = {
+            name: rng.sample(names, rng.randint(0, 4))
+            for name in names
+            if rng.random() < 0.9
+        }
+        recursion_set = {name for name in names if rng.random() < 0.8}
+        closed = CallGraph(_funcs(graph), recursion_set)
+        for root in names:
+            assert closed.reachable(root) == _walk(root, graph, recursion_set)
+
+
+# The recursive visitor functions_from_tree replaced, kept as the reference the
+# query-based extraction must agree with.
+def _visitor_guard(call_node) -> Optional[str]:
+    child = call_node
+    node = call_node.parent
+    while node is not None:
+        if node.type == "function_definition":
+            return None
+        if node.type == "if_statement":
+            cond = node.child_by_field_name("condition")
+            if cond is not None:
+                text = " ".join(cond.text.decode().split())
+                if text.startswith("(") and text.endswith(")"):
+                    text = text[1:-1].strip()
+                alt = node.child_by_field_name("alternative")
+                in_else = alt is not None and child == alt
+                return f"!({text})" if in_else else text
+        child = node
+        node = node.parent
+    return None
+
+
+def _visitor_calls(body) -> List[Call]:
+    calls: List[Call] = []
+
+    def visit(node) -> None:
+        if node.type == "call_expression":
+            fn = node.child_by_field_name("function")
+            arg_list = node.child_by_field_name("arguments")
+            if fn is not None and fn.type == "identifier" and arg_list is not None:
+                args = [
+                    child.text.decode()
+                    for child in arg_list.named_children
+                    if child.type != "comment"
+                ]
+                calls.append(
+                    Call(
+                        fn.text.decode(),
+                        args,
+                        node.start_point[0] + 1,
+                        _visitor_guard(node),
+                    )
+                )
+        for child in node.children:
+            visit(child)
+
+    visit(body)
+    return calls
+
+
+def _visitor_functions(tree, rel: str) -> List[Func]:
+    funcs: List[Func] = []
+
+    def visit(node) -> None:
+        if node.type == "function_definition":
+            name = function_name(node)
+            body = node.child_by_field_name("body")
+            if name is not None and body is not None:
+                funcs.append(
+                    Func(
+                        name,
+                        rel,
+                        _visitor_calls(body),
+                        function_params(node),
+                        node.start_point[0] + 1,
+                    )
+                )
+            return
+        for child in node.children:
+            visit(child)
+
+    visit(tree.root_node)
+    return funcs
+
+
+_TRICKY = {
+    "else_branches": """
+void f(struct MarioState *m) {
+    if (m->input & INPUT_A_PRESSED) {
+        set_mario_action(m, ACT_JUMP, 0);
+    } else if (m->input & INPUT_B_PRESSED) {
+        set_mario_action(m, ACT_PUNCHING, 0);
+    } else {
+        set_mario_action(m, ACT_IDLE, 0);
+    }
+    if (x) a(); else b();
+    after();
+}
+""",
+    "nested_ifs": """
+void f(void) {
+    if (a) {
+        before();
+        if (b) {
+            inner();
+            if (c) innermost(); else not_c();
+            between();
+        } else {
+            not_b();
+        }
+        after_inner();
+    }
+    if (d)
+        if (e) dangling(); else dangling_else();
+    outside();
+}
+""",
+    "calls_in_conditions": """
+s32 f(s32 x) {
+    if (check(x) && other(g(x))) {
+        hit(x);
+    } else if (again(x)) {
+        miss(h(x), i(x));
+    }
+    while (more(x)) { step(x); }
+    return pick(x) ? yes(x) : no(x);
+}
+""",
+    "pointer_and_cast_calls": """
+void f(struct Object *o, void (*cb)(s32)) {
+    (*cb)(1);
+    cb(2);
+    o->oFunc(3);
+    sTable[o->oAction](o);
+    x = (s32)(y);
+    z = (f32) (w + 1);
+    if (o->oTimer > 5) ((void (*)(void)) ptr)();
+    real(cb(4));
+}
+""",
+    "preprocessor_debris": """
+void f(struct MarioState *m) {
+#if ENABLE_RUMBLE
+    if (m->action & ACT_FLAG_AIR) {
+#endif
+        queue_rumble_data(5, 80);
+#if ENABLE_RUMBLE
+    }
+#endif
+#ifdef VERSION_JP
+    play_sound(SOUND_A, m->marioObj->header.gfx.cameraToObject);
+#else
+    play_sound(SOUND_B, m->marioObj->header.gfx.cameraToObject);
+#endif
+    done(m);
+}
+UNUSED static void g(void) {
+    if (k) { one(); }
+    two(/* comment */ 3, /* another */ 4);
+}
+void h(void) { broken( ; if (z) { three(); } }
+void tail(void) { four(); }
+""",
+    "switches_and_loops": """
+void f(s32 x) {
+    switch (x) {
+        case 0:
+            if (y) zero();
+            break;
+        default:
+            other();
+    }
+    for (i = 0; i < n(); i++) {
+        if (i & 1) odd(i); else even(i);
+    }
+    do { again(); } while (cond());
+}
+""",
+}
+
+
+@pytest.mark.parametrize("stripped", [False, True])
+@pytest.mark.parametrize("name", sorted(_TRICKY))
+def test_query_extraction_matches_the_recursive_visitor(name: str, stripped: bool):
+    tree = parse_source(_TRICKY[name].encode(), stripped)
+    funcs = functions_from_tree(tree, "f.c")
+    assert funcs == _visitor_functions(tree, "f.c")
+    assert funcs and any(func.calls for func in funcs)
+
+
+def test_calls_of_a_nested_body_keep_its_enclosing_guards():
+    tree = parse_source(_TRICKY["nested_ifs"].encode())
+    blocks = list(iter_nodes(tree.root_node, "compound_statement"))
+    assert len(blocks) == 4
+    for block in blocks:
+        assert collect_calls(block) == _visitor_calls(block)
+    calls = functions_from_tree(tree, "f.c")[0].calls
+    guards = {call.callee: call.condition for call in calls}
+    assert guards["between"] == "b"
+    assert guards["not_c"] == "!(c)"
+    assert guards["after_inner"] == "a"
+    assert guards["dangling_else"] == "!(e)"
+    assert guards["outside"] is None
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from sm64_sql.c_parse import parse_source
+from sm64_sql.c_symbol import (
+    SM64CSymbol,
+    index_c_symbols,
+    parse_c_symbols,
+    symbols_from_tree,
+)
+
+
+def _symbols(source: str):
+    return [
+        (s.name, s.kind, s.line)
+        for s in symbols_from_tree(parse_source(source.encode()), "f.c")
+    ]
+
+
+def test_definitions_and_file_scope_arrays_are_listed():
+    source = (
+        "extern s32 gCount[];\n"
+        "void proto(void);\n"
+        "static s16 sTable[] = { 1, 2 };\n"
+        "struct Hitbox *sHitboxes[4];\n"
+        "void (*sActions[])(void) = { act_a, act_b };\n"
+        "s32 plain = 3;\n"
+        "#ifdef VERSION_JP\n"
+        "static void jp_only(void) { static s32 inner[2]; }\n"
+        "#endif\n"
+        "void f(s32 x) {\n"
+        "}\n"
+    )
+    assert _symbols(source) == [
+        ("sTable", "array", 3),
+        ("sHitboxes", "array", 4),
+        ("sActions", "array", 5),
+        ("jp_only", "function", 8),
+        ("f", "function", 10),
+    ]
+
+
+def test_index_maps_names_to_every_definition(tmp_path: Path):
+    for rel in ("src/menu/a.c", "src/game/b.c"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            "static void helper(void) {}\nvoid only_" + path.stem + "(void) {}\n"
+        )
+    index = index_c_symbols(parse_c_symbols(tmp_path))
+    assert [s.file for s in index["helper"]] == ["src/game/b.c", "src/menu/a.c"]
+    assert index["only_a"] == [SM64CSymbol("only_a", "function", "src/menu/a.c", 2)]
+    assert "missing" not in index
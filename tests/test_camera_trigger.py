@@ -9,7 +9,13 @@ be exercised without a full checkout.
 
 from pathlib import Path
 
-from sm64_sql.camera_trigger import parse_camera_triggers
+import numpy as np
+
+from sm64_sql.camera_trigger import (
+    SM64CameraTrigger,
+    parse_camera_triggers,
+    zone_offsets,
+)
 
 # bob -> sCamBOB (wired); sl -> _ (no table). sCamUnused below is referenced by
 # nobody, so it is dead code and must resolve to level = None.
@@ -108,3 +114,28 @@ def test_missing_file_returns_empty(tmp_path: Path):
     (tmp_path / "levels").mkdir()
     (tmp_path / "levels" / "level_defines.h").write_text(_LEVEL_DEFINES)
     assert parse_camera_triggers(tmp_path) == []
+
+
+def test_zone_offsets_undo_the_yaw():
+    # A long thin box turned a quarter turn: its long axis now runs along z.
+    trigger = SM64CameraTrigger(
+        level="bob",
+        camera_table="sCamBOB",
+        seq=0,
+        area=1,
+        event="cam_bob_tower",
+        center_x=1000,
+        center_y=0,
+        center_z=0,
+        bounds_x=100,
+        bounds_y=50,
+        bounds_z=10,
+        bounds_yaw=0x4000,
+        doc=None,
+        file="src/game/camera.c",
+        line=1,
+    )
+    points = np.array([[1005, 0, 90], [1090, 0, 5], [1005, 50, 90]], np.float64)
+    inside, local = zone_offsets(trigger, points)
+    assert inside.tolist() == [True, False, False]  # the last is on the edge
+    assert np.allclose(local[0], [90, 0, -5])
@@ -0,0 +1,79 @@
+import struct
+
+import pytest
+
+from sm64_sql.collision import read_collision
+
+COLLISION_INC_C = """\
+// 0x07002000 - 0x07002100
+const Collision demo_seg7_collision_level[] = {
+    COL_INIT(),
+    COL_VERTEX_INIT(0x4),
+    COL_VERTEX(-100, 0, -100),
+    COL_VERTEX( 100, 0, -100),
+    COL_VERTEX(   0, 50, 100),
+    COL_VERTEX(   0, -20, 0),
+    COL_TRI_INIT(SURFACE_DEFAULT, 2),
+    COL_TRI(0, 2, 1),
+    COL_TRI(0, 3, 1),
+    COL_TRI_INIT(SURFACE_FLOWING_WATER, 1),
+    COL_TRI_SPECIAL(1, 2, 3, 0x40),
+    COL_TRI_STOP(),
+    COL_SPECIAL_INIT(1),
+    SPECIAL_OBJECT(/*preset*/ special_yellow_coin, /*pos*/ 5, 6, 7),
+    COL_END(),
+};
+
+// 0x07002100 - 0x07002140
+const Collision demo_seg7_collision_gate[] = {
+    COL_INIT(),
+    COL_VERTEX_INIT(0x0),
+    COL_TRI_STOP(),
+    COL_END(),
+};
+"""
+
+
+def test_read_collision_packs_vertices_and_triangles(tmp_path):
+    path = tmp_path / "collision.inc.c"
+    path.write_text(COLLISION_INC_C)
+    rows = read_collision(path, "demo", 1, {"special_yellow_coin": 1})
+
+    level, gate = rows.meshes
+    assert level.collision_name == "demo_seg7_collision_level"
+    assert (level.level, level.area) == ("demo", 1)
+    assert (level.vertex_count, level.triangle_count) == (4, 3)
+    assert (level.min_x, level.min_y, level.min_z) == (-100, -20, -100)
+    assert (level.max_x, level.max_y, level.max_z) == (100, 50, 100)
+    assert struct.unpack("<12h", level.vertices) == (
+        -100, 0, -100, 100, 0, -100, 0, 50, 100, 0, -20, 0,
+    )  # fmt: skip
+
+    # One surface row per COL_TRI_INIT group, its indices packed as uint16.
+    default, water = rows.surfaces
+    assert (default.surface_type, default.seq) == ("SURFACE_DEFAULT", 0)
+    assert struct.unpack("<6H", default.triangles) == (0, 2, 1, 0, 3, 1)
+    assert default.params is None
+    assert (water.surface_type, water.seq) == ("SURFACE_FLOWING_WATER", 1)
+    assert struct.unpack("<3H", water.triangles) == (1, 2, 3)
+    assert struct.unpack("<h", water.params or b"") == (0x40,)
+
+    # An array with no geometry still gets a mesh row, without a bounding box.
+    assert (gate.vertex_count, gate.triangle_count, gate.vertices) == (0, 0, b"")
+    assert gate.min_x is None
+
+    # The same read picks up the special objects.
+    [coin] = rows.special_objects
+    assert (coin.preset_id, coin.pos_x, coin.area) == (1, 5, 1)
+
+
+def test_read_collision_rejects_a_triangle_outside_a_surface(tmp_path):
+    path = tmp_path / "collision.inc.c"
+    path.write_text(
+        "const Collision bad[] = {\n"
+        "    COL_VERTEX(0, 0, 0),\n"
+        "    COL_TRI(0, 0, 0),\n"
+        "};\n"
+    )
+    with pytest.raises(ValueError, match="COL_TRI_INIT"):
+        read_collision(path, "demo", 1, {})
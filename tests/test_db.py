@@ -1,16 +1,33 @@
+import dataclasses
+import math
 import sqlite3
+import struct
+
+import pytest
 
 from sm64_sql.area import SM64Area
 from sm64_sql.behavior import SM64Behavior
-from sm64_sql.behavior_call import SM64BehaviorCall, SM64BehaviorDataSpawn
+from sm64_sql.behavior_call import (
+    SM64BehaviorDataSpawn,
+    SM64BehaviorFunction,
+    SM64CCallSite,
+)
 from sm64_sql.behavior_command import SM64BehaviorCommand
+from sm64_sql.c_symbol import SM64CSymbol
 from sm64_sql.camera_trigger import SM64CameraTrigger
+from sm64_sql.collision import SM64CollisionMesh, SM64CollisionSurface
 from sm64_sql.constant import SM64Constant
 from sm64_sql.course import SM64Course
 from sm64_sql.course_text import SM64CourseName, SM64Star
-from sm64_sql.db import write_to_db
+from sm64_sql.db import (
+    index_plan,
+    materialize_views,
+    refresh_materialized_views,
+    view_predicate_columns,
+    write_to_db,
+)
 from sm64_sql.dialog import SM64Dialog
-from sm64_sql.everything import SM64Everything
+from sm64_sql.everything import MATERIALIZABLE_VIEWS, SM64Everything
 from sm64_sql.level import SM64Level
 from sm64_sql.macro_object import SM64MacroObject
 from sm64_sql.macro_preset import SM64MacroPreset
@@ -47,6 +64,10 @@ def _everything():
         bhv_param_2=None,
         bhv_param_3=None,
         bhv_param_4=None,
+        bhv_param_1_value=0,
+        bhv_param_2_value=0,
+        bhv_param_3_value=0,
+        bhv_param_4_value=0,
         behavior="bhvGoomba",
         in_act_1=True,
         in_act_2=False,
@@ -68,6 +89,10 @@ def _everything():
                 pos_z=30,
                 bhv_param="0",
                 bhv_param_value=0,
+                bhv_param_1_value=None,
+                bhv_param_2_value=0,
+                bhv_param_3_value=None,
+                bhv_param_4_value=None,
             )
         ],
         sm64_models=[SM64Model(model_name="MODEL_GOOMBA", model_id=0x54)],
@@ -131,6 +156,38 @@ def _everything():
                 yaw=192,
                 bhv_param="0",
                 bhv_param_value=0,
+                bhv_param_1_value=None,
+                bhv_param_2_value=0,
+                bhv_param_3_value=None,
+                bhv_param_4_value=None,
+            )
+        ],
+        sm64_collision_meshes=[
+            SM64CollisionMesh(
+                collision_name="bob_seg7_collision_level",
+                level="bob",
+                area=1,
+                vertex_count=3,
+                triangle_count=1,
+                min_x=-100,
+                min_y=0,
+                min_z=-100,
+                max_x=100,
+                max_y=0,
+                max_z=100,
+                vertices=struct.pack("<9h", -100, 0, -100, 100, 0, -100, 0, 0, 100),
+            )
+        ],
+        sm64_collision_surfaces=[
+            SM64CollisionSurface(
+                collision_name="bob_seg7_collision_level",
+                seq=0,
+                level="bob",
+                area=1,
+                surface_type="SURFACE_DEFAULT",
+                triangle_count=1,
+                triangles=struct.pack("<3H", 0, 2, 1),
+                params=None,
             )
         ],
         sm64_behaviors=[
@@ -242,9 +299,8 @@ def _everything():
                 args_json='["goomba_seg8_collision"]',
             ),
         ],
-        sm64_behavior_calls=[
-            SM64BehaviorCall(
-                behavior_name="bhvGoomba",
+        sm64_c_call_sites=[
+            SM64CCallSite(
                 function="bhv_goomba_update",
                 seq=0,
                 call="spawn_object",
@@ -253,8 +309,7 @@ def _everything():
                 file="src/game/behaviors/goomba.inc.c",
                 line=120,
             ),
-            SM64BehaviorCall(
-                behavior_name="bhvGoomba",
+            SM64CCallSite(
                 function="bhv_goomba_update",
                 seq=1,
                 call="cur_obj_play_sound_2",
@@ -264,6 +319,11 @@ def _everything():
                 line=121,
             ),
         ],
+        sm64_behavior_functions=[
+            SM64BehaviorFunction(
+                behavior_name="bhvGoomba", function="bhv_goomba_update"
+            ),
+        ],
         sm64_behavior_data_spawns=[
             SM64BehaviorDataSpawn(
                 behavior_name="bhvGoomba",
@@ -411,6 +471,14 @@ def _everything():
                 mask=0x2,
             ),
         ],
+        sm64_c_symbols=[
+            SM64CSymbol(
+                name="bhv_goomba_update",
+                kind="function",
+                file="src/game/behaviors/goomba.inc.c",
+                line=12,
+            ),
+        ],
     )
 
 
@@ -452,6 +520,14 @@ def test_write_to_db_round_trip():
     ).fetchone()
     assert joined == ("MODEL_GOOMBA", 0x54)
 
+    # Collision geometry is stored as BLOBs and comes back byte for byte.
+    vertices, triangles = cur.execute(
+        "SELECT m.vertices, s.triangles FROM collision_mesh m "
+        "JOIN collision_surface s ON s.collision_name = m.collision_name"
+    ).fetchone()
+    assert struct.unpack("<9h", vertices)[3:6] == (100, 0, -100)
+    assert struct.unpack("<3H", triangles) == (0, 2, 1)
+
     # Objects join to the level table on the folder name.
     level_join = cur.execute(
         "SELECT l.internal_name FROM object o " "JOIN level l ON o.level = l.folder"
@@ -527,8 +603,16 @@ def test_write_to_db_round_trip():
     ).fetchone()
     assert resource == ("collision", "goomba_seg8_collision")
 
-    # The behavior_call backbone records native C call sites in order.
-    assert cur.execute("SELECT COUNT(*) FROM behavior_call").fetchone()[0] == 2
+    # The behavior_call view joins each stored call site to the behaviors that
+    # reach its function.
+    assert cur.execute("SELECT COUNT(*) FROM c_call_site").fetchone()[0] == 2
+    assert cur.execute(
+        "SELECT behavior_name, function, seq, call, line FROM behavior_call"
+        " ORDER BY seq"
+    ).fetchall() == [
+        ("bhvGoomba", "bhv_goomba_update", 0, "spawn_object", 120),
+        ("bhvGoomba", "bhv_goomba_update", 1, "cur_obj_play_sound_2", 121),
+    ]
 
     # behavior_calls_spawn classifies the spawn_object call, resolving the
     # spawned model/behavior by argument *pattern* (not position), and joins to
@@ -640,3 +724,327 @@ def test_write_to_db_round_trip():
     ).fetchone()
     assert coverage == (0x200 - 448,)
     conn.close()
+
+
+def test_behavior_call_view_keeps_the_old_table_order():
+    everything = _everything()
+    # A second behavior reaching the goomba's function, inserted first.
+    everything.sm64_behavior_functions.insert(
+        0, SM64BehaviorFunction(behavior_name="bhvZ", function="bhv_goomba_update")
+    )
+    everything.sm64_c_call_sites.reverse()
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, everything)
+    assert conn.execute(
+        "SELECT behavior_name, function, seq FROM behavior_call"
+    ).fetchall() == [
+        ("bhvGoomba", "bhv_goomba_update", 0),
+        ("bhvGoomba", "bhv_goomba_update", 1),
+        ("bhvZ", "bhv_goomba_update", 0),
+        ("bhvZ", "bhv_goomba_update", 1),
+    ]
+    conn.close()
+
+
+def test_spatial_index_covers_placements_and_trigger_boxes():
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, _everything())
+    cur = conn.cursor()
+
+    kinds = dict(
+        cur.execute(
+            "SELECT kind, COUNT(DISTINCT source_rowid) FROM spatial_index GROUP BY kind"
+        )
+    )
+    assert kinds == {
+        "object": 1,
+        "macro_object": 1,
+        "special_object": 1,
+        "camera_trigger": 1,  # the other is in no level
+    }
+
+    # A box query over the cells around the goomba at (1, 2, 3) finds it, and
+    # its rowid leads back to it. The plan searches the primary key.
+    query = (
+        "SELECT o.behavior FROM spatial_index s "
+        "JOIN object o ON s.kind = 'object' AND o.rowid = s.source_rowid "
+        "WHERE s.level = 'bob' AND s.area = 1 "
+        "AND s.cell_x BETWEEN (-10 + 32768) / 1024 AND (10 + 32768) / 1024 "
+        "AND s.cell_z BETWEEN (-10 + 32768) / 1024 AND (10 + 32768) / 1024 "
+        "AND s.min_x <= 10 AND s.max_x >= -10 AND s.min_y <= 10 "
+        "AND s.max_y >= -10 AND s.min_z <= 10 AND s.max_z >= -10"
+    )
+    assert cur.execute(query).fetchall() == [("bhvGoomba",)]
+    plan = " ".join(row[-1] for row in cur.execute("EXPLAIN QUERY PLAN " + query))
+    assert "SEARCH s USING INDEX sqlite_autoindex_spatial_index_1" in plan
+    assert cur.execute(
+        "SELECT cell_x, cell_z FROM spatial_index WHERE kind = 'object'"
+    ).fetchall() == [(32, 32)]
+
+    # The 45-degree trigger covers the extent of its rotated box.
+    min_x, max_x, min_y = cur.execute(
+        "SELECT min_x, max_x, min_y FROM spatial_index "
+        "WHERE kind = 'camera_trigger' AND level = 'bob'"
+    ).fetchone()
+    half_x = (3263 + 3072) * math.sqrt(0.5)
+    assert (min_x, max_x) == pytest.approx((2468 - half_x, 2468 + half_x), abs=1)
+    assert min_y == 2720 - 1696
+    conn.close()
+
+
+def test_placement_surface_rows_join_back_to_their_placement():
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, _everything())
+    rows = conn.execute(
+        "SELECT p.kind, o.behavior, p.floor_y, p.floor_distance "
+        "FROM placement_surface p "
+        "JOIN object o ON p.kind = 'object' AND o.rowid = p.source_rowid"
+    ).fetchall()
+    # The goomba at (1, 2, 3) stands on bob's one triangle, at y = 0.
+    assert rows == [("object", "bhvGoomba", 0.0, 2.0)]
+    assert conn.execute("SELECT COUNT(*) FROM placement_surface").fetchone() == (3,)
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO placement_surface (kind, source_rowid, name, level, area, "
+            "x, y, z) SELECT kind, source_rowid, name, level, area, x, y, z "
+            "FROM placement_surface"
+        )
+    conn.close()
+
+
+def test_camera_trigger_object_lists_the_placements_in_each_zone():
+    everything = _everything()
+    # A trigger turned 45 degrees around the goomba at (1, 2, 3).
+    zone = dataclasses.replace(
+        everything.sm64_camera_triggers[0],
+        seq=1,
+        center_x=0,
+        center_y=0,
+        center_z=0,
+        bounds_x=10,
+        bounds_y=10,
+        bounds_z=10,
+    )
+    everything.sm64_camera_triggers.append(zone)
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, everything)
+
+    rows = conn.execute(
+        "SELECT cto.seq, o.behavior, cto.local_y FROM camera_trigger_object cto "
+        "JOIN object o ON cto.kind = 'object' AND o.rowid = cto.source_rowid"
+    ).fetchall()
+    assert rows == [(1, "bhvGoomba", 2.0)]
+    # Indexed like an entity table: the FK column and the declared specs.
+    assert {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'camera_trigger_object'"
+        )
+    } == {
+        "idx_camera_trigger_object_level",
+        "idx_camera_trigger_object_camera_table_seq",
+        "idx_camera_trigger_object_kind_source_rowid",
+    }
+    conn.close()
+
+
+def test_warp_graph_tables_resolve_levels_through_the_level_table():
+    everything = _everything()
+    castle = dataclasses.replace(
+        everything.sm64_levels[0],
+        level_name="LEVEL_CASTLE",
+        course_name="COURSE_NONE",
+        folder="castle_inside",
+    )
+    everything.sm64_levels.append(castle)
+    back = dataclasses.replace(
+        everything.sm64_warps[0],
+        level="castle_inside",
+        node_id="WARP_NODE_0A",
+        dest_level="LEVEL_BOB",
+        is_painting=True,
+    )
+    everything.sm64_warps.append(back)
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, everything)
+
+    assert conn.execute(
+        "SELECT dest_level, dest_area, hops, path_json FROM warp_closure "
+        "WHERE level = 'bob' AND area = 1 ORDER BY dest_level"
+    ).fetchall() == [
+        ("bob", 1, 2, '[["bob", 1], ["castle_inside", 1], ["bob", 1]]'),
+        ("castle_inside", 1, 1, '[["bob", 1], ["castle_inside", 1]]'),
+    ]
+    (plan,) = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM warp_shortest_path "
+        "WHERE dest_level = 'bob' AND dest_area = 1"
+    ).fetchall()
+    assert "idx_warp_shortest_path_dest_level_dest_area" in plan[-1]
+    conn.close()
+
+
+def test_spawn_closure_is_indexed_both_ways():
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, _everything())
+
+    # The goomba spawns goombas from its script, in C and through a data table.
+    assert conn.execute(
+        "SELECT behavior_name, descendant, depth, origins_json, origin_mix "
+        "FROM behavior_spawn_closure"
+    ).fetchall() == [
+        ("bhvGoomba", "bhvGoomba", 1, '[["script", "c", "data"]]', "script,c,data")
+    ]
+    for column in ("behavior_name", "descendant"):
+        (plan,) = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT depth FROM behavior_spawn_closure "
+            f"WHERE {column} = 'bhvGoomba'"
+        ).fetchall()
+        assert "USING INDEX" in plan[-1] or "USING PRIMARY KEY" in plan[-1]
+    # The (descendant, behavior_name) index covers the descendant FK too.
+    assert conn.execute(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = 'behavior_spawn_closure' "
+        "AND name LIKE 'idx_%'"
+    ).fetchall() == [("idx_behavior_spawn_closure_descendant_behavior_name",)]
+    conn.close()
+
+
+def test_mario_action_step_expands_the_packed_graph():
+    everything = _everything()
+    # A refuted self-transition stays out of the graph.
+    everything.sm64_mario_action_calls.append(
+        dataclasses.replace(
+            everything.sm64_mario_action_calls[0],
+            action_name="ACT_JUMP",
+            seq=2,
+            gated_by="AIR_STEP_LANDED",
+        )
+    )
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, everything)
+
+    assert conn.execute(
+        "SELECT action_name, to_action, steps, via FROM mario_action_step "
+        "ORDER BY action_name, to_action"
+    ).fetchall() == [
+        ("ACT_JUMP", "ACT_JUMP", 2, "ACT_WALKING"),
+        ("ACT_JUMP", "ACT_WALKING", 1, "ACT_JUMP"),
+        ("ACT_WALKING", "ACT_JUMP", 1, "ACT_WALKING"),
+        ("ACT_WALKING", "ACT_WALKING", 2, "ACT_JUMP"),
+    ]
+    assert conn.execute(
+        "SELECT action_name, in_degree, out_degree, scc_size, reach_count "
+        "FROM mario_action_graph ORDER BY ordinal"
+    ).fetchall() == [("ACT_JUMP", 1, 1, 2, 2), ("ACT_WALKING", 1, 1, 2, 2)]
+    # A filter on the target is an index lookup, not a scan.
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT action_name FROM mario_action_step "
+            "WHERE to_action = 'ACT_JUMP' AND steps = 1"
+        )
+    )
+    assert "idx_mario_action_step_to_action_steps" in plan
+    conn.close()
+
+
+def test_bulk_load_matches_default_and_restores_pragmas(tmp_path):
+    plain = sqlite3.connect(":memory:")
+    write_to_db(plain, _everything())
+
+    conn = sqlite3.connect(tmp_path / "bulk.db")
+    before = [
+        conn.execute(f"PRAGMA {p}").fetchone()[0]
+        for p in ("journal_mode", "synchronous", "cache_size")
+    ]
+    loads = write_to_db(conn, _everything(), bulk=True)
+    after = [
+        conn.execute(f"PRAGMA {p}").fetchone()[0]
+        for p in ("journal_mode", "synchronous", "cache_size")
+    ]
+    assert after == before
+
+    # Every table is reported, with its real row count.
+    counts = {load.table: load.rows for load in loads}
+    assert counts["object"] == 1
+    assert counts["behavior_command"] == 5
+    assert all(load.rows_per_second > 0 for load in loads)
+
+    for table in counts:
+        query = f"SELECT * FROM {table} ORDER BY rowid"
+        assert conn.execute(query).fetchall() == plain.execute(query).fetchall()
+
+
+def test_view_predicate_columns_resolve_to_real_table_columns():
+    columns = {
+        "save_struct": {"struct_name", "size"},
+        "save_field": {"struct_name", "seq", "field_name"},
+        "behavior_call": {"call", "args_json"},
+    }
+    sql = """
+        SELECT s.struct_name, (SELECT value FROM json_each(args_json)
+                               WHERE value GLOB 'bhv*') AS b
+        FROM save_struct s
+        LEFT JOIN save_field f ON f.struct_name = s.struct_name
+        WHERE size > 0 AND field_name IS NOT NULL
+    """
+    assert view_predicate_columns(sql, columns) == {
+        ("save_struct", "struct_name"),
+        ("save_field", "struct_name"),
+        ("save_struct", "size"),
+        ("save_field", "field_name"),
+    }
+
+
+def test_indexes_cover_foreign_keys_views_and_declared_specs():
+    plan = set(index_plan())
+    assert ("macro_object", ("macro_name",)) in plan  # FK
+    assert ("c_call_site", ("call",)) in plan  # filtered by behavior_calls_* views
+    assert ("behavior_function", ("function",)) in plan  # their join
+    assert ("object", ("level", "area")) in plan  # declared in TABLE_KEYS
+    for table in ("object", "macro_object", "special_object"):
+        assert (table, ("bhv_param_2_value",)) in plan
+    # object.level is served by the wider (level, area) index; a FK onto a
+    # primary key column needs nothing extra.
+    assert ("object", ("level",)) not in plan
+    assert not any(table == "course_name" for table, _cols in plan)
+
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, _everything())
+    names = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert "idx_c_call_site_call" in names
+    query_plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM c_call_site WHERE call = 'x'"
+        )
+    )
+    assert "idx_c_call_site_call" in query_plan
+
+
+def test_materialized_views_match_the_views_and_refresh():
+    view = sqlite3.connect(":memory:")
+    write_to_db(view, _everything())
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, _everything())
+    materialize_views(conn)
+
+    kinds = dict(conn.execute("SELECT name, type FROM sqlite_master"))
+    for name in MATERIALIZABLE_VIEWS:
+        assert kinds[name] == "table"
+        query = f"SELECT * FROM {name} ORDER BY 1, 2"
+        assert conn.execute(query).fetchall() == view.execute(query).fetchall()
+    assert kinds["idx_behavior_calls_spawn_spawned_behavior"] == "index"
+    recorded = dict(conn.execute("SELECT name, sql FROM materialized_view"))
+    assert set(recorded) == set(MATERIALIZABLE_VIEWS)
+    assert recorded["behavior_calls_spawn"].startswith(
+        "CREATE VIEW behavior_calls_spawn AS"
+    )
+
+    conn.execute("DELETE FROM c_call_site")
+    refresh_materialized_views(conn)
+    assert conn.execute("SELECT COUNT(*) FROM behavior_calls_spawn").fetchone() == (0,)
@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from sm64_sql import c_parse, extract_cache
+from sm64_sql.everything import parse_repo
+from sm64_sql.extract_cache import ExtractionCache, cached
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[ExtractionCache]:
+    cache = ExtractionCache(tmp_path / "cache")
+    extract_cache.activate(cache)
+    yield cache
+    extract_cache.activate(None)
+
+
+def test_cached_without_a_cache_just_computes():
+    assert cached("kind", b"src", "a.c", lambda: 42) == 42
+
+
+def test_key_covers_content_path_and_kind(tmp_path: Path):
+    cache = ExtractionCache(tmp_path)
+    assert cache.get_or_compute("k", b"one", "a.c", lambda: 1) == 1
+    assert cache.get_or_compute("k", b"one", "a.c", lambda: 99) == 1
+    assert cache.get_or_compute("k", b"two", "a.c", lambda: 2) == 2
+    assert cache.get_or_compute("k", b"one", "b.c", lambda: 3) == 3
+    assert cache.get_or_compute("other", b"one", "a.c", lambda: 4) == 4
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_corrupt_entry_is_a_miss_and_clear_empties(tmp_path: Path):
+    cache = ExtractionCache(tmp_path / "cache")
+    cache.get_or_compute("k", b"src", "a.c", lambda: [1, 2])
+    (entry,) = (tmp_path / "cache").rglob("*.pickle")
+    entry.write_bytes(b"\x80 not a pickle")
+    assert cache.get_or_compute("k", b"src", "a.c", lambda: [3]) == [3]
+    assert cache.get_or_compute("k", b"src", "a.c", lambda: [4]) == [3]
+    cache.clear()
+    assert not (tmp_path / "cache").exists()
+
+
+def test_warm_build_skips_tree_sitter(
+    mini_decomp: Path, cache: ExtractionCache, monkeypatch: pytest.MonkeyPatch
+):
+    extract_cache.activate(None)
+    uncached = parse_repo(mini_decomp)
+    extract_cache.activate(cache)
+    cold = parse_repo(mini_decomp)
+    assert cache.hits == 0 and cache.misses > 0
+    misses = cache.misses
+
+    def no_parsing():
+        raise AssertionError("tree-sitter ran on a warm build")
+
+    monkeypatch.setattr(c_parse, "get_parser", no_parsing)
+    warm = parse_repo(mini_decomp)
+    assert (cache.hits, cache.misses) == (misses, misses)
+    assert uncached == cold == warm
+
+
+def test_pool_workers_share_the_cache_and_counters(
+    mini_decomp: Path, cache: ExtractionCache
+):
+    serial = parse_repo(mini_decomp)
+    misses = cache.misses
+    assert parse_repo(mini_decomp, jobs=2) == serial
+    assert (cache.hits, cache.misses) == (misses, misses)
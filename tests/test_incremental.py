@@ -0,0 +1,123 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from sm64_sql.db import stream_to_db, write_to_db
+from sm64_sql.everything import ENTITY_TABLES, parse_repo, stream_repo
+from sm64_sql.incremental import load_manifest, update_db, write_manifest
+from conftest import write_tree
+
+_SECOND_LEVEL = {
+    "levels/wf/script.c": (
+        "const LevelScript level_wf_entry[] = {\n"
+        "    AREA(/*index*/ 1, wf_geo_0009B8),\n"
+        "        OBJECT(/*model*/ MODEL_GOOMBA, /*pos*/ 7, 8, 9, /*angle*/ 0, 0, 0, "
+        "/*bhvParam*/ 0, /*bhv*/ bhvGoomba),\n"
+        "    END_AREA(),\n"
+        "};\n"
+    ),
+}
+
+
+def _build(repo: Path, db: Path) -> sqlite3.Connection:
+    everything = parse_repo(repo)
+    conn = sqlite3.connect(db)
+    write_to_db(conn, everything)
+    write_manifest(conn, repo, everything)
+    return conn
+
+
+def _dump(conn: sqlite3.Connection) -> Dict[str, List[tuple]]:
+    # Incremental updates append, so compare tables as sorted multisets.
+    return {
+        table: sorted(
+            conn.execute(f"SELECT * FROM {table}").fetchall(),
+            key=lambda row: tuple(str(v) for v in row),
+        )
+        for table, _row_type, _attr in ENTITY_TABLES
+    }
+
+
+def _assert_matches_full_build(conn: sqlite3.Connection, repo: Path, tmp_path: Path):
+    fresh = _build(repo, tmp_path / "fresh.db")
+    assert _dump(conn) == _dump(fresh)
+    fresh.close()
+
+
+@pytest.fixture
+def repo(mini_decomp: Path) -> Path:
+    return write_tree(mini_decomp, _SECOND_LEVEL)
+
+
+def test_manifest_records_sources_and_row_counts(repo: Path, tmp_path: Path):
+    conn = _build(repo, tmp_path / "sm64.db")
+    manifest = load_manifest(conn)
+    entry = manifest[("levels/bob/script.c", "levels")]
+    assert entry.partition_key == "bob"
+    assert entry.size == (repo / "levels/bob/script.c").stat().st_size
+    assert json.loads(entry.rows_json)["object"] == 1
+    # behavior_data.c feeds two stages and is recorded for each.
+    assert ("data/behavior_data.c", "behaviors") in manifest
+    assert ("data/behavior_data.c", "behavior_commands") in manifest
+
+
+def test_unchanged_tree_rebuilds_nothing(repo: Path, tmp_path: Path):
+    conn = _build(repo, tmp_path / "sm64.db")
+    # Touching a file changes its mtime but not its hash.
+    (repo / "levels/bob/script.c").touch()
+    assert update_db(conn, repo) == []
+
+
+def test_level_edit_replaces_only_that_level(repo: Path, tmp_path: Path):
+    conn = _build(repo, tmp_path / "sm64.db")
+    script = repo / "levels/bob/script.c"
+    script.write_text(
+        script.read_text().replace("/*pos*/ 1, 2, 3", "/*pos*/ 100, 2, 3")
+    )
+    assert update_db(conn, repo) == ["levels[bob]"]
+    assert conn.execute(
+        "SELECT level, initial_x FROM object ORDER BY level"
+    ).fetchall() == [("bob", 100), ("wf", 7)]
+    _assert_matches_full_build(conn, repo, tmp_path)
+
+
+def test_deleted_level_drops_its_rows(repo: Path, tmp_path: Path):
+    conn = _build(repo, tmp_path / "sm64.db")
+    (repo / "levels/wf/script.c").unlink()
+    assert update_db(conn, repo) == ["levels[wf]"]
+    assert conn.execute("SELECT level FROM object").fetchall() == [("bob",)]
+    assert ("levels/wf/script.c", "levels") not in load_manifest(conn)
+
+
+def test_upstream_change_reruns_dependents(repo: Path, tmp_path: Path):
+    conn = _build(repo, tmp_path / "sm64.db")
+    behavior_data = repo / "data/behavior_data.c"
+    behavior_data.write_text(
+        behavior_data.read_text().replace("CALL_NATIVE(bhv_goomba_init),\n", "")
+    )
+    # behavior_calls consumes the CALL_NATIVE roots, so it re-runs too.
+    assert update_db(conn, repo) == [
+        "behavior_commands",
+        "behavior_calls",
+        "behaviors",
+    ]
+    assert conn.execute(
+        "SELECT DISTINCT function FROM behavior_call ORDER BY function"
+    ).fetchall() == [("bhv_goomba_update",), ("goomba_spawn_coin",)]
+    _assert_matches_full_build(conn, repo, tmp_path)
+
+
+def test_streamed_build_matches_list_build(repo: Path, tmp_path: Path):
+    listed = _build(repo, tmp_path / "listed.db")
+    streamed = sqlite3.connect(tmp_path / "streamed.db")
+    loads = stream_to_db(streamed, stream_repo(repo), bulk=True)
+    write_manifest(streamed, repo)  # row counts read back from the tables
+    assert [load.table for load in loads] == [t for t, _r, _a in ENTITY_TABLES]
+    for table, _row_type, _attr in ENTITY_TABLES:
+        query = f"SELECT * FROM {table} ORDER BY rowid"
+        assert streamed.execute(query).fetchall() == listed.execute(query).fetchall()
+    rows = {k: e.rows_json for k, e in load_manifest(listed).items()}
+    assert {k: e.rows_json for k, e in load_manifest(streamed).items()} == rows
@@ -7,10 +7,12 @@ n64decomp/sm64 checkout to enable these tests; otherwise they are skipped.
 import json
 import os
 import sqlite3
+import struct
 from pathlib import Path
 
 import pytest
 
+from sm64_sql.behavior_call import ParsedBehaviorCode
 from sm64_sql.db import write_to_db
 from sm64_sql.everything import parse_repo
 
@@ -59,6 +61,7 @@ def test_parse_repo_finds_entities(everything):
     assert len(everything.sm64_save_structs) > 0
     assert len(everything.sm64_save_fields) > 0
     assert len(everything.sm64_save_flags) > 0
+    assert len(everything.sm64_c_symbols) > 0
 
 
 def test_sounds_have_banks(everything):
@@ -104,6 +107,25 @@ def test_special_objects_reference_known_presets(everything):
     assert all(o.area >= 1 for o in everything.sm64_special_objects)
 
 
+def test_collision_meshes_index_their_own_vertices(everything):
+    meshes = {m.collision_name: m for m in everything.sm64_collision_meshes}
+    assert "bob_seg7_collision_level" in meshes
+    assert meshes["bob_seg7_collision_level"].triangle_count > 1000
+    for surface in everything.sm64_collision_surfaces:
+        mesh = meshes[surface.collision_name]
+        indices = struct.unpack(f"<{3 * surface.triangle_count}H", surface.triangles)
+        assert max(indices) < mesh.vertex_count
+
+
+def test_most_placements_stand_on_a_floor(conn):
+    surfaces = conn.execute(
+        "SELECT floor_y, floor_distance FROM placement_surface WHERE area >= 1"
+    ).fetchall()
+    with_floor = [r for r in surfaces if r[0] is not None]
+    assert len(with_floor) > 0.9 * len(surfaces)
+    assert all(distance >= -78 for _floor_y, distance in with_floor)
+
+
 def test_dialogs_have_text(everything):
     # Dialog text should be non-empty and ids should be unique.
     assert all(d.text for d in everything.sm64_dialogs)
@@ -219,11 +241,15 @@ def test_behavior_params_are_captured(everything):
     objects = everything.sm64_objects
     # Every object records its behavior-param expression (defaults to "0").
     assert all(o.bhv_param for o in objects)
-    # Real data has a mix: many non-zero params, some numerically resolved and
-    # some left symbolic (NULL value) because they reference a #define.
+    # Real data has many non-zero params, and the symbolic ones resolve through
+    # the header symbols: a warp node in the 2nd byte gets its number.
     assert any(o.bhv_param != "0" for o in objects)
     assert any(o.bhv_param_value is not None for o in objects)
-    assert any(o.bhv_param_value is None for o in objects)
+    assert any(
+        (o.bhv_param_2 or "").startswith("WARP_NODE_")
+        and o.bhv_param_2_value is not None
+        for o in objects
+    )
     # Warp objects expose their destination warp node in the 2nd byte (BPARAM2).
     assert any(
         o.bhv_param_2 and o.bhv_param_2.startswith("WARP_NODE_") for o in objects
@@ -274,6 +300,63 @@ def test_behavior_commands_backbone(everything):
     )
 
 
+def test_spatial_index_covers_every_placement(conn):
+    cur = conn.cursor()
+    placed = sum(
+        cur.execute(f"SELECT COUNT(*) FROM {table} WHERE {in_level}").fetchone()[0]
+        for table, in_level in (
+            ("object", "1"),
+            ("macro_object", "1"),
+            ("special_object", "1"),
+            ("camera_trigger", "level IS NOT NULL"),
+        )
+    )
+    indexed = cur.execute(
+        "SELECT COUNT(*) FROM (SELECT DISTINCT kind, source_rowid FROM spatial_index)"
+    ).fetchone()[0]
+    assert indexed == placed
+
+
+def test_camera_zones_contain_placements(conn):
+    # Every wired table's zones sit over their level, so some hold objects.
+    zones = conn.execute(
+        "SELECT COUNT(DISTINCT camera_table || ':' || seq) FROM camera_trigger_object"
+    ).fetchone()[0]
+    assert zones > 10
+
+
+def test_warp_graph_reaches_the_courses_from_the_grounds(conn):
+    # Through the castle door, then a painting.
+    hops, path = conn.execute(
+        "SELECT hops, path_json FROM warp_closure WHERE level = 'castle_grounds' "
+        "AND area = 1 AND dest_level = 'bob' AND dest_area = 1"
+    ).fetchone()
+    assert hops == 2
+    assert json.loads(path)[1] == ["castle_inside", 1]
+    courses = conn.execute(
+        "SELECT COUNT(DISTINCT dest_level) FROM warp_shortest_path "
+        "WHERE level = 'castle_grounds' AND area = 1"
+    ).fetchone()[0]
+    assert courses > 20
+
+
+def test_spawn_closure_over_real_data(conn):
+    # The Bob-omb's explosion is a C spawn, one step away.
+    row = conn.execute(
+        "SELECT depth, origin_mix FROM behavior_spawn_closure "
+        "WHERE behavior_name = 'bhvBobomb' AND descendant = 'bhvExplosion'"
+    ).fetchone()
+    assert row is not None and row[0] == 1 and "c" in row[1].split(",")
+    # Every direct spawn is in the closure at depth 1.
+    missing = conn.execute(
+        "SELECT COUNT(*) FROM behavior_all_spawns s WHERE NOT EXISTS ("
+        "SELECT 1 FROM behavior_spawn_closure c WHERE c.depth = 1 "
+        "AND c.behavior_name = s.behavior_name "
+        "AND c.descendant = s.spawned_behavior) AND s.spawned_behavior IS NOT NULL"
+    ).fetchone()[0]
+    assert missing == 0
+
+
 def test_behavior_views_over_real_data(conn):
     cur = conn.cursor()
 
@@ -314,7 +397,9 @@ def test_behavior_views_over_real_data(conn):
 
 
 def test_behavior_call_backbone(everything):
-    calls = everything.sm64_behavior_calls
+    calls = ParsedBehaviorCode(
+        everything.sm64_c_call_sites, everything.sm64_behavior_functions, []
+    ).calls
     # Hundreds of behaviors, thousands of native call sites.
     assert len(calls) > 3000
     assert len({c.behavior_name for c in calls}) > 300
@@ -492,8 +577,8 @@ def test_resolved_param_value_packs_the_bytes(everything):
     # BPARAM1 -> bits 24-31, BPARAM2 -> bits 16-23.
     for o in everything.sm64_objects:
         if o.bhv_param_1 and o.bhv_param_2 and o.bhv_param_value is not None:
-            assert (o.bhv_param_value >> 24) & 0xFF == int(o.bhv_param_1, 0) & 0xFF
-            assert (o.bhv_param_value >> 16) & 0xFF == int(o.bhv_param_2, 0) & 0xFF
+            assert (o.bhv_param_value >> 24) & 0xFF == o.bhv_param_1_value
+            assert (o.bhv_param_value >> 16) & 0xFF == o.bhv_param_2_value
             break
     else:
         raise AssertionError("expected a fully-numeric two-byte param to exist")
@@ -598,6 +683,33 @@ def test_mario_transitions_over_real_data(conn):
     )
 
 
+def test_mario_action_graph_over_real_data(conn):
+    # Every direct transition is a one-step pair, and nothing else is.
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM mario_action_step WHERE steps = 1"
+        ).fetchone()[0]
+        == conn.execute(
+            "SELECT COUNT(*) FROM mario_all_transitions "
+            "WHERE to_action IN (SELECT action_name FROM mario_action)"
+        ).fetchone()[0]
+    )
+    # Idle and walking lead back to each other: one component.
+    idle, walking = conn.execute(
+        "SELECT scc FROM mario_action_graph "
+        "WHERE action_name IN ('ACT_IDLE', 'ACT_WALKING') ORDER BY action_name"
+    ).fetchall()
+    assert idle == walking
+    # A shortest path is one step longer than the path to its via.
+    (bad,) = conn.execute(
+        "SELECT COUNT(*) FROM mario_action_step s "
+        "JOIN mario_action_step p ON p.action_name = s.action_name "
+        "AND p.to_action = s.via "
+        "WHERE s.steps > 1 AND p.steps != s.steps - 1"
+    ).fetchone()
+    assert bad == 0
+
+
 def test_mario_flag_gated_edges_refuted(conn):
     """Air actions reach common_air_action_step's ceiling/ledge cases in the call
     graph, but only callers that pass the stepArg flag can actually trigger them.
@@ -959,3 +1071,12 @@ def test_save_field_struct_refs_resolve(conn):
         "WHERE f.is_struct = 1 AND s.struct_name IS NULL"
     ).fetchone()[0]
     assert dangling == 0
+
+
+def test_c_symbols_locate_external_native_roots(conn):
+    # The act selector's loop is a CALL_NATIVE root defined in src/menu/, found
+    # through the symbol index rather than a scan of src/.
+    rows = conn.execute(
+        "SELECT kind, file FROM c_symbol WHERE name = 'bhv_act_selector_loop'"
+    ).fetchall()
+    assert rows == [("function", "src/menu/star_select.c")]
@@ -0,0 +1,68 @@
+from sm64_sql.level_script import read_level_script
+
+
+def test_objects_get_their_area_via_jump_link(tmp_path):
+    # Objects defined in a local array get the area of the AREA block that
+    # JUMP_LINKs that array; objects directly inside an AREA get that area; ones
+    # reachable from no area stay 0.
+    script = """\
+static const LevelScript script_func_local_1[] = {
+    OBJECT(/*model*/ MODEL_A, /*pos*/ 0, 0, 0, /*angle*/ 0, 0, 0, /*bhvParam*/ 0, /*bhv*/ bhvA),
+};
+static const LevelScript script_func_local_2[] = {
+    OBJECT(/*model*/ MODEL_B, /*pos*/ 0, 0, 0, /*angle*/ 0, 0, 0, /*bhvParam*/ 0, /*bhv*/ bhvB),
+};
+static const LevelScript script_func_global_1[] = {
+    OBJECT(/*model*/ MODEL_G, /*pos*/ 0, 0, 0, /*angle*/ 0, 0, 0, /*bhvParam*/ 0, /*bhv*/ bhvG),
+};
+const LevelScript level_demo_entry[] = {
+    JUMP_LINK(script_func_global_1),
+    AREA(/*index*/ 1, demo_geo_1),
+        JUMP_LINK(script_func_local_1),
+        OBJECT(/*model*/ MODEL_D, /*pos*/ 0, 0, 0, /*angle*/ 0, 0, 0, /*bhvParam*/ 0, /*bhv*/ bhvD),
+    END_AREA(),
+    AREA(/*index*/ 2, demo_geo_2),
+        JUMP_LINK(script_func_local_2),
+    END_AREA(),
+};
+"""
+    level_dir = tmp_path / "demo"
+    level_dir.mkdir()
+    (level_dir / "script.c").write_text(script)
+
+    objects = read_level_script(level_dir / "script.c", "demo").objects
+    area_by_model = {o.model_name: o.area for o in objects}
+    assert area_by_model == {
+        "MODEL_A": 1,  # via JUMP_LINK(script_func_local_1) from AREA 1
+        "MODEL_D": 1,  # directly inside AREA 1
+        "MODEL_B": 2,  # via JUMP_LINK(script_func_local_2) from AREA 2
+        "MODEL_G": 0,  # global script, not linked from any area
+    }
+
+
+def test_one_read_fills_every_table_from_the_same_area_context(tmp_path):
+    path = tmp_path / "script.c"
+    path.write_text(
+        "const LevelScript level_demo_entry[] = {\n"
+        "    LOAD_MODEL_FROM_GEO(MODEL_TREE, tree_geo),\n"
+        "    AREA(/*index*/ 3, demo_geo_3),\n"
+        "        OBJECT(MODEL_NONE, 0, 0, 0, 0, 0, 0, 0, bhvWarp),\n"
+        "        WARP_NODE(WARP_NODE_0A, LEVEL_DEMO, 3, WARP_NODE_0A, 0),\n"
+        "        INSTANT_WARP(0, 1, 0, 0, 0),\n"
+        "        TERRAIN_TYPE(TERRAIN_SNOW),\n"
+        "    END_AREA(),\n"
+        "    WARP_NODE(WARP_NODE_F0, LEVEL_CASTLE, 1, WARP_NODE_26, 0),\n"
+        "    RETURN(),\n"
+        "};\n"
+    )
+    rows = read_level_script(path, "demo")
+    assert [(o.behavior, o.area) for o in rows.objects] == [("bhvWarp", 3)]
+    assert [(w.node_id, w.area) for w in rows.warps] == [
+        ("WARP_NODE_0A", 3),
+        ("WARP_NODE_F0", 0),  # after END_AREA: level-global
+    ]
+    assert [w.area for w in rows.instant_warps] == [3]
+    assert [(a.area, a.terrain_type) for a in rows.areas] == [(3, "TERRAIN_SNOW")]
+    assert [(m.model_name, m.level) for m in rows.model_loads] == [
+        ("MODEL_TREE", "demo")
+    ]
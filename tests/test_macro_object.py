@@ -1,3 +1,4 @@
+from sm64_sql.behavior_param import PLACEMENT_PARAM_BYTE, resolve_bhv_params
 from sm64_sql.macro_object import try_parse_macro_object
 
 
@@ -26,6 +27,12 @@ def test_parse_macro_object_with_bhv_param():
     assert (obj.pos_x, obj.pos_y, obj.pos_z) == (-250, 2650, 2400)
     assert obj.bhv_param == "2"
     assert obj.bhv_param_value == 2
+    assert (
+        obj.bhv_param_1_value,
+        obj.bhv_param_2_value,
+        obj.bhv_param_3_value,
+        obj.bhv_param_4_value,
+    ) == (None, 2, None, None)
 
 
 def test_parse_macro_object_with_symbolic_bhv_param():
@@ -34,6 +41,16 @@ def test_parse_macro_object_with_symbolic_bhv_param():
     assert obj is not None
     assert obj.bhv_param == "DIALOG_089"
     assert obj.bhv_param_value is None
+    assert obj.bhv_param_2_value is None
+    # The build resolves it once the headers' symbols are known. The game
+    # spawns a macro's param into the 2nd byte (oBhvParams2ndByte).
+    resolve_bhv_params([obj], {"DIALOG_089": 89}, PLACEMENT_PARAM_BYTE)
+    assert (
+        obj.bhv_param_value,
+        obj.bhv_param_1_value,
+        obj.bhv_param_2_value,
+        obj.bhv_param_4_value,
+    ) == (89, None, 89, None)
 
 
 def test_parse_macro_object_records_area():
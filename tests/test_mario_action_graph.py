@@ -0,0 +1,57 @@
+import struct
+
+from sm64_sql.mario_action_graph import (
+    UNREACHABLE,
+    SM64MarioActionStep,
+    mario_action_graph,
+    mario_action_steps,
+)
+
+
+def test_graph_rows_pack_reach_steps_and_via():
+    rows = mario_action_graph(
+        ["ACT_IDLE", "ACT_WALKING", "ACT_JUMP", "ACT_FREEFALL", "ACT_DEBUG"],
+        [
+            ("ACT_IDLE", "ACT_WALKING"),
+            ("ACT_WALKING", "ACT_IDLE"),
+            ("ACT_WALKING", "ACT_JUMP"),
+            ("ACT_JUMP", "ACT_FREEFALL"),
+            ("ACT_FREEFALL", "ACT_FREEFALL"),
+            ("ACT_IDLE", "ACT_UNKNOWN"),  # not an action: ignored
+        ],
+    )
+    by_name = {row.action_name: row for row in rows}
+    # Ordinals follow name order.
+    assert [row.action_name for row in rows] == sorted(by_name)
+    ordinal = {name: row.ordinal for name, row in by_name.items()}
+
+    idle = by_name["ACT_IDLE"]
+    assert (idle.in_degree, idle.out_degree, idle.reach_count) == (1, 1, 4)
+    assert int.from_bytes(idle.reach, "little") == sum(
+        1 << ordinal[name]
+        for name in ("ACT_IDLE", "ACT_WALKING", "ACT_JUMP", "ACT_FREEFALL")
+    )
+    assert idle.steps[ordinal["ACT_FREEFALL"]] == 3
+    assert idle.steps[ordinal["ACT_IDLE"]] == 2  # round trip through walking
+    assert idle.steps[ordinal["ACT_DEBUG"]] == 0
+    via = struct.unpack(f"<{len(rows)}H", idle.via)
+    assert via[ordinal["ACT_FREEFALL"]] == ordinal["ACT_JUMP"]
+    assert via[ordinal["ACT_DEBUG"]] == UNREACHABLE
+
+    # Idle and walking share a component; the loop on freefall is its own.
+    assert by_name["ACT_WALKING"].scc == idle.scc and idle.scc_size == 2
+    freefall = by_name["ACT_FREEFALL"]
+    assert (freefall.scc_size, freefall.reach_count) == (1, 1)
+    assert idle.scc < by_name["ACT_JUMP"].scc < freefall.scc
+    assert by_name["ACT_DEBUG"].reach_count == 0
+
+
+def test_steps_unpack_every_reachable_pair():
+    graph = mario_action_graph(
+        ["ACT_A", "ACT_B", "ACT_C"], [("ACT_A", "ACT_B"), ("ACT_B", "ACT_C")]
+    )
+    assert list(mario_action_steps(graph)) == [
+        SM64MarioActionStep("ACT_A", "ACT_B", 1, "ACT_A"),
+        SM64MarioActionStep("ACT_A", "ACT_C", 2, "ACT_B"),
+        SM64MarioActionStep("ACT_B", "ACT_C", 1, "ACT_B"),
+    ]
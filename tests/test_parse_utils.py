@@ -2,6 +2,7 @@ from sm64_sql.parse_utils import (
     evaluate_int,
     extract_call,
     extract_macro_args,
+    iter_macro_calls,
     parse_c_defines,
     parse_c_enum,
     split_top_level,
@@ -66,6 +67,10 @@ def test_split_top_level_no_separator():
     assert split_top_level("BPARAM1(0) | BPARAM2(1)") == ["BPARAM1(0) | BPARAM2(1)"]
 
 
+def test_split_top_level_unbalanced_closer_does_not_go_negative():
+    assert split_top_level("a), b, (c, d") == ["a)", " b", " (c, d"]
+
+
 def test_strip_block_comments_keeps_surrounding_text():
     assert strip_block_comments("a /*x*/ b /*y*/ c") == "a  b  c"
 
@@ -187,3 +192,35 @@ def test_parse_c_defines_basic_and_references():
 def test_parse_c_defines_joins_continued_lines():
     text = "#define MASK (1 \\\n    | 2 \\\n    | 4)\n"
     assert parse_c_defines(text) == [("MASK", 7)]
+
+
+def test_iter_macro_calls_reads_a_whole_file_with_line_numbers():
+    text = (
+        "const LevelScript level_bob_entry[] = {\n"
+        "    AREA(/*index*/ 1, bob_geo_000488),\n"
+        "        OBJECT (/*model*/ MODEL_NONE, /*bhvParam*/ BPARAM2(41), bhvX),\n"
+        "        /* OBJECT(MODEL_COMMENTED_OUT) */\n"
+        "        RETURN(),\n"
+        "    END_AREA(),\n"
+        "    OBJECT_WITH_ACTS(MODEL_Y, (1 + 2), ACT_1 | ACT_2\n"  # not closed
+        "};\n"
+    )
+    calls = list(iter_macro_calls(text))
+    assert [(c.name, c.args, c.line) for c in calls] == [
+        ("AREA", ["1", "bob_geo_000488"], 2),
+        ("OBJECT", ["MODEL_NONE", "BPARAM2(41)", "bhvX"], 3),
+        ("RETURN", [], 5),
+        ("END_AREA", [], 6),
+    ]
+    assert calls[1].text == "OBJECT(MODEL_NONE, BPARAM2(41), bhvX)"
+    # The same arguments the per-line helper finds.
+    for call, line in zip(calls[:2], text.splitlines()[1:3]):
+        assert call.args == extract_macro_args(line, call.name)
+
+
+def test_iter_macro_calls_filters_by_exact_name():
+    text = "SPECIAL_OBJECT(a, 1, 2, 3),\nSPECIAL_OBJECT_WITH_YAW(b, 1, 2, 3, 4),\n"
+    only = iter_macro_calls(text, ["SPECIAL_OBJECT"])
+    assert [(c.name, c.args[0]) for c in only] == [("SPECIAL_OBJECT", "a")]
+    both = iter_macro_calls(text, ["SPECIAL_OBJECT_WITH_YAW", "SPECIAL_OBJECT"])
+    assert [c.name for c in both] == ["SPECIAL_OBJECT", "SPECIAL_OBJECT_WITH_YAW"]
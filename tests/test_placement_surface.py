@@ -0,0 +1,161 @@
+import random
+import struct
+
+from sm64_sql.collision import SM64CollisionMesh, SM64CollisionSurface
+from sm64_sql.macro_object import SM64MacroObject
+from sm64_sql.placement_surface import locate_placement_surfaces
+from sm64_sql.special import SM64SpecialObject
+
+# A 4000-unit square at y=0 over a death plane at y=-3000, with a slab whose
+# underside is a ceiling at y=1000 over the -x half.
+_VERTICES = [
+    (-2000, 0, -2000), (2000, 0, -2000), (2000, 0, 2000), (-2000, 0, 2000),
+    (-8000, -3000, -8000), (8000, -3000, -8000),
+    (8000, -3000, 8000), (-8000, -3000, 8000),
+    (-2000, 1000, -2000), (0, 1000, -2000), (0, 1000, 2000), (-2000, 1000, 2000),
+]  # fmt: skip
+# Floors are wound counter-clockwise seen from above (x right, z down).
+_SURFACES = [
+    ("SURFACE_DEFAULT", [(0, 3, 2), (0, 2, 1)]),
+    ("SURFACE_DEATH_PLANE", [(4, 7, 6), (4, 6, 5)]),
+    ("SURFACE_HARD", [(8, 9, 10), (8, 10, 11)]),  # the other way: a ceiling
+]
+
+
+def _collision(area=1):
+    mesh = SM64CollisionMesh(
+        collision_name="demo_collision",
+        level="demo",
+        area=area,
+        vertex_count=len(_VERTICES),
+        triangle_count=6,
+        min_x=None,
+        min_y=None,
+        min_z=None,
+        max_x=None,
+        max_y=None,
+        max_z=None,
+        vertices=struct.pack(f"<{3 * len(_VERTICES)}h", *sum(_VERTICES, ())),
+    )
+    surfaces = [
+        SM64CollisionSurface(
+            collision_name="demo_collision",
+            seq=seq,
+            level="demo",
+            area=area,
+            surface_type=surface_type,
+            triangle_count=len(tris),
+            triangles=struct.pack(f"<{3 * len(tris)}H", *sum(tris, ())),
+            params=None,
+        )
+        for seq, (surface_type, tris) in enumerate(_SURFACES)
+    ]
+    return [mesh], surfaces
+
+
+def _coin(x, y, z, area=1):
+    return SM64MacroObject(
+        macro_name="macro_yellow_coin",
+        level="demo",
+        area=area,
+        yaw=0,
+        pos_x=x,
+        pos_y=y,
+        pos_z=z,
+        bhv_param="0",
+        bhv_param_value=0,
+        bhv_param_1_value=None,
+        bhv_param_2_value=0,
+        bhv_param_3_value=None,
+        bhv_param_4_value=None,
+    )
+
+
+def test_floor_and_ceiling_of_each_placement():
+    meshes, surfaces = _collision()
+    coins = [
+        _coin(-1000, 200, 0),  # under the slab, on the square
+        _coin(1000, 200, 0),  # on the square, open sky
+        _coin(5000, 200, 0),  # off the edge: over the death plane
+        _coin(1000, -50, 0),  # just below the square: still its floor
+        _coin(9000, 200, 0),  # out of bounds
+        _coin(1000, 200, 0, area=2),  # an area with no geometry
+    ]
+    rows = locate_placement_surfaces(list(enumerate(coins, start=1)), meshes, surfaces)
+    assert [(r.floor_surface_type, r.floor_y, r.ceiling_y) for r in rows] == [
+        ("SURFACE_DEFAULT", 0.0, 1000.0),
+        ("SURFACE_DEFAULT", 0.0, None),
+        ("SURFACE_DEATH_PLANE", -3000.0, None),
+        ("SURFACE_DEFAULT", 0.0, None),
+        (None, None, None),
+        (None, None, None),
+    ]
+    assert rows[0].floor_distance == 200 and rows[0].ceiling_distance == 800
+    assert rows[0].ceiling_surface_type == "SURFACE_HARD"
+    assert (rows[0].kind, rows[0].name) == ("macro_object", "macro_yellow_coin")
+    assert [r.source_rowid for r in rows] == [1, 2, 3, 4, 5, 6]
+
+
+def test_grid_lookup_matches_a_triangle_by_triangle_scan():
+    # Random sloped floors, checked against the plain per-triangle loop.
+    rng = random.Random(7)
+    vertices, tris = [], []
+    for _ in range(60):
+        x, z = rng.randrange(-7000, 6000), rng.randrange(-7000, 6000)
+        base = len(vertices)
+        vertices += [
+            (x, rng.randrange(-500, 500), z),
+            (x, rng.randrange(-500, 500), z + rng.randrange(100, 3000)),
+            (x + rng.randrange(100, 3000), rng.randrange(-500, 500), z),
+        ]
+        tris.append((base, base + 1, base + 2))
+    mesh = SM64CollisionMesh(
+        "m", "demo", 1, len(vertices), len(tris), None, None, None, None, None,
+        None, struct.pack(f"<{3 * len(vertices)}h", *sum(vertices, ())),
+    )  # fmt: skip
+    surface = SM64CollisionSurface(
+        "m", 0, "demo", 1, "SURFACE_DEFAULT", len(tris),
+        struct.pack(f"<{3 * len(tris)}H", *sum(tris, ())), None,
+    )  # fmt: skip
+    specials = [
+        SM64SpecialObject(
+            "special_null_start", 0, "demo", 1, rng.randrange(-7000, 8000),
+            rng.randrange(-600, 600), rng.randrange(-7000, 8000), 0, "0", 0,
+            None, 0, None, None,
+        )  # fmt: skip
+        for _ in range(400)
+    ]
+    rows = locate_placement_surfaces(list(enumerate(specials)), [mesh], [surface])
+
+    def scan(x, y, z):
+        best = None
+        for a, b, c in tris:
+            (x1, y1, z1), (x2, y2, z2), (x3, y3, z3) = (
+                vertices[a],
+                vertices[b],
+                vertices[c],
+            )
+            edges = [
+                (z1 - z) * (x2 - x1) - (x1 - x) * (z2 - z1),
+                (z2 - z) * (x3 - x2) - (x2 - x) * (z3 - z2),
+                (z3 - z) * (x1 - x3) - (x3 - x) * (z1 - z3),
+            ]
+            if min(edges) < 0:
+                continue
+            nx = (y2 - y1) * (z3 - z2) - (z2 - z1) * (y3 - y2)
+            ny = (z2 - z1) * (x3 - x2) - (x2 - x1) * (z3 - z2)
+            nz = (x2 - x1) * (y3 - y2) - (y2 - y1) * (x3 - x2)
+            height = -(nx * x + nz * z - (nx * x1 + ny * y1 + nz * z1)) / ny
+            if height <= y + 78 and (best is None or height > best):
+                best = height
+        return best
+
+    found = 0
+    for special, row in zip(specials, rows):
+        expected = scan(special.pos_x, special.pos_y, special.pos_z)
+        if expected is None:
+            assert row.floor_y is None
+        else:
+            found += 1
+            assert abs((row.floor_y or 0) - expected) < 1e-6
+    assert found > 20
@@ -0,0 +1,133 @@
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from sm64_sql.everything import BUILD_STAGES, parse_repo
+from sm64_sql.scheduler import Stage, iter_stages, order_stages, run_stages
+
+
+# Stage functions must be module-level so the process pool can pickle them.
+def _numbers(repo: Path) -> Dict[str, Any]:
+    return {"numbers": [1, 2, 3]}
+
+
+def _doubled(repo: Path, numbers: List[int]) -> Dict[str, Any]:
+    return {"doubled": [n * 2 for n in numbers]}
+
+
+def _total(repo: Path, numbers: List[int], doubled: List[int]) -> Dict[str, Any]:
+    return {"total": sum(numbers) + sum(doubled)}
+
+
+def _repo_name(repo: Path) -> Dict[str, Any]:
+    return {"name": repo.name}
+
+
+def _lazy_squares(repo: Path, numbers: List[int]) -> Dict[str, Any]:
+    return {"squares": (n * n for n in numbers)}
+
+
+def _wrong(repo: Path) -> Dict[str, Any]:
+    return {"unexpected": 1}
+
+
+_STAGES = [
+    # Declared out of dependency order on purpose.
+    Stage("total", _total, inputs=("numbers", "doubled"), outputs=("total",)),
+    Stage("doubled", _doubled, inputs=("numbers",), outputs=("doubled",)),
+    Stage("numbers", _numbers, outputs=("numbers",)),
+    Stage("name", _repo_name, outputs=("name",)),
+]
+
+
+def test_order_respects_dependencies_and_declaration_order():
+    order = [stage.name for stage in order_stages(_STAGES)]
+    assert order.index("numbers") < order.index("doubled") < order.index("total")
+    # An independent stage keeps its place relative to its peers.
+    assert order == ["numbers", "doubled", "total", "name"]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_run_stages_serial_and_parallel_agree(tmp_path: Path, jobs: int):
+    values = run_stages(_STAGES, tmp_path, jobs)
+    assert values == {
+        "numbers": [1, 2, 3],
+        "doubled": [2, 4, 6],
+        "total": 18,
+        "name": tmp_path.name,
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_lazy_outputs_stream_in_process_and_are_collected_elsewhere(
+    tmp_path: Path, jobs: int
+):
+    stages = [*_STAGES, Stage("squares", _lazy_squares, ("numbers",), ("squares",))]
+    results = dict(
+        (stage.name, result) for stage, result in iter_stages(stages, tmp_path, jobs)
+    )
+    squares = results["squares"]["squares"]
+    # Only the serial run hands the generator on; a worker's result is pickled.
+    assert isinstance(squares, Iterator) == (jobs == 1)
+    assert list(squares) == [1, 4, 9]
+    assert run_stages(stages, tmp_path, jobs)["squares"] == [1, 4, 9]
+
+
+def test_in_process_stage_streams_alongside_a_pool(tmp_path: Path):
+    stages = [
+        *_STAGES,
+        Stage("squares", _lazy_squares, ("numbers",), ("squares",), in_process=True),
+    ]
+    results = dict(
+        (stage.name, result) for stage, result in iter_stages(stages, tmp_path, 3)
+    )
+    assert set(results) == {"numbers", "doubled", "total", "name", "squares"}
+    squares = results["squares"]["squares"]
+    assert isinstance(squares, Iterator)
+    assert list(squares) == [1, 4, 9]
+    assert results["total"]["total"] == 18
+
+
+def test_bad_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        order_stages([Stage("doubled", _doubled, ("numbers",), ("doubled",))])
+    with pytest.raises(ValueError, match="produced by both"):
+        order_stages(
+            [
+                Stage("a", _numbers, outputs=("numbers",)),
+                Stage("b", _numbers, outputs=("numbers",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="cycle"):
+        order_stages(
+            [
+                Stage("a", _doubled, ("doubled",), ("numbers",)),
+                Stage("b", _doubled, ("numbers",), ("doubled",)),
+            ]
+        )
+
+
+def test_undeclared_output_is_an_error(tmp_path: Path):
+    with pytest.raises(ValueError, match="declared"):
+        run_stages([Stage("wrong", _wrong, outputs=("right",))], tmp_path)
+
+
+def test_build_stages_form_a_valid_graph():
+    # Every stage input is produced, nothing is produced twice, no cycles.
+    order = [stage.name for stage in order_stages(BUILD_STAGES)]
+    assert order.index("behavior_commands") < order.index("behavior_calls")
+    assert order.index("special_preset_ids") < order.index("levels")
+
+
+def test_parallel_parse_repo_matches_serial(mini_decomp: Path):
+    serial = parse_repo(mini_decomp, jobs=1)
+    parallel = parse_repo(mini_decomp, jobs=4)
+    assert parallel == serial
+    # The cross-stage edge carried the CALL_NATIVE roots through.
+    assert {c.call for c in serial.sm64_c_call_sites} == {
+        "cur_obj_play_sound_2",
+        "goomba_spawn_coin",
+        "spawn_object",
+    }
+    assert [o.area for o in serial.sm64_objects] == [1]
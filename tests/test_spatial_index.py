@@ -0,0 +1,22 @@
+from sm64_sql.spatial_index import CELL_COUNT, cell_of, cells, trigger_box
+
+
+def test_cells_floor_negative_coordinates_and_clamp_to_the_grid():
+    assert cell_of(0) == 32
+    assert cell_of(1023) == 32
+    assert cell_of(-1) == 31
+    assert cell_of(-1024) == 31
+    assert cell_of(-1025) == 30
+    assert cell_of(-40000) == 0
+    assert cell_of(40000) == CELL_COUNT - 1
+
+
+def test_a_box_touches_every_cell_it_overlaps():
+    assert list(cells(-10, 10, 1000, 1100)) == [(31, 32), (31, 33), (32, 32), (32, 33)]
+    assert list(cells(5, 5, 5, 5)) == [(32, 32)]
+
+
+def test_trigger_box_widens_to_the_rotated_extent():
+    # A quarter turn swaps the x and z half-extents.
+    box = trigger_box((0, 0, 0), (100, 50, 10), 0x4000)
+    assert [round(v) for v in box] == [-10, 10, -50, 50, -100, 100]
@@ -0,0 +1,77 @@
+import json
+import random
+from collections import deque
+
+from sm64_sql.spawn_closure import spawn_closure
+
+
+def test_closure_follows_spawn_and_morph_loops():
+    rows = spawn_closure(
+        [
+            ("bhvBoss", "bhvMinion", "script"),
+            ("bhvMinion", "bhvCoin", "c"),
+            ("bhvMinion", "bhvCoin", "data"),
+            ("bhvCoin", "bhvMinion", "morph"),  # a loop through a morph
+            ("bhvCoin", "bhvSparkle", "c"),
+            ("bhvSparkle", "bhvSparkle", "c"),  # spawns itself
+        ]
+    )
+    by_pair = {(r.behavior_name, r.descendant): r for r in rows}
+    assert {d for a, d in by_pair if a == "bhvBoss"} == {
+        "bhvMinion",
+        "bhvCoin",
+        "bhvSparkle",
+    }
+    assert ("bhvBoss", "bhvBoss") not in by_pair  # not on a cycle
+    assert by_pair["bhvMinion", "bhvMinion"].depth == 2
+    assert by_pair["bhvSparkle", "bhvSparkle"].depth == 1
+
+    sparkle = by_pair["bhvBoss", "bhvSparkle"]
+    assert sparkle.depth == 3
+    assert json.loads(sparkle.path_json) == [
+        "bhvBoss",
+        "bhvMinion",
+        "bhvCoin",
+        "bhvSparkle",
+    ]
+    assert json.loads(sparkle.origins_json) == [["script"], ["c", "data"], ["c"]]
+    assert sparkle.origin_mix == "script,c,data"
+    assert by_pair["bhvCoin", "bhvCoin"].origin_mix == "c,data,morph"
+
+
+def test_closure_matches_a_breadth_first_search_per_behavior():
+    rng = random.Random(3)
+    names = [f"bhv{i:02}" for i in range(40)]
+    edges = [
+        (rng.choice(names), rng.choice(names), rng.choice(("script", "c")))
+        for _ in range(70)
+    ]
+    succ = {}
+    for parent, child, _origin in edges:
+        succ.setdefault(parent, set()).add(child)
+
+    expected = {}
+    for source in names:
+        queue, depth = deque([source]), {source: 0}
+        while queue:
+            node = queue.popleft()
+            for child in succ.get(node, ()):
+                if child == source and (source, source) not in expected:
+                    expected[source, source] = depth[node] + 1
+                if child not in depth:
+                    depth[child] = depth[node] + 1
+                    queue.append(child)
+        for node, d in depth.items():
+            if node != source:
+                expected[source, node] = d
+
+    rows = spawn_closure(edges)
+    assert {(r.behavior_name, r.descendant): r.depth for r in rows} == expected
+    for row in rows:
+        path = json.loads(row.path_json)
+        assert (path[0], path[-1], len(path)) == (
+            row.behavior_name,
+            row.descendant,
+            row.depth + 1,
+        )
+        assert all(b in succ[a] for a, b in zip(path, path[1:]))
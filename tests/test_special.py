@@ -83,6 +83,8 @@ def test_parse_special_objects(tmp_path):
     assert objects[2].yaw == 4
     assert objects[2].bhv_param == "5"
     assert objects[2].bhv_param_value == 5
+    # It is spawned into the 2nd byte (oBhvParams2ndByte).
+    assert (objects[2].bhv_param_2_value, objects[2].bhv_param_4_value) == (5, None)
 
 
 def test_parse_special_objects_resolves_alias(tmp_path):
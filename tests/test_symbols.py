@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from sm64_sql.symbols import parse_symbols
+
+
+def _write(repo: Path, rel: str, text: str) -> None:
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_defines_and_enums_resolve_across_headers(tmp_path: Path):
+    _write(
+        tmp_path,
+        "include/a.h",
+        "#define LATER (EARLIER + BASE)\n"  # refers ahead and to another file
+        "#define EARLIER 2\n"
+        "#define FN(x) ((x) << 1)\n"  # function-like: not a symbol
+        "#define LOOP_A LOOP_B\n"
+        "#define LOOP_B LOOP_A\n"  # a cycle resolves to nothing
+        '#define TEXT "text"\n',
+    )
+    _write(
+        tmp_path,
+        "src/game/level_update.h",
+        "enum WarpNodes {\n"
+        "    WARP_NODE_00,\n"
+        "    WARP_NODE_0A = 0x0A,\n"
+        "};\n"
+        "#define BASE (WARP_NODE_0A << 4)\n",
+    )
+    symbols = parse_symbols(tmp_path)
+    assert symbols["WARP_NODE_0A"] == 0x0A
+    assert symbols["BASE"] == 0xA0
+    assert symbols["LATER"] == 0xA2
+    for name in ("FN", "LOOP_A", "LOOP_B", "TEXT"):
+        assert name not in symbols
+
+
+def test_a_forward_define_resolves_without_any_enum(tmp_path: Path):
+    # Nothing seeds the symbol table, so every name resolves on demand.
+    _write(tmp_path, "include/a.h", "#define A (B + 1)\n#define B 2\n")
+    symbols = parse_symbols(tmp_path)
+    assert (symbols["A"], symbols["B"]) == (3, 2)
+
+
+def test_the_first_definition_of_a_name_wins(tmp_path: Path):
+    # Conditionals are not evaluated: the first arm is read first.
+    _write(
+        tmp_path,
+        "include/a.h",
+        "#ifdef VERSION_JP\n#define N 1\n#else\n#define N 2\n#endif\n",
+    )
+    _write(tmp_path, "include/b.h", "#define N 3\n")
+    assert parse_symbols(tmp_path)["N"] == 1
@@ -0,0 +1,105 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from sm64_sql.db import write_to_db
+from sm64_sql.everything import parse_repo
+from sm64_sql.synthetic import Shape, generate_decomp
+
+_SMALL = Shape(
+    levels=3,
+    areas_per_level=2,
+    objects_per_area=5,
+    macro_objects_per_area=4,
+    special_objects_per_area=2,
+    collision_grid=3,
+    behaviors=8,
+    behaviors_per_file=4,
+    models=6,
+    macro_presets=4,
+    special_presets=3,
+    sounds=4,
+    dialogs=4,
+)
+
+
+@pytest.mark.parametrize("scale", [1, 3])
+def test_generated_tree_parses_to_the_requested_shape(tmp_path: Path, scale: int):
+    everything = parse_repo(generate_decomp(tmp_path, scale, _SMALL))
+    areas = _SMALL.levels * scale * _SMALL.areas_per_level
+    assert len(everything.sm64_levels) == _SMALL.levels * scale
+    assert len(everything.sm64_areas) == areas
+    assert len(everything.sm64_objects) == areas * _SMALL.objects_per_area
+    assert {o.area for o in everything.sm64_objects} == {1, 2}
+    assert len(everything.sm64_macro_objects) == areas * 4
+    assert len(everything.sm64_special_objects) == areas * 2
+    assert all(s.preset_id > 0 for s in everything.sm64_special_objects)
+    assert len(everything.sm64_collision_meshes) == areas
+    assert {m.triangle_count for m in everything.sm64_collision_meshes} == {
+        2 * (_SMALL.collision_grid - 1) ** 2
+    }
+    assert len(everything.sm64_behaviors) == _SMALL.behaviors * scale
+    assert len(everything.sm64_sounds) == 4 and len(everything.sm64_dialogs) == 4
+
+    # Each behavior reaches its two action functions through the action table,
+    # and the per-file helper they share, so every behavior owns a spawn.
+    spawning = {
+        c.function for c in everything.sm64_c_call_sites if c.call == "spawn_object"
+    }
+    spawners = {
+        f.behavior_name
+        for f in everything.sm64_behavior_functions
+        if f.function in spawning
+    }
+    assert spawners == {b.behavior_name for b in everything.sm64_behaviors}
+
+
+def test_generation_is_deterministic_and_views_have_rows(tmp_path: Path):
+    first = parse_repo(generate_decomp(tmp_path / "a", 1, _SMALL))
+    assert parse_repo(generate_decomp(tmp_path / "b", 1, _SMALL)) == first
+
+    conn = sqlite3.connect(":memory:")
+    write_to_db(conn, first)
+    for view in ("behavior_native", "behavior_calls_spawn", "behavior_calls_dialog"):
+        assert conn.execute(f"SELECT COUNT(*) FROM {view}").fetchone()[0] > 0
+
+    # Every placement has its surface row, keyed back to it.
+    areas = _SMALL.levels * _SMALL.areas_per_level
+    surfaces = conn.execute(
+        "SELECT COUNT(*), COUNT(o.rowid) + COUNT(m.rowid) + COUNT(s.rowid), "
+        "SUM(p.floor_surface_type = 'SURFACE_DEFAULT') FROM placement_surface p "
+        "LEFT JOIN object o ON p.kind = 'object' AND o.rowid = p.source_rowid "
+        "LEFT JOIN macro_object m ON p.kind = 'macro_object' AND m.rowid = p.source_rowid "
+        "LEFT JOIN special_object s "
+        "ON p.kind = 'special_object' AND s.rowid = p.source_rowid"
+    ).fetchone()
+    assert surfaces[:2] == (areas * (5 + 4 + 2),) * 2
+    assert surfaces[2] > 0
+
+
+def test_parallel_build_matches_the_serial_one(tmp_path: Path):
+    repo = generate_decomp(tmp_path, 1, _SMALL)
+    assert parse_repo(repo, jobs=3) == parse_repo(repo)
+
+
+def test_symbolic_params_resolve_through_the_header_symbols(tmp_path: Path):
+    repo = generate_decomp(tmp_path, 1, _SMALL)
+    (repo / "include" / "synth_params.h").write_text("#define SYNTH_NODE 0x12\n")
+    script = next((repo / "levels").glob("*/script.c"))
+    text = script.read_text()
+    first = text.index("/*bhvParam*/ ") + len("/*bhvParam*/ ")
+    end = text.index(",", first)
+    script.write_text(text[:first] + "BPARAM2(SYNTH_NODE)" + text[end:])
+
+    objects = parse_repo(repo).sm64_objects
+    resolved = [o for o in objects if o.bhv_param == "BPARAM2(SYNTH_NODE)"]
+    assert len(resolved) == 1
+    assert resolved[0].bhv_param_value == 0x12 << 16
+    assert resolved[0].bhv_param_2_value == 0x12
+    assert resolved[0].bhv_param_1_value == 0
+
+
+def test_scale_must_be_positive(tmp_path: Path):
+    with pytest.raises(ValueError):
+        generate_decomp(tmp_path, 0)
@@ -1,4 +1,7 @@
-from sm64_sql.warp import parse_warps
+import json
+
+from sm64_sql.level_script import read_level_script
+from sm64_sql.warp import SM64InstantWarp, SM64Warp, warp_graph
 
 SCRIPT_C = """\
     WARP_NODE(/*id*/ WARP_NODE_GLOBAL, /*destLevel*/ LEVEL_CASTLE, /*destArea*/ 1, /*destNode*/ WARP_NODE_00, /*flags*/ WARP_NO_CHECKPOINT),
@@ -17,7 +20,8 @@ SCRIPT_C = """\
 def test_parse_warps(tmp_path):
     path = tmp_path / "script.c"
     path.write_text(SCRIPT_C)
-    warps, instant_warps = parse_warps(path, "bob")
+    rows = read_level_script(path, "bob")
+    warps, instant_warps = rows.warps, rows.instant_warps
 
     assert len(warps) == 4  # 1 global + 2 in-area WARP_NODE + 1 PAINTING_WARP_NODE
     assert len(instant_warps) == 1
@@ -44,3 +48,59 @@ def test_parse_warps(tmp_path):
     assert iw.warp_index == 2
     assert iw.dest_area == 3
     assert (iw.displace_x, iw.displace_y, iw.displace_z) == (10240, 7168, -10240)
+
+
+def _warp(level, area, node, dest_level, dest_area, painting=False):
+    return SM64Warp(
+        level, area, node, dest_level, dest_area, node, "WARP_NO_CHECKPOINT", painting
+    )
+
+
+def test_warp_graph_closure_and_shortest_paths():
+    folders = {
+        "LEVEL_CASTLE_GROUNDS": "castle_grounds",
+        "LEVEL_CASTLE": "castle_inside",
+        "LEVEL_BOB": "bob",
+    }
+    rows = warp_graph(
+        [
+            _warp("castle_grounds", 1, "WARP_NODE_00", "LEVEL_CASTLE", 1),
+            _warp("castle_inside", 1, "WARP_NODE_0A", "LEVEL_BOB", 1, painting=True),
+            _warp("castle_inside", 1, "WARP_NODE_01", "LEVEL_CASTLE_GROUNDS", 1),
+            _warp("bob", 1, "WARP_NODE_SUCCESS", "LEVEL_CASTLE", 1),
+            _warp("bob", 2, "WARP_NODE_F0", "LEVEL_UNKNOWN", 1),  # leads nowhere
+        ],
+        [SM64InstantWarp("bob", 1, 0, 2, 0, 0, 0)],
+        folders,
+    )
+    reach = {(r.level, r.area, r.dest_level, r.dest_area): r.hops for r in rows.closure}
+    assert {k[2:]: v for k, v in reach.items() if k[:2] == ("castle_grounds", 1)} == {
+        ("bob", 1): 2,
+        ("bob", 2): 3,
+        ("castle_grounds", 1): 2,  # there and back again
+        ("castle_inside", 1): 1,
+    }
+    assert not any(k[:2] == ("bob", 2) for k in reach)
+
+    closure = next(
+        r
+        for r in rows.closure
+        if (r.level, r.dest_level, r.dest_area) == ("castle_grounds", "bob", 2)
+    )
+    assert json.loads(closure.path_json) == [
+        ["castle_grounds", 1],
+        ["castle_inside", 1],
+        ["bob", 1],
+        ["bob", 2],
+    ]
+    path = next(
+        r
+        for r in rows.shortest_paths
+        if (r.level, r.dest_level, r.dest_area) == ("castle_grounds", "bob", 2)
+    )
+    assert [(s["kind"], s["via"]) for s in json.loads(path.path_json)] == [
+        ("warp", "WARP_NODE_00"),
+        ("painting", "WARP_NODE_0A"),
+        ("instant_warp", 0),
+    ]
+    assert len(rows.shortest_paths) == len(rows.closure)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Time the whole-file macro scanner against the per-line helpers.
+
+Generates a synthetic decomp tree (sm64_sql.synthetic), then reads every
+script.c, macro.inc.c and collision.inc.c under levels/ three ways:
+
+  - original   every line stripped and offered to the character-loop
+               extract_macro_args the parsers used before the scanner (kept
+               below as the baseline) once per macro the file's parser knows
+  - per line   the same, with today's parse_utils.extract_macro_args
+  - scanner    iter_macro_calls over the whole file, for the same macros
+
+and checks that all three find the same calls with the same arguments.
+
+Run from the repo root:  python3 tools/bench_macro_scan.py --scale 10
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sm64_sql.level_script import _BUILDERS
+from sm64_sql.macro_object import MACRO_OBJECT_MACROS
+from sm64_sql.parse_utils import (
+    extract_macro_args,
+    iter_macro_calls,
+    strip_block_comments,
+)
+from sm64_sql.special import SPECIAL_OBJECT_MACROS
+from sm64_sql.synthetic import generate_decomp
+
+MACROS_BY_FILE = {
+    "script.c": tuple(_BUILDERS),
+    "macro.inc.c": MACRO_OBJECT_MACROS,
+    "collision.inc.c": SPECIAL_OBJECT_MACROS,
+}
+
+
+# The helpers as they were before the scanner, character loops and all.
+
+
+def original_split_top_level(text, separator=","):
+    parts = []
+    depth = 0
+    current = ""
+    openers = "([{"
+    closers = ")]}"
+    for char in text:
+        if char in openers:
+            depth += 1
+        elif char in closers:
+            depth = max(0, depth - 1)
+        if char == separator and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def original_extract_macro_args(line, macro_name):
+    line = line.strip()
+    if not line.startswith(macro_name):
+        return None
+    start = len(macro_name)
+    while start < len(line) and line[start] in " \t":
+        start += 1
+    if start >= len(line) or line[start] != "(":
+        return None
+    depth = 0
+    end = -1
+    for index in range(start, len(line)):
+        char = line[index]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                end = index
+                break
+    if end == -1:
+        return None
+    inner = strip_block_comments(line[start + 1 : end])
+    return [part.strip() for part in original_split_top_level(inner, ",")]
+
+
+def _per_line(text, names, extract):
+    calls = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        for name in names:
+            args = extract(line, name)
+            if args is not None:
+                calls.append((name, [] if args == [""] else args, number))
+                break
+    return calls
+
+
+def original(text, names):
+    return _per_line(text, names, original_extract_macro_args)
+
+
+def per_line(text, names):
+    return _per_line(text, names, extract_macro_args)
+
+
+def scanner(text, names):
+    return [(call.name, call.args, call.line) for call in iter_macro_calls(text, names)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = generate_decomp(Path(tmp) / "sm64", args.scale)
+        files = [
+            (path.read_text(), MACROS_BY_FILE[path.name])
+            for path in sorted((repo / "levels").rglob("*.c"))
+            if path.name in MACROS_BY_FILE
+        ]
+
+    size = sum(len(text) for text, _ in files)
+    print(f"{len(files)} files, {size / 1e6:.1f} MB")
+    results = {}
+    for label, read in (
+        ("original", original),
+        ("per line", per_line),
+        ("scanner", scanner),
+    ):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[label] = [read(text, names) for text, names in files]
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:<9} {best:8.3f}s")
+    if not results["original"] == results["per line"] == results["scanner"]:
+        raise SystemExit("the scanner and the per-line helpers disagree")
+    print("  same calls and arguments")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Time the build against synthetic decomp trees at increasing scale.
+
+For each scale a tree is generated with sm64_sql.synthetic (1x is roughly
+vanilla-sized; 10x and 100x stand in for large ROM-hack forks), then timed:
+
+  - parse_repo        (tree-sitter and the line parsers)
+  - write_to_db       (tables, indexes and views, bulk mode as the CLI does)
+  - every ENTITY_VIEWS query, fully fetched (what the web tabs pay on load)
+
+Run from the repo root:  python3 tools/benchmark.py --scales 1 10 100
+Pass --json FILE to keep the numbers for comparing runs.
+"""
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from sm64_sql.db import write_to_db
+from sm64_sql.everything import ENTITY_VIEWS, parse_repo
+from sm64_sql.synthetic import generate_decomp
+
+
+def bench(scale, jobs):
+    result = {"scale": scale, "jobs": jobs}
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = generate_decomp(Path(tmp) / "sm64", scale)
+
+        start = time.perf_counter()
+        everything = parse_repo(repo, jobs)
+        result["parse_repo"] = time.perf_counter() - start
+
+        conn = sqlite3.connect(Path(tmp) / "sm64.db")
+        start = time.perf_counter()
+        loads = write_to_db(conn, everything, bulk=True)
+        result["write_to_db"] = time.perf_counter() - start
+        result["rows"] = sum(load.rows for load in loads)
+
+        views = {}
+        for view_name, _sql in ENTITY_VIEWS:
+            start = time.perf_counter()
+            rows = conn.execute(f"SELECT * FROM {view_name}").fetchall()
+            views[view_name] = {
+                "seconds": time.perf_counter() - start,
+                "rows": len(rows),
+            }
+        result["views"] = views
+        conn.close()
+    return result
+
+
+def report(result):
+    print(
+        f"scale {result['scale']:>4}x  parse_repo {result['parse_repo']:8.2f}s  "
+        f"write_to_db {result['write_to_db']:7.2f}s  ({result['rows']:,} rows)"
+    )
+    slowest = sorted(
+        result["views"].items(), key=lambda item: item[1]["seconds"], reverse=True
+    )
+    for view_name, view in slowest:
+        print(
+            f"    {view_name:<34} {view['seconds'] * 1000:9.1f} ms  "
+            f"{view['rows']:>9,} rows"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        results.append(bench(scale, args.jobs))
+        report(results[-1])
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -511,6 +511,18 @@
       (r) => `<span class="src">${escapeHtml(r.t)}</span>${src(r.file, r.line)}`
     );
 
+    // Reachability, precomputed at build time (databases built before
+    // mario_action_graph have no such table).
+    let reach = null;
+    try {
+      reach =
+        rowsOf(`
+          SELECT reach_count n, scc_size k FROM mario_action_graph
+          WHERE action_name='${A}'`)[0] || null;
+    } catch (e) {
+      // no mario_action_graph table
+    }
+
     const g = GROUP.get(node ? node.group : "") || GROUP.get("");
     const flags = node && node.flags.length ? node.flags : [];
     const handlerLine = meta.handler
@@ -531,6 +543,15 @@
             .map((f) => `<span class="pill">${escapeHtml(f)}</span>`)
             .join(" ")}</div>`
         : "") +
+      (reach
+        ? `<div class="dossier-sub">leads to ${reach.n} action${
+            reach.n === 1 ? "" : "s"
+          } · ${
+            reach.k > 1
+              ? `in a cycle of ${reach.k} that reach one another`
+              : "in no cycle with others"
+          }</div>`
+        : "") +
       `<section><h4>Handler</h4><ul><li>${handlerLine}</li></ul></section>` +
       listSection("Transitions to", out) +
       listSection("Reached from", inc) +
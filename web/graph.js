@@ -496,6 +496,16 @@
     const native = rowsOf(
       `SELECT DISTINCT func f FROM behavior_native WHERE behavior_name='${B}' ORDER BY seq`
     );
+    // Everything further down the spawn/morph graph, from the build-time
+    // closure (databases built before it have no such table).
+    let further = [];
+    try {
+      further = rowsOf(`
+        SELECT descendant d, depth FROM behavior_spawn_closure
+        WHERE behavior_name='${B}' AND depth > 1 ORDER BY depth, descendant`);
+    } catch (e) {
+      // no behavior_spawn_closure table
+    }
 
     const placeLine = total
       ? `${total} placement${total === 1 ? "" : "s"} · ` +
@@ -513,6 +523,12 @@
         placeLine
       )}</div>` +
       listSection("Spawns", spawnItems) +
+      listSection(
+        "Eventually brings in",
+        further.map(
+          (r) => `${goto(r.d)} <span class="pill">depth ${r.depth}</span>`
+        )
+      ) +
       listSection(
         "Spawned by",
         parents.map((r) => goto(r.b))
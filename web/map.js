@@ -22,22 +22,44 @@ const PLANES = {
 };
 const PAD = 28;
 
+// A level's placements (optionally one area's), found through the
+// spatial_index grid: its primary key starts with (level, area), so this is a
+// key range rather than a scan of the three placement tables. Each row's
+// source_rowid leads back to its placement for the label and model.
 const POINTS_SQL = `
+  SELECT CASE s.kind WHEN 'macro_object' THEN 'macro'
+                     WHEN 'special_object' THEN 'special' ELSE s.kind END AS kind,
+         s.area, s.min_x AS x, s.min_y AS y, s.min_z AS z,
+         CASE s.kind WHEN 'object' THEN o.behavior
+                     WHEN 'macro_object' THEN COALESCE(mp.behavior, mo.macro_name)
+                     ELSE COALESCE(sp.behavior, so.preset_name) END AS label,
+         COALESCE(o.model_name, mp.model_name, sp.model_name) AS model
+  FROM spatial_index s
+  LEFT JOIN object o ON s.kind = 'object' AND o.rowid = s.source_rowid
+  LEFT JOIN macro_object mo ON s.kind = 'macro_object' AND mo.rowid = s.source_rowid
+  LEFT JOIN macro_preset mp ON mp.macro_name = mo.macro_name
+  LEFT JOIN special_object so ON s.kind = 'special_object' AND so.rowid = s.source_rowid
+  LEFT JOIN special_preset sp ON sp.preset_id = so.preset_id
+  WHERE s.level = $lvl AND ($area IS NULL OR s.area = $area)
+    AND s.kind != 'camera_trigger'`;
+
+// The same rows for a database built before spatial_index existed.
+const POINTS_SCAN_SQL = `
   SELECT 'object' AS kind, area, initial_x AS x, initial_y AS y, initial_z AS z,
          behavior AS label, model_name AS model
-  FROM object WHERE level = $lvl
+  FROM object WHERE level = $lvl AND ($area IS NULL OR area = $area)
   UNION ALL
   SELECT 'macro', mo.area, mo.pos_x, mo.pos_y, mo.pos_z,
          COALESCE(mp.behavior, mo.macro_name), mp.model_name
   FROM macro_object mo
   LEFT JOIN macro_preset mp ON mp.macro_name = mo.macro_name
-  WHERE mo.level = $lvl
+  WHERE mo.level = $lvl AND ($area IS NULL OR mo.area = $area)
   UNION ALL
   SELECT 'special', so.area, so.pos_x, so.pos_y, so.pos_z,
          COALESCE(sp.behavior, so.preset_name), sp.model_name
   FROM special_object so
   LEFT JOIN special_preset sp ON sp.preset_id = so.preset_id
-  WHERE so.level = $lvl`;
+  WHERE so.level = $lvl AND ($area IS NULL OR so.area = $area)`;
 
 let initialised = false;
 const hidden = new Set(); // kinds toggled off via the legend
@@ -114,9 +136,16 @@ function populateAreas(level) {
   sel.value = areas.length ? String(areas[0]) : "all";
 }
 
-function queryPoints(level) {
-  const stmt = currentDb().prepare(POINTS_SQL);
-  stmt.bind({ $lvl: level });
+// A level's placements, in one area unless `area` is "all".
+function queryPoints(level, area) {
+  const params = { $lvl: level, $area: area === "all" ? null : Number(area) };
+  let stmt;
+  try {
+    stmt = currentDb().prepare(POINTS_SQL);
+  } catch (e) {
+    stmt = currentDb().prepare(POINTS_SCAN_SQL); // no spatial_index table
+  }
+  stmt.bind(params);
   const pts = [];
   while (stmt.step()) pts.push(stmt.getAsObject());
   stmt.free();
@@ -124,10 +153,17 @@ function queryPoints(level) {
 }
 
 const CAM_SQL = `
-  SELECT area, event, center_x, center_y, center_z,
+  SELECT camera_table, seq, area, event, center_x, center_y, center_z,
          bounds_x, bounds_y, bounds_z, bounds_yaw, doc, file, line
   FROM camera_trigger WHERE level = $lvl AND bounds_x > 0`;
 
+// How many placements each of a level's zones contains, precomputed by the
+// build (camera_trigger_object), keyed "camera_table:seq".
+const CAM_CONTENTS_SQL = `
+  SELECT camera_table, seq, COUNT(*) AS n
+  FROM camera_trigger_object WHERE level = $lvl
+  GROUP BY camera_table, seq`;
+
 // Camera-trigger zones for a level, or [] if the table is absent (e.g. an older
 // database). Wrapped so the Map tab still works against a db without it.
 function queryCamTriggers(level) {
@@ -137,12 +173,32 @@ function queryCamTriggers(level) {
     const rows = [];
     while (stmt.step()) rows.push(stmt.getAsObject());
     stmt.free();
+    const contents = queryCamContents(level);
+    rows.forEach((t) => (t.contents = contents[`${t.camera_table}:${t.seq}`]));
     return rows;
   } catch (e) {
     return [];
   }
 }
 
+// { "camera_table:seq": count }, or {} for a database built before the
+// containment table existed (the tooltip then just omits the count).
+function queryCamContents(level) {
+  const contents = {};
+  try {
+    const stmt = currentDb().prepare(CAM_CONTENTS_SQL);
+    stmt.bind({ $lvl: level });
+    while (stmt.step()) {
+      const r = stmt.getAsObject();
+      contents[`${r.camera_table}:${r.seq}`] = r.n;
+    }
+    stmt.free();
+  } catch (e) {
+    // no camera_trigger_object table
+  }
+  return contents;
+}
+
 function buildLegend(counts) {
   const legend = m.legend();
   legend.innerHTML = "";
@@ -215,7 +271,8 @@ function drawCamZones(svg, triggers, plane, sx, sy, scale) {
         (t.doc ? `<br>${t.doc}` : "") +
         `<br>center ${t.center_x}, ${t.center_y}, ${t.center_z}` +
         `<br>bounds ±${t.bounds_x}, ±${t.bounds_y}, ±${t.bounds_z}` +
-        (t.bounds_yaw ? ` · yaw ${t.bounds_yaw}` : "");
+        (t.bounds_yaw ? ` · yaw ${t.bounds_yaw}` : "") +
+        (t.contents ? `<br>${t.contents} placement${t.contents === 1 ? "" : "s"} inside` : "");
       tip.style.display = "block";
       const r = m.stage().getBoundingClientRect();
       tip.style.left = e.clientX - r.left + 12 + "px";
@@ -233,9 +290,7 @@ function render() {
   // The selected area filters the placements; "all" overlays every area (and
   // gets no background, since each area has its own coordinate system).
   const areaSel = m.area().value || "all";
-  const all = queryPoints(level).filter(
-    (p) => areaSel === "all" || String(p.area) === areaSel
-  );
+  const all = queryPoints(level, areaSel);
 
   const counts = {};
   all.forEach((p) => (counts[p.kind] = (counts[p.kind] || 0) + 1));